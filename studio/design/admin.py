@@ -1,6 +1,127 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db.models import Sum
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+
 from .models import *
+from .status_changes import COMMENT_REQUIRED_ERROR, bulk_change_status, comment_required
+
+# Выше этого порога точное количество строк в отфильтрованном списке не считается
+ESTIMATED_COUNT_LIMIT = 10000
+# Дальние страницы списка стоят OFFSET по всем предыдущим строкам; к старым заявкам ведут фильтры
+ADMIN_MAX_PAGES = 50
+
+
+class EstimatedCountPaginator(Paginator):
+    """Берет количество заявок из счетчиков статистики вместо COUNT(*) по всей таблице.
+
+    Число страниц ограничено ADMIN_MAX_PAGES: более глубокие страницы не открываются.
+    """
+    max_pages = ADMIN_MAX_PAGES
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where and self.object_list.model is Application:
+            total = ApplicationStats.objects.filter(dimension='status').aggregate(total=Sum('count'))['total']
+            if total is not None:
+                return total
+        if query is not None:
+            return self.object_list[:ESTIMATED_COUNT_LIMIT].count()
+        return super().count
+
+    @cached_property
+    def num_pages(self):
+        return min(super().num_pages, self.max_pages)
+
+
+class StatusCommentForm(forms.Form):
+    comment = forms.CharField(label='Комментарий', widget=forms.Textarea, required=False)
+
+
+class AdvUserAdmin(admin.ModelAdmin):
+    list_display = ('username', 'email', 'last_name', 'first_name', 'is_employer', 'is_superuser')
+    search_fields = ('^username', '^email_key')
+    ordering = ('-id',)
+    show_full_result_count = False
+
+
+class CategoryAdmin(admin.ModelAdmin):
+    search_fields = ('category_name',)
+
+
+class ApplicationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'app_name', 'app_category', 'app_publisher', 'design_publisher', 'status', 'app_date_created')
+    list_display_links = ('id', 'app_name')
+    list_select_related = ('app_category', 'app_publisher', 'design_publisher')
+    list_filter = ('status', 'app_category')
+    autocomplete_fields = ('app_category', 'app_publisher', 'design_publisher')
+    readonly_fields = ('version', 'updated_at')
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_max_show_all = 100
+    actions = ['mark_accepted', 'mark_done']
+
+    def change_status(self, request, queryset, status):
+        form = StatusCommentForm(request.POST if 'apply' in request.POST else None)
+        if form.is_valid():
+            comment = form.cleaned_data['comment']
+            if comment_required(status, comment):
+                form.add_error('comment', COMMENT_REQUIRED_ERROR)
+            else:
+                changed, skipped = bulk_change_status(queryset, status, comment)
+                self.message_user(request, f'Статус изменен у заявок: {changed}.', messages.SUCCESS)
+                if skipped:
+                    self.message_user(
+                        request,
+                        f'Пропущено заявок: {skipped} (не новые или без прикрепленного дизайна).',
+                        messages.WARNING,
+                    )
+                return None
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'Смена статуса на «{dict(Application.APP_STATUS)[status]}»',
+            'opts': self.model._meta,
+            'form': form,
+            'action': request.POST['action'],
+            'selected': request.POST.getlist(admin.helpers.ACTION_CHECKBOX_NAME),
+            'select_across': request.POST.get('select_across', '0'),
+            'count': queryset.count(),
+        }
+        return TemplateResponse(request, 'admin/design/application/change_status.html', context)
+
+    @admin.action(description='Принять выбранные заявки в работу')
+    def mark_accepted(self, request, queryset):
+        return self.change_status(request, queryset, 'a')
+
+    @admin.action(description='Отметить выбранные заявки выполненными')
+    def mark_done(self, request, queryset):
+        return self.change_status(request, queryset, 'd')
+
+
+class ArchivedApplicationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'app_name', 'app_category', 'app_publisher', 'archived_at')
+    list_select_related = ('app_category', 'app_publisher')
+    list_filter = ('app_category',)
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_max_show_all = 100
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 
-admin.site.register(AdvUser)
-admin.site.register(Category)
-admin.site.register(Application)
\ No newline at end of file
+admin.site.register(AdvUser, AdvUserAdmin)
+admin.site.register(Category, CategoryAdmin)
+admin.site.register(Application, ApplicationAdmin)
+admin.site.register(ArchivedApplication, ArchivedApplicationAdmin)
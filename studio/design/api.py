@@ -0,0 +1,233 @@
+import hashlib
+from functools import wraps
+
+from django.db import transaction
+from django.db.models import Q
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_http_methods
+
+from .forms import ApplicationCreateForm, ApplicationEditStatusForm, CategoryCreateForm, UserEditForm
+from .models import AdvUser, Application, Category
+from .notifications import schedule_status_notification
+from .pagination import decode_cursor, encode_cursor
+from .status_changes import status_change_error
+from .thumbnails import schedule_derivatives
+from .upload_handlers import uploaded_files
+from .views import is_employer_or_superuser, is_superuser, is_user
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
+APPLICATION_FIELDS = {
+    'id': 'id',
+    'app_name': 'app_name',
+    'app_description': 'app_description',
+    'app_category': 'app_category_id',
+    'app_date_created': 'app_date_created',
+    'updated_at': 'updated_at',
+    'app_image': 'app_image',
+    'app_publisher': 'app_publisher_id',
+    'design_image': 'design_image',
+    'design_publisher': 'design_publisher_id',
+    'status': 'status',
+    'comment': 'comment',
+}
+APPLICATION_LIST_FIELDS = ['id', 'app_name', 'app_category', 'app_date_created', 'status']
+USER_FIELDS = ['id', 'username', 'first_name', 'last_name', 'patronymic', 'email', 'is_employer', 'date_joined']
+
+
+def api_error(message, status):
+    return JsonResponse({'error': message}, status=status)
+
+def api_user_passes_test(test_func=None):
+    """Аналог login_required + user_passes_test, отвечающий JSON с кодом 401/403 вместо редиректа."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                return api_error('Требуется авторизация', 401)
+            if test_func and not test_func(request.user):
+                return api_error('Недостаточно прав', 403)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+api_login_required = api_user_passes_test()
+
+def make_etag(*parts):
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+def conditional_json(request, etag, build):
+    """Отдает 304, если ETag совпал, и только иначе вызывает build() для сериализации."""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and etag in parse_etags(if_none_match):
+        return HttpResponseNotModified(headers={'ETag': etag})
+    response = JsonResponse(build())
+    response.headers['ETag'] = etag
+    return response
+
+def requested_fields(request, default):
+    fields = request.GET.get('fields')
+    if not fields:
+        return default
+    selected = [field for field in fields.split(',') if field in APPLICATION_FIELDS]
+    if 'id' not in selected:
+        selected.insert(0, 'id')
+    return selected
+
+def serialize_application(row, fields):
+    data = {}
+    for field in fields:
+        value = row[APPLICATION_FIELDS[field]]
+        if field in ('app_image', 'design_image'):
+            value = value or None
+        data[field] = value
+    return data
+
+def visible_applications(user):
+    queryset = Application.objects.all()
+    if is_employer_or_superuser(user):
+        return queryset
+    return queryset.filter(app_publisher=user)
+
+
+@require_http_methods(['GET', 'POST'])
+@api_login_required
+def applications(request):
+    if request.method == 'POST':
+        return create_application(request)
+    fields = requested_fields(request, APPLICATION_LIST_FIELDS)
+    try:
+        limit = min(int(request.GET.get('limit', API_PAGE_SIZE)), API_MAX_PAGE_SIZE)
+    except ValueError:
+        return api_error('Некорректный limit', 400)
+    queryset = visible_applications(request.user).order_by('-app_date_created', '-id')
+    status_filter = request.GET.get('status')
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        position = decode_cursor(cursor)
+        if not position:
+            return api_error('Некорректный курсор', 400)
+        date_created, pk = position
+        queryset = queryset.filter(Q(app_date_created__lt=date_created) | Q(app_date_created=date_created, id__lt=pk))
+    queryset = queryset[:limit + 1]
+
+    versions = list(queryset.values_list('id', 'updated_at'))
+    etag = make_etag(request.user.pk, fields, *versions)
+
+    def build():
+        rows = list(queryset.values(*{APPLICATION_FIELDS[field] for field in fields} | {'app_date_created'}))
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(Application(pk=page[-1]['id'], app_date_created=page[-1]['app_date_created']))
+        return {
+            'results': [serialize_application(row, fields) for row in page],
+            'next_cursor': next_cursor,
+        }
+
+    return conditional_json(request, etag, build)
+
+@api_user_passes_test(is_user)
+def create_application(request):
+    form = ApplicationCreateForm(data=request.POST, files=uploaded_files(request))
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    application = form.save(commit=False)
+    application.app_publisher = request.user
+    with transaction.atomic():
+        application.save()
+    schedule_derivatives(application.app_image)
+    row = visible_applications(request.user).values(*APPLICATION_FIELDS.values()).get(pk=application.pk)
+    return JsonResponse(serialize_application(row, list(APPLICATION_FIELDS)), status=201)
+
+@require_http_methods(['GET', 'DELETE'])
+@api_login_required
+def application_detail(request, pk):
+    queryset = visible_applications(request.user).filter(pk=pk)
+    updated_at = queryset.values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return api_error('Заявка не найдена', 404)
+    if request.method == 'DELETE':
+        return delete_application(request, pk)
+    fields = requested_fields(request, list(APPLICATION_FIELDS))
+    etag = make_etag(pk, updated_at.isoformat(), fields)
+    return conditional_json(
+        request, etag,
+        lambda: serialize_application(queryset.values(*(APPLICATION_FIELDS[field] for field in fields)).get(), fields),
+    )
+
+@api_user_passes_test(is_user)
+def delete_application(request, pk):
+    application = get_object_or_404(Application, pk=pk, app_publisher=request.user)
+    if application.status in ['a', 'd']:
+        return api_error('Нельзя удалить заявку с текущим статусом.', 409)
+    with transaction.atomic():
+        application.delete()
+    return HttpResponse(status=204)
+
+@require_http_methods(['POST'])
+@api_user_passes_test(is_superuser)
+def application_status(request, pk):
+    application = get_object_or_404(Application, pk=pk)
+    error = status_change_error(application)
+    if error:
+        return api_error(error, 409)
+    form = ApplicationEditStatusForm(data=request.POST, instance=application)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    with transaction.atomic():
+        form.save()
+        schedule_status_notification(application)
+    return JsonResponse({'id': application.pk, 'status': application.status, 'comment': application.comment})
+
+@require_http_methods(['GET', 'POST'])
+@api_login_required
+def categories(request):
+    if request.method == 'POST':
+        if not is_superuser(request.user):
+            return api_error('Недостаточно прав', 403)
+        form = CategoryCreateForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+        category = form.save()
+        return JsonResponse({'id': category.pk, 'category_name': category.category_name}, status=201)
+    rows = list(Category.objects.order_by('id').values_list('id', 'category_name'))
+    return conditional_json(
+        request, make_etag(*rows),
+        lambda: {'results': [{'id': pk, 'category_name': name} for pk, name in rows]},
+    )
+
+@require_http_methods(['GET'])
+@api_login_required
+def users(request):
+    if not is_superuser(request.user):
+        return api_error('Недостаточно прав', 403)
+    queryset = AdvUser.objects.order_by('id')
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            queryset = queryset.filter(id__gt=int(cursor))
+        except ValueError:
+            return api_error('Некорректный курсор', 400)
+    rows = list(queryset.values(*USER_FIELDS)[:API_PAGE_SIZE + 1])
+    page = rows[:API_PAGE_SIZE]
+    next_cursor = page[-1]['id'] if len(rows) > API_PAGE_SIZE else None
+    return JsonResponse({'results': page, 'next_cursor': next_cursor})
+
+@require_http_methods(['GET', 'POST'])
+@api_login_required
+def current_user(request):
+    user = request.user
+    if request.method == 'POST':
+        form = UserEditForm(instance=user, data=request.POST)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+        user = form.save()
+    etag = make_etag(*(getattr(user, field) for field in USER_FIELDS))
+    return conditional_json(request, etag, lambda: {field: getattr(user, field) for field in USER_FIELDS})
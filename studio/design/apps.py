@@ -5,3 +5,9 @@ class DesignConfig(AppConfig):
     verbose_name = 'Дизайн-студия'
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'design'
+
+    def ready(self):
+        from . import checks, db, signals  # noqa: F401
+        from .cache import check_cache_settings
+
+        check_cache_settings()
@@ -0,0 +1,179 @@
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from .cache import bump_index_version
+from .db import delete_rows
+from .media import release_files
+from .models import Application, ApplicationEvent, ArchivedApplication
+from .search import get_search_backend
+from .stats import adjust
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_AFTER_DAYS = getattr(settings, 'DESIGN_ARCHIVE_AFTER_DAYS', 180)
+ARCHIVE_CHUNK_SIZE = getattr(settings, 'DESIGN_ARCHIVE_CHUNK_SIZE', 500)
+ARCHIVE_STATUS = 'd'
+# Общие колонки заявки и архивной заявки (attname)
+ARCHIVED_FIELDS = (
+    'id', 'app_name', 'app_description', 'app_category_id', 'app_date_created', 'updated_at', 'version',
+    'app_image', 'app_publisher_id', 'design_image', 'design_publisher_id', 'status', 'comment',
+)
+
+
+class ArchiveMetrics:
+    """Счетчики переносов в архив и обратно в текущем процессе."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {'archived': 0, 'restored': 0, 'chunks': 0}
+        self.last_run = None
+
+    def record(self, outcome, count):
+        with self.lock:
+            self.counters[outcome] += count
+            self.counters['chunks'] += 1
+
+    def record_run(self, count, duration):
+        with self.lock:
+            self.last_run = {'archived': count, 'duration_s': round(duration, 3), 'finished_at': timezone.now()}
+
+    def snapshot(self):
+        with self.lock:
+            return {**self.counters, 'last_run': self.last_run}
+
+metrics = ArchiveMetrics()
+
+
+def archivable(days=ARCHIVE_AFTER_DAYS):
+    return Application.objects.filter(status=ARCHIVE_STATUS, updated_at__lt=timezone.now() - timedelta(days=days))
+
+def adjust_stats(rows, sign):
+    stats = Counter()
+    for row in rows:
+        stats['status', row['status']] += 1
+        stats['category', row['app_category_id']] += 1
+        stats['designer', row['design_publisher_id']] += 1
+    for (dimension, key), count in stats.items():
+        adjust(dimension, key, sign * count)
+
+def archive_chunk(queryset, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """Переносит пачку заявок в архив: одна вставка и одно удаление в транзакции; файлы остаются за архивом."""
+    with transaction.atomic():
+        rows = list(queryset.order_by('id').values(*ARCHIVED_FIELDS)[:chunk_size])
+        if not rows:
+            return 0
+        ids = [row['id'] for row in rows]
+        # Новая версия: кэш и ETag детальной страницы не перепутают архивную заявку с прежней
+        ArchivedApplication.objects.bulk_create([
+            ArchivedApplication(**{**row, 'version': row['version'] + 1}) for row in rows
+        ])
+        # События остаются: у архивной заявки тот же id
+        delete_rows(Application, ids)
+        adjust_stats(rows, -1)
+        get_search_backend().remove_many(ids)
+    bump_index_version()
+    metrics.record('archived', len(ids))
+    return len(ids)
+
+def archive_completed(days=ARCHIVE_AFTER_DAYS, chunk_size=ARCHIVE_CHUNK_SIZE, limit=None):
+    """Переносит в архив заявки, выполненные больше days дней назад; каждая пачка в своей транзакции."""
+    started = time.perf_counter()
+    archived = 0
+    while limit is None or archived < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - archived)
+        count = archive_chunk(archivable(days), size)
+        if not count:
+            break
+        archived += count
+    metrics.record_run(archived, time.perf_counter() - started)
+    return archived
+
+@task
+def archive_completed_job(days=ARCHIVE_AFTER_DAYS, chunk_size=ARCHIVE_CHUNK_SIZE):
+    archived = archive_completed(days, chunk_size)
+    logger.info('В архив перенесено заявок: %s', archived)
+
+def schedule_archive(days=ARCHIVE_AFTER_DAYS, chunk_size=ARCHIVE_CHUNK_SIZE):
+    return archive_completed_job.delay(
+        days, chunk_size, idempotency_key=f'archive:{days}:{timezone.now().date().isoformat()}',
+    )
+
+def restore_chunk(queryset, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """Возвращает пачку архивных заявок в основную таблицу с прежними id и датой создания."""
+    with transaction.atomic():
+        rows = list(queryset.order_by('id').values(*ARCHIVED_FIELDS)[:chunk_size])
+        if not rows:
+            return 0
+        ids = [row['id'] for row in rows]
+        applications = Application.objects.bulk_create([
+            Application(**{**row, 'version': row['version'] + 1}) for row in rows
+        ])
+        # bulk_create проставляет auto_now_add, а bulk_update пишет значения как есть; updated_at остается
+        # временем восстановления, чтобы следующий запуск архивации не вернул заявку в архив сразу
+        for application, row in zip(applications, rows):
+            application.app_date_created = row['app_date_created']
+        Application.objects.bulk_update(applications, ['app_date_created'])
+        ArchivedApplication.objects.filter(id__in=ids).delete()
+        adjust_stats(rows, 1)
+        backend = get_search_backend()
+        for application in applications:
+            backend.index(application)
+    bump_index_version()
+    metrics.record('restored', len(ids))
+    return len(ids)
+
+def restore_archived(queryset, chunk_size=ARCHIVE_CHUNK_SIZE):
+    restored = 0
+    while True:
+        count = restore_chunk(queryset, chunk_size)
+        if not count:
+            return restored
+        restored += count
+
+def delete_archived(queryset):
+    """Удаляет архивные заявки вместе с их событиями и ссылками на файлы."""
+    files = Counter()
+    ids = []
+    with transaction.atomic():
+        for pk, app_image, design_image in queryset.values_list('id', 'app_image', 'design_image').iterator():
+            ids.append(pk)
+            files[app_image] += 1
+            files[design_image] += 1
+        deleted, _ = queryset.delete()
+        ApplicationEvent.objects.filter(application_id__in=ids).delete()
+        release_files(files)
+    return deleted
+
+def find_application(pk, queryset=None, archived_queryset=None):
+    """Заявка из основной таблицы или, если ее там нет, из архива; None, если нет нигде."""
+    queryset = Application.objects.all() if queryset is None else queryset
+    application = queryset.filter(pk=pk).first()
+    if application is None:
+        archived_queryset = ArchivedApplication.objects.all() if archived_queryset is None else archived_queryset
+        application = archived_queryset.filter(pk=pk).first()
+    return application
+
+def archive_stats(days=ARCHIVE_AFTER_DAYS):
+    hot = dict(Application.objects.values_list('status').annotate(count=Count('id')).order_by())
+    archive = ArchivedApplication.objects.aggregate(
+        total=Count('id'), oldest=Min('archived_at'), newest=Max('archived_at'),
+    )
+    return {
+        'hot': {
+            'total': sum(hot.values()),
+            'by_status': hot,
+            'archivable': archivable(days).count(),
+        },
+        'archive': archive,
+        'after_days': days,
+        'process': metrics.snapshot(),
+    }
@@ -0,0 +1,18 @@
+from django.urls import path
+
+from . import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+ASYNC_VIEWS = {
+    'index': async_views.IndexView.as_view(),
+    'detail_application': async_views.ApplicationDetail.as_view(),
+    'custom_applications': async_views.CustomApplicationsView.as_view(),
+    'all_applications': async_views.AllApplicationsView.as_view(),
+    'application_events': async_views.application_events,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name], name=pattern.name) if pattern.name in ASYNC_VIEWS
+    else pattern
+    for pattern in sync_urlpatterns
+]
@@ -0,0 +1,175 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.template.response import TemplateResponse
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from .cache import acached_fragment, aindex_version, astatus_count, detail_etag, detail_fragment_key, viewer_role
+from .events import event_stream, format_replay, parse_last_event_id, streaming_available
+from .models import Application, ArchivedApplication
+from .pagination import KeysetPaginationMixin
+from .search import search_page
+from .views import is_employer_or_superuser, is_user
+
+
+async def aget_user(request):
+    auser = getattr(request, 'auser', None)
+    if auser is not None:
+        return await auser()
+
+    def load_user():
+        request.user.is_authenticated
+        return request.user
+
+    return await sync_to_async(load_user)()
+
+def async_user_passes_test(test_func=None):
+    """Асинхронная замена связки login_required + user_passes_test."""
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            user = await aget_user(request)
+            if not user.is_authenticated or (test_func and not test_func(user)):
+                return redirect_to_login(request.get_full_path())
+            return await view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+async_login_required = async_user_passes_test()
+
+@async_login_required
+async def application_events(request):
+    """SSE-поток событий по заявкам текущего пользователя."""
+    user = await aget_user(request)
+    last_id = parse_last_event_id(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id'))
+    if not streaming_available(request):
+        # Под WSGI асинхронный поток был бы собран целиком и отдан только через EVENTS_MAX_AGE
+        response = HttpResponse(await sync_to_async(format_replay)(user.pk, last_id), content_type='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    response = StreamingHttpResponse(event_stream(user.pk, last_id), content_type='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class IndexView(View):
+    template_name = 'design/index.html'
+    fragment_template_name = 'design/index_content.html'
+
+    async def get(self, request):
+        user = await aget_user(request)
+        context = {}
+        timing = None
+        if user.is_authenticated:
+            context['accepted_count'] = await astatus_count('a')
+
+            async def render_fragment():
+                queryset = Application.objects.filter(status='d').select_related('app_category')
+                context['applications_list'] = [
+                    application async for application in queryset.order_by('-app_date_created')[:4]
+                ]
+                return await sync_to_async(render_to_string)(self.fragment_template_name, context, request)
+
+            context['index_fragment'], timing = await acached_fragment(
+                'index', f'design:index:fragment:{await aindex_version()}', render_fragment,
+            )
+        response = TemplateResponse(request, self.template_name, context)
+        if timing:
+            event, duration = timing
+            response.headers['Server-Timing'] = f'index-cache;desc="{event}";dur={duration * 1000:.2f}'
+        return response
+
+
+@method_decorator(async_login_required, name='dispatch')
+class ApplicationDetail(View):
+    template_name = 'design/detail_application.html'
+    fragment_template_name = 'design/detail_application_content.html'
+
+    async def get(self, request, pk):
+        queryset = Application.objects.select_related('app_category', 'app_publisher', 'design_publisher')
+        try:
+            application = await queryset.aget(pk=pk)
+        except Application.DoesNotExist:
+            archived = ArchivedApplication.objects.select_related('app_category', 'app_publisher', 'design_publisher')
+            try:
+                application = await archived.aget(pk=pk)
+            except ArchivedApplication.DoesNotExist:
+                raise Http404('Заявка недоступна')
+        user = await aget_user(request)
+        role = viewer_role(user)
+        has_messages = await sync_to_async(lambda: bool(len(messages.get_messages(request))))()
+        etag = None
+        if application.status == 'd' and not has_messages:
+            etag = detail_etag(application, role)
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified:
+                return not_modified
+        context = {'application': application}
+        context['detail_fragment'], _ = await acached_fragment(
+            'detail',
+            detail_fragment_key(application, role),
+            lambda: sync_to_async(render_to_string)(self.fragment_template_name, context, request),
+        )
+        response = TemplateResponse(request, self.template_name, context)
+        if etag:
+            response.headers['ETag'] = etag
+            response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class AsyncKeysetListView(KeysetPaginationMixin, View):
+    template_name = None
+
+    def get_queryset(self, user):
+        raise NotImplementedError
+
+    async def get_page(self, user):
+        queryset = self.get_queryset(user).order_by('-app_date_created', '-id')
+        rows = [application async for application in self.keyset_queryset(queryset)]
+        return self.split_page(rows)
+
+    async def get(self, request):
+        user = await aget_user(request)
+        page, next_cursor = await self.get_page(user)
+        context = self.page_context(page, next_cursor)
+        context['applications_list'] = context['object_list']
+        return TemplateResponse(request, self.template_name, context)
+
+
+@method_decorator(async_user_passes_test(is_user), name='dispatch')
+class CustomApplicationsView(AsyncKeysetListView):
+    template_name = 'design/custom_applications.html'
+
+    def get_queryset(self, user):
+        queryset = Application.objects.select_related('app_category').filter(app_publisher=user.pk)
+        status_filter = self.request.GET.get('status')
+        if status_filter:
+            return queryset.filter(status=status_filter)
+        return queryset
+
+
+@method_decorator(async_user_passes_test(is_employer_or_superuser), name='dispatch')
+class AllApplicationsView(AsyncKeysetListView):
+    template_name = 'design/all_applications.html'
+
+    def get_queryset(self, user):
+        queryset = Application.objects.select_related('app_category', 'app_publisher')
+        status_filter = self.request.GET.get('status')
+        if status_filter:
+            return queryset.filter(status=status_filter)
+        return queryset
+
+    async def get_page(self, user):
+        search_query = self.request.GET.get('q', '').strip()
+        if not search_query:
+            return await super().get_page(user)
+        return await sync_to_async(search_page)(
+            search_query, self.request.GET.get('status'), self.request.GET.get(self.cursor_param), self.paginate_by,
+        )
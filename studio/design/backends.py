@@ -0,0 +1,25 @@
+from django.contrib.auth.backends import ModelBackend
+from django.db import DEFAULT_DB_ALIAS
+
+from .cache import user_snapshot
+from .models import AdvUser
+
+# id, ник и роли для проверок в представлениях и base.html; пароль (хеш) нужен для проверки
+# хеша сессии в AuthenticationMiddleware. Остальные поля догружаются при первом обращении.
+USER_SNAPSHOT_FIELDS = ('id', 'username', 'password', 'is_active', 'is_staff', 'is_superuser', 'is_employer')
+# Model.from_db ожидает значения в порядке полей модели
+SNAPSHOT_ATTNAMES = tuple(field.attname for field in AdvUser._meta.concrete_fields if field.attname in USER_SNAPSHOT_FIELDS)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который восстанавливает пользователя сессии из кэшированного снимка без запроса к БД."""
+
+    def get_user(self, user_id):
+        snapshot = user_snapshot(
+            user_id,
+            lambda: AdvUser._default_manager.filter(pk=user_id).values_list(*SNAPSHOT_ATTNAMES).first(),
+        )
+        if snapshot is None:
+            return None
+        user = AdvUser.from_db(DEFAULT_DB_ALIAS, SNAPSHOT_ATTNAMES, snapshot)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import build_opener
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def summarize(latencies, elapsed, errors=0):
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+    }
+
+async def run_concurrent(client, paths, concurrency, total):
+    """Выполняет total запросов к paths через AsyncClient, не более concurrency одновременно."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def fetch(path):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(fetch(paths[i % len(paths)]) for i in range(total)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+def run_http(base_url, session_cookie, paths, concurrency, total):
+    """Нагружает запущенный HTTP-сервер из пула потоков, имитируя параллельных клиентов."""
+    def fetch(path):
+        opener = build_opener()
+        opener.addheaders = [('Cookie', session_cookie)]
+        started = time.perf_counter()
+        try:
+            with opener.open(base_url + path) as response:
+                response.read()
+                ok = response.status < 400
+        except HTTPError:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(fetch, (paths[i % len(paths)] for i in range(total))))
+    elapsed = time.perf_counter() - started
+    return summarize([latency for latency, _ in results], elapsed, sum(1 for _, ok in results if not ok))
+
+def compare_results(baseline, current, threshold):
+    """Возвращает список регрессий: метрики, выросшие больше чем на threshold (доля)."""
+    regressions = []
+    for route, metrics in current.get('routes', {}).items():
+        base = baseline.get('routes', {}).get(route)
+        if not base:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'queries'):
+            before, after = base.get(metric), metrics.get(metric)
+            if before is None or after is None:
+                continue
+            limit = before * (1 + threshold) if metric != 'queries' else before
+            if after > limit and after - before > 0.5:
+                regressions.append(f'{route}.{metric}: {before} -> {after}')
+    return regressions
@@ -0,0 +1,122 @@
+import csv
+import json
+import os
+import time
+from pathlib import Path
+
+from django.utils.dateparse import parse_datetime
+
+from .models import Application
+
+APPLICATION_FIELDS = [
+    'id', 'app_name', 'app_description', 'category', 'app_date_created', 'app_image', 'publisher',
+    'design_image', 'designer', 'status', 'comment',
+]
+CATEGORY_FIELDS = ['id', 'category_name']
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return 'csv' if Path(path).suffix.lower() == '.csv' else 'ndjson'
+
+def read_records(path, fmt):
+    with open(path, encoding='utf-8', newline='') as file:
+        if fmt == 'csv':
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+class RecordWriter:
+    def __init__(self, path, fmt, fields, append=False, offset=None):
+        self.fmt = fmt
+        self.fields = fields
+        if append and offset is not None and Path(path).exists():
+            # Все, что записано после контрольной точки (в том числе недописанная строка), выгрузится заново
+            os.truncate(path, offset)
+        write_header = not append or not Path(path).exists() or Path(path).stat().st_size == 0
+        self.file = open(path, 'a' if append else 'w', encoding='utf-8', newline='')
+        if fmt == 'csv':
+            self.writer = csv.DictWriter(self.file, fieldnames=fields)
+            if write_header:
+                self.writer.writeheader()
+
+    def write(self, record):
+        if self.fmt == 'csv':
+            self.writer.writerow({key: '' if value is None else value for key, value in record.items()})
+        else:
+            self.file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+    def flush(self):
+        self.file.flush()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class Checkpoint:
+    """Позиция последней завершенной пачки, чтобы многочасовой запуск можно было продолжить."""
+
+    def __init__(self, path):
+        self.path = Path(path) if path else None
+
+    def load(self):
+        if self.path and self.path.exists():
+            return json.loads(self.path.read_text())
+        return {}
+
+    def save(self, **state):
+        if self.path:
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(state))
+            tmp.replace(self.path)
+
+    def clear(self):
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+
+class Progress:
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.started = time.perf_counter()
+        self.processed = 0
+
+    def advance(self, count):
+        self.processed += count
+        elapsed = time.perf_counter() - self.started
+        rate = self.processed / elapsed if elapsed else 0
+        self.stdout.write(f'Обработано: {self.processed} ({rate:.0f} записей/с)')
+
+
+def parse_date(value):
+    if not value:
+        return None
+    return parse_datetime(value) if isinstance(value, str) else value
+
+def restore_creation_dates(applications, dates):
+    """Записывает исходные даты создания после bulk_create, который проставляет auto_now_add; None пропускается."""
+    dated = []
+    for application, date_created in zip(applications, dates):
+        if date_created is not None:
+            application.app_date_created = date_created
+            dated.append(application)
+    if dated:
+        Application.objects.bulk_update(dated, ['app_date_created'])
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
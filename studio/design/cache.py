@@ -0,0 +1,185 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+DESIGN_CACHE_ALIAS = getattr(settings, 'DESIGN_CACHE_ALIAS', 'default')
+FRAGMENT_TIMEOUT = getattr(settings, 'DESIGN_FRAGMENT_TIMEOUT', 60 * 60)
+
+INDEX_VERSION_KEY = 'design:index:version'
+STATUS_COUNT_KEY = 'design:status_count:{}'
+# Число заявок в статусе читается из ApplicationStats и кэшируется ненадолго: кэш процесса не видит изменений
+# в других воркерах, поэтому счетчик в кэше не изменяется, а перечитывается по истечении срока
+STATUS_COUNT_TIMEOUT = getattr(settings, 'DESIGN_STATUS_COUNT_TIMEOUT', 10)
+# Версия главной страницы хранится бессрочно только в общем кэше; в кэше процесса она истекает, и воркеры,
+# не знающие о чужих изменениях, перестраивают фрагмент хотя бы с таким интервалом
+LOCAL_INDEX_VERSION_TIMEOUT = getattr(settings, 'DESIGN_LOCAL_INDEX_VERSION_TIMEOUT', 10)
+USER_SNAPSHOT_KEY = 'design:user:{}'
+USER_SNAPSHOT_TIMEOUT = getattr(settings, 'DESIGN_USER_CACHE_TIMEOUT', 5 * 60)
+# Бэкенды, содержимое которых видит только текущий процесс
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+CACHED_SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+CACHED_AUTH_BACKEND = 'design.backends.CachedModelBackend'
+
+
+def get_cache():
+    return caches[DESIGN_CACHE_ALIAS]
+
+def is_shared_cache(alias=DESIGN_CACHE_ALIAS):
+    return not isinstance(caches[alias], PROCESS_LOCAL_CACHES)
+
+def require_shared_cache(feature, alias=DESIGN_CACHE_ALIAS):
+    if not is_shared_cache(alias):
+        raise ImproperlyConfigured(
+            f'{feature} требует общего для всех процессов кэша, а CACHES[{alias!r}] '
+            f'({settings.CACHES[alias]["BACKEND"]}) хранит данные в памяти процесса. '
+            f'Задайте DESIGN_CACHE=file или другой общий бэкенд.'
+        )
+
+def check_cache_settings():
+    """Запрещает состояние сессий и пользователей в кэше процесса: другие воркеры его не видят."""
+    if settings.SESSION_ENGINE == CACHED_SESSION_ENGINE:
+        require_shared_cache('DESIGN_SESSIONS=cached_db', settings.SESSION_CACHE_ALIAS)
+    if CACHED_AUTH_BACKEND in settings.AUTHENTICATION_BACKENDS:
+        require_shared_cache('DESIGN_USER_CACHE=1')
+
+
+class CacheStats:
+    """Счетчики попаданий, промахов и время перестроения кэшированных фрагментов."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = {}
+
+    def record(self, name, event, seconds):
+        with self.lock:
+            entry = self.data.setdefault(name, {'hit': 0, 'miss': 0, 'hit_ms': 0.0, 'rebuild_ms': 0.0})
+            entry[event] += 1
+            entry['hit_ms' if event == 'hit' else 'rebuild_ms'] += seconds * 1000
+
+    def snapshot(self):
+        with self.lock:
+            return {name: dict(entry) for name, entry in self.data.items()}
+
+
+cache_stats = CacheStats()
+
+
+def index_version_timeout():
+    return None if is_shared_cache() else LOCAL_INDEX_VERSION_TIMEOUT
+
+def index_version():
+    cache = get_cache()
+    version = cache.get(INDEX_VERSION_KEY)
+    if version is None:
+        cache.add(INDEX_VERSION_KEY, time.time_ns(), index_version_timeout())
+        version = cache.get(INDEX_VERSION_KEY)
+    return version
+
+async def aindex_version():
+    cache = get_cache()
+    version = await cache.aget(INDEX_VERSION_KEY)
+    if version is None:
+        await cache.aadd(INDEX_VERSION_KEY, time.time_ns(), index_version_timeout())
+        version = await cache.aget(INDEX_VERSION_KEY)
+    return version
+
+def bump_index_version():
+    cache = get_cache()
+    try:
+        cache.incr(INDEX_VERSION_KEY)
+    except ValueError:
+        cache.add(INDEX_VERSION_KEY, time.time_ns(), index_version_timeout())
+
+def stored_status_count(status):
+    from .models import ApplicationStats
+
+    return ApplicationStats.objects.filter(dimension='status', key=status).values_list('count', flat=True).first() or 0
+
+def status_count(status):
+    cache = get_cache()
+    key = STATUS_COUNT_KEY.format(status)
+    count = cache.get(key)
+    if count is None:
+        count = stored_status_count(status)
+        cache.set(key, count, STATUS_COUNT_TIMEOUT)
+    return count
+
+async def astatus_count(status):
+    from .models import ApplicationStats
+
+    cache = get_cache()
+    key = STATUS_COUNT_KEY.format(status)
+    count = await cache.aget(key)
+    if count is None:
+        count = await ApplicationStats.objects.filter(dimension='status', key=status).values_list(
+            'count', flat=True).afirst() or 0
+        await cache.aset(key, count, STATUS_COUNT_TIMEOUT)
+    return count
+
+def user_snapshot(user_id, load):
+    """Кортеж полей пользователя из кэша; load() читает его из БД при промахе."""
+    cache = get_cache()
+    key = USER_SNAPSHOT_KEY.format(user_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = load()
+        if snapshot is not None:
+            cache.set(key, snapshot, USER_SNAPSHOT_TIMEOUT)
+    return snapshot
+
+def invalidate_user(user_id):
+    get_cache().delete(USER_SNAPSHOT_KEY.format(user_id))
+
+def viewer_role(user):
+    if user.is_superuser:
+        return 'superuser'
+    if user.is_employer:
+        return 'employer'
+    return 'user'
+
+def detail_fragment_key(application, role):
+    return f'design:detail:{application.pk}:{application.version}:{role}'
+
+def detail_etag(application, role):
+    return f'W/"{application.pk}-{application.version}-{role}"'
+
+def cached_fragment(name, key, render):
+    """Возвращает отрендеренный фрагмент из кэша или строит его заново.
+
+    Вторым значением возвращается (событие, длительность в секундах) для Server-Timing.
+    """
+    cache = get_cache()
+    started = time.perf_counter()
+    fragment = cache.get(key)
+    if fragment is not None:
+        event = 'hit'
+    else:
+        event = 'miss'
+        fragment = render()
+        cache.set(key, fragment, FRAGMENT_TIMEOUT)
+    duration = time.perf_counter() - started
+    cache_stats.record(name, event, duration)
+    logger.debug('%s cache %s: %.2f ms', name, event, duration * 1000)
+    return fragment, (event, duration)
+
+async def acached_fragment(name, key, arender):
+    cache = get_cache()
+    started = time.perf_counter()
+    fragment = await cache.aget(key)
+    if fragment is not None:
+        event = 'hit'
+    else:
+        event = 'miss'
+        fragment = await arender()
+        await cache.aset(key, fragment, FRAGMENT_TIMEOUT)
+    duration = time.perf_counter() - started
+    cache_stats.record(name, event, duration)
+    return fragment, (event, duration)
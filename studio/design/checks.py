@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.checks import Warning, register
+
+
+def static_manifest_missing():
+    """True, если включен профиль статики manifest, а манифест collectstatic не найден."""
+    if getattr(settings, 'DESIGN_STATIC', 'dev') != 'manifest':
+        return False
+    return not Path(settings.STATIC_ROOT, staticfiles_storage.manifest_name).is_file()
+
+@register()
+def check_static_manifest(app_configs, **kwargs):
+    # Предупреждение, а не ошибка: иначе не запустятся команды, нужные до collectstatic.
+    # Запуск WSGI/ASGI-приложения без манифеста прерывается в studio/wsgi.py и studio/asgi.py
+    if static_manifest_missing():
+        return [Warning(
+            f'Не найден манифест статики в {settings.STATIC_ROOT}',
+            hint='Выполните manage.py collectstatic перед запуском с DESIGN_STATIC=manifest',
+            id='design.W001',
+        )]
+    return []
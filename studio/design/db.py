@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import connections, router
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+SQLITE_PRAGMAS = getattr(settings, 'DESIGN_SQLITE_PRAGMAS', {})
+REPORTED_PRAGMAS = ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size')
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Настраивает новое подключение SQLite: режим журнала, busy_timeout, mmap и размер кэша."""
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+def sqlite_settings(connection):
+    """Текущие значения PRAGMA подключения - для отчетов бенчмарков."""
+    if connection.vendor != 'sqlite':
+        return {}
+    with connection.cursor() as cursor:
+        return {name: cursor.execute(f'PRAGMA {name}').fetchone()[0] for name in REPORTED_PRAGMAS}
+
+def delete_rows(model, ids, batch_size=500):
+    """Удаляет строки по первичному ключу запросом DELETE в обход Collector: строки не выбираются, сигналы не шлются.
+
+    Зависимые строки, статистику, файлы и поиск вызывающий код обрабатывает сам.
+    """
+    connection = connections[router.db_for_write(model)]
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    deleted = 0
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({placeholders})', chunk)
+            deleted += cursor.rowcount
+    return deleted
@@ -0,0 +1,87 @@
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .archive import delete_archived
+from .cache import bump_index_version
+from .db import delete_rows
+from .media import release_files
+from .models import AdvUser, Application, ApplicationEvent, ApplicationStats, ArchivedApplication, Category
+from .search import get_search_backend
+from .stats import adjust, record_user_deleted
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+DELETE_CHUNK_SIZE = getattr(settings, 'DESIGN_DELETE_CHUNK_SIZE', 1000)
+BACKGROUND_DELETE_THRESHOLD = getattr(settings, 'DESIGN_BACKGROUND_DELETE_THRESHOLD', 5000)
+
+
+def delete_applications_chunk(queryset):
+    """Удаляет пачку заявок, выполняя то же, что и сигналы post_delete, но агрегированно."""
+    rows = list(queryset.values_list('id', 'status', 'app_category_id', 'design_publisher_id',
+                                     'app_image', 'design_image')[:DELETE_CHUNK_SIZE])
+    if not rows:
+        return 0
+    ids = [row[0] for row in rows]
+    stats = Counter()
+    files = Counter()
+    for _, status, category_id, designer_id, app_image, design_image in rows:
+        stats['status', status] += 1
+        stats['category', category_id] += 1
+        stats['designer', designer_id] += 1
+        files[app_image] += 1
+        files[design_image] += 1
+    with transaction.atomic():
+        # QuerySet.delete() для Application не идет быстрым путем (на модель подписаны pre/post_delete)
+        # и загружал бы каждую строку; события удаляются одним запросом, заявки - прямым DELETE по id
+        ApplicationEvent.objects.filter(application_id__in=ids).delete()
+        delete_rows(Application, ids)
+        for (dimension, key), count in stats.items():
+            adjust(dimension, key, -count)
+        release_files(files)
+        get_search_backend().remove_many(ids)
+    bump_index_version()
+    return len(ids)
+
+def delete_category_now(category_id):
+    applications = Application.objects.filter(app_category_id=category_id).order_by('id')
+    deleted = 0
+    while True:
+        chunk = delete_applications_chunk(applications)
+        if not chunk:
+            break
+        deleted += chunk
+    deleted += delete_archived(ArchivedApplication.objects.filter(app_category_id=category_id))
+    with transaction.atomic():
+        Category.objects.filter(pk=category_id).delete()
+        ApplicationStats.objects.filter(dimension='category', key=str(category_id)).delete()
+    return deleted
+
+@task
+def delete_category_job(category_id):
+    deleted = delete_category_now(category_id)
+    logger.info('Категория %s удалена вместе с %s заявками', category_id, deleted)
+
+def delete_category(category):
+    """Удаляет категорию; большие категории удаляются в фоне. Возвращает True, если удаление отложено."""
+    count = Application.objects.filter(app_category=category).aggregate(count=Count('id'))['count']
+    if count > BACKGROUND_DELETE_THRESHOLD:
+        delete_category_job.delay(category.pk, idempotency_key=f'delete_category:{category.pk}')
+        return True
+    delete_category_now(category.pk)
+    return False
+
+def delete_user(user):
+    """Удаляет пользователя, обнуляя ссылки на него в заявках двумя UPDATE без загрузки строк."""
+    with transaction.atomic():
+        record_user_deleted(user)
+        now = timezone.now()
+        version = F('version') + 1
+        Application.objects.filter(app_publisher=user).update(app_publisher=None, updated_at=now, version=version)
+        Application.objects.filter(design_publisher=user).update(design_publisher=None, updated_at=now, version=version)
+        AdvUser.objects.filter(pk=user.pk).delete()
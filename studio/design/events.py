@@ -0,0 +1,250 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import Max
+
+from .models import Application, ApplicationEvent
+
+logger = logging.getLogger(__name__)
+
+EVENTS_BROKER = getattr(settings, 'DESIGN_EVENTS_BROKER', 'local')
+EVENTS_BUFFER_SIZE = getattr(settings, 'DESIGN_EVENTS_BUFFER_SIZE', 16)
+EVENTS_REPLAY_LIMIT = getattr(settings, 'DESIGN_EVENTS_REPLAY_LIMIT', 100)
+EVENTS_KEEPALIVE = getattr(settings, 'DESIGN_EVENTS_KEEPALIVE', 15)
+# Соединение закрывается по таймеру, клиент переподключается с Last-Event-ID: так не копятся
+# соединения, разрыв которых сервер не заметил
+EVENTS_MAX_AGE = getattr(settings, 'DESIGN_EVENTS_MAX_AGE', 300)
+EVENTS_RETRY = getattr(settings, 'DESIGN_EVENTS_RETRY', 3000)
+# Без ASGI поток не держится открытым, и каждое переподключение - лишний запрос; EventSource на страницы
+# в этом случае не подключается (events_script), а случайный клиент переподключается редко
+EVENTS_WSGI_RETRY = getattr(settings, 'DESIGN_EVENTS_WSGI_RETRY', 5 * 60 * 1000)
+ASYNC_VIEWS = getattr(settings, 'DESIGN_ASYNC_VIEWS', False)
+EVENTS_POLL_INTERVAL = getattr(settings, 'DESIGN_EVENTS_POLL_INTERVAL', 1.0)
+STATUS_DISPLAY = dict(Application.APP_STATUS)
+
+
+class Subscription:
+    """Буфер событий одного соединения; при переполнении старые события вытесняются и отмечается пропуск."""
+    __slots__ = ('user_id', 'loop', 'buffer', 'ready', 'overflowed')
+
+    def __init__(self, user_id, loop, size):
+        self.user_id = user_id
+        self.loop = loop
+        self.buffer = deque(maxlen=size)
+        self.ready = asyncio.Event()
+        self.overflowed = False
+
+    def put(self, event):
+        if len(self.buffer) == self.buffer.maxlen:
+            self.overflowed = True
+        self.buffer.append(event)
+        self.ready.set()
+
+    def drain(self):
+        events, overflowed = list(self.buffer), self.overflowed
+        self.buffer.clear()
+        self.ready.clear()
+        self.overflowed = False
+        return events, overflowed
+
+
+class EventHub:
+    """Подписки процесса по пользователям; publish можно вызывать из любого потока."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = {}
+        self.published = 0
+
+    def subscribe(self, user_id, size=EVENTS_BUFFER_SIZE):
+        subscription = Subscription(user_id, asyncio.get_running_loop(), size)
+        with self.lock:
+            self.subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscribers[subscription.user_id]
+
+    def publish(self, events):
+        with self.lock:
+            targets = [(subscription, event) for event in events
+                       for subscription in self.subscribers.get(event.user_id, ())]
+        for subscription, event in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # Цикл событий соединения уже закрыт
+                self.unsubscribe(subscription)
+        self.published += len(targets)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'users': len(self.subscribers),
+                'connections': sum(len(subscriptions) for subscriptions in self.subscribers.values()),
+                'published': self.published,
+            }
+
+hub = EventHub()
+
+
+class LocalBroker:
+    """Раздает события сразу после коммита, но только слушателям этого процесса."""
+
+    def publish(self, events):
+        hub.publish(events)
+
+    def start(self):
+        pass
+
+
+class DatabaseBroker:
+    """Замена внешней шины: поток каждого процесса опрашивает журнал событий и раздает новые записи своим слушателям."""
+
+    def __init__(self, interval=EVENTS_POLL_INTERVAL):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def publish(self, events):
+        pass
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='design-events', daemon=True)
+                self.thread.start()
+
+    def poll(self, last_id):
+        if last_id is None:
+            return latest_event_id()
+        events = list(ApplicationEvent.objects.filter(id__gt=last_id).order_by('id')[:EVENTS_REPLAY_LIMIT * 10])
+        hub.publish(events)
+        return events[-1].id if events else last_id
+
+    def run(self):
+        last_id = None
+        while True:
+            time.sleep(self.interval)
+            if not hub.subscribers:
+                last_id = None
+                continue
+            try:
+                last_id = self.poll(last_id)
+            except DatabaseError:
+                logger.exception('Не удалось прочитать журнал событий')
+                close_old_connections()
+
+def get_broker():
+    return DatabaseBroker() if EVENTS_BROKER == 'database' else LocalBroker()
+
+broker = get_broker()
+
+
+def record_events(rows):
+    """Записывает события (заявка, получатель, вид, статус) в журнал и раздает их после коммита."""
+    events = [
+        ApplicationEvent(application_id=application_id, user_id=user_id, kind=kind, status=status)
+        for application_id, user_id, kind, status in rows if user_id is not None
+    ]
+    if not events:
+        return []
+    events = ApplicationEvent.objects.bulk_create(events, batch_size=500)
+    transaction.on_commit(lambda: broker.publish(events))
+    return events
+
+def latest_event_id(user_id=None):
+    queryset = ApplicationEvent.objects.all()
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    return queryset.aggregate(last_id=Max('id'))['last_id'] or 0
+
+def replay_events(user_id, last_id):
+    """Возвращает (события после last_id, None) или, если пропущено слишком много, ([], id последнего события)."""
+    events = list(ApplicationEvent.objects.filter(user_id=user_id, id__gt=last_id).order_by('id')[:EVENTS_REPLAY_LIMIT + 1])
+    if len(events) > EVENTS_REPLAY_LIMIT:
+        return [], latest_event_id(user_id)
+    return events, None
+
+def parse_last_event_id(value):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+def format_event(event):
+    data = {
+        'application': event.application_id,
+        'status': event.status,
+        'status_display': STATUS_DISPLAY.get(event.status, event.status),
+    }
+    return f'id: {event.id}\nevent: {event.kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+def format_reset(reset_id):
+    # Клиент не сможет восстановить пропущенное по событиям и должен перечитать страницу
+    return f'id: {reset_id}\nevent: reset\ndata: {{}}\n\n'
+
+def streaming_available(request):
+    """Поток SSE держит соединение минутами, поэтому работает только под ASGI с асинхронными представлениями."""
+    return ASYNC_VIEWS and isinstance(request, ASGIRequest)
+
+def format_replay(user_id, last_id):
+    """Ответ без потока (WSGI): пропущенное после last_id, а без last_id только текущая позиция клиента."""
+    if last_id is None:
+        return f'retry: {EVENTS_WSGI_RETRY}\nid: {latest_event_id(user_id)}\n\n'
+    events, reset_id = replay_events(user_id, last_id)
+    if reset_id is not None:
+        return f'retry: {EVENTS_WSGI_RETRY}\n\n' + format_reset(reset_id)
+    return ''.join([f'retry: {EVENTS_WSGI_RETRY}\n\n', *(format_event(event) for event in events)])
+
+async def event_stream(user_id, last_id=None):
+    """Поток SSE для пользователя: досылает пропущенное после Last-Event-ID, затем раздает новые события."""
+    subscription = hub.subscribe(user_id)
+    broker.start()
+    try:
+        yield f'retry: {EVENTS_RETRY}\n\n'
+        if last_id is None:
+            last_id = await sync_to_async(latest_event_id)(user_id)
+            yield f'id: {last_id}\n\n'
+        replay = True
+        deadline = time.monotonic() + EVENTS_MAX_AGE
+        while True:
+            if replay:
+                events, reset_id = await sync_to_async(replay_events)(user_id, last_id)
+                if reset_id is not None:
+                    last_id = reset_id
+                    yield format_reset(reset_id)
+            else:
+                timeout = min(EVENTS_KEEPALIVE, deadline - time.monotonic())
+                if timeout <= 0:
+                    return
+                try:
+                    await asyncio.wait_for(subscription.ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    if time.monotonic() >= deadline:
+                        return
+                    yield ': keepalive\n\n'
+                    continue
+                events, replay = subscription.drain()
+                if replay:
+                    continue
+            for event in events:
+                if event.id > last_id:
+                    last_id = event.id
+                    yield format_event(event)
+            replay = False
+    finally:
+        hub.unsubscribe(subscription)
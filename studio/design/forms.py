@@ -1,9 +1,11 @@
-from PIL import Image
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm, UserChangeForm
 from django.core.validators import RegexValidator, EmailValidator
+from django.db.models import Q
 
 from .models import AdvUser, Application, Category
+from .status_changes import COMMENT_REQUIRED_ERROR, comment_required
+from .validators import IMAGE_MAX_SIZES, validate_image_upload
 
 
 class UserLoginForm(AuthenticationForm):
@@ -11,7 +13,44 @@ class UserLoginForm(AuthenticationForm):
         model = AdvUser
         fields = ['username', 'password']
 
-class UserRegisterForm(UserCreationForm):
+class UniqueAccountMixin:
+    """Проверяет занятость ника и почты одним запросом по уникальным индексам.
+
+    Почта сравнивается без учета регистра через AdvUser.email_key; одновременные регистрации
+    отсекают ограничения уникальности в БД.
+    """
+    username_taken_message = 'Данный ник занят'
+    email_taken_message = 'Данная почта занята'
+
+    def clean_username(self):
+        return self.cleaned_data['username']
+
+    def clean(self):
+        cleaned_data = super().clean()
+        username = cleaned_data.get('username')
+        email_key = AdvUser.normalize_email_key(cleaned_data.get('email'))
+        lookup = Q()
+        if username:
+            lookup |= Q(username=username)
+        if email_key:
+            lookup |= Q(email_key=email_key)
+        if not lookup:
+            return cleaned_data
+        taken = AdvUser.objects.filter(lookup)
+        if self.instance.pk:
+            taken = taken.exclude(pk=self.instance.pk)
+        rows = list(taken.values_list('username', 'email_key')[:2])
+        if username and any(row[0] == username for row in rows):
+            self.add_error('username', self.username_taken_message)
+        if email_key and any(row[1] == email_key for row in rows):
+            self.add_error('email', self.email_taken_message)
+        return cleaned_data
+
+    def validate_unique(self):
+        # Уникальность ника и почты уже проверена в clean()
+        pass
+
+class UserRegisterForm(UniqueAccountMixin, UserCreationForm):
     latin_validator = RegexValidator(
         regex=r'^[a-zA-Z-]*$',
         message='Имя пользователя может содержать только латинские буквы и дефис.',
@@ -20,17 +59,8 @@ class UserRegisterForm(UserCreationForm):
         regex=r'^[а-яА-Я- ]*$',
         message='ФИО может содержать только кириллицу, дефис и пробелы'
     )
-    def clean_username(self):
-        username = self.cleaned_data['username']
-        if AdvUser.objects.filter(username=username).exists():
-            raise forms.ValidationError('Пользователь с таким ником уже существует')
-        return username
-
-    def clean_email(self):
-        email = self.cleaned_data['email']
-        if AdvUser.objects.filter(email=email).exists():
-            raise forms.ValidationError('Пользователь с такой почтой уже существует')
-        return email
+    username_taken_message = 'Пользователь с таким ником уже существует'
+    email_taken_message = 'Пользователь с такой почтой уже существует'
 
     agree_to_terms = forms.BooleanField(
         label='Я согласен с обработкой персональных данных',
@@ -53,7 +83,7 @@ class UserRegisterForm(UserCreationForm):
         model = AdvUser
         fields = ['username', 'first_name', 'last_name', 'patronymic', 'email', 'password1', 'password2', 'agree_to_terms', 'is_employer']
 
-class UserEditForm(UserChangeForm):
+class UserEditForm(UniqueAccountMixin, UserChangeForm):
     latin_validator = RegexValidator(
         regex=r'^[a-zA-Z-]*$',
         message='Имя пользователя может содержать только латинские буквы и дефис.',
@@ -62,18 +92,6 @@ class UserEditForm(UserChangeForm):
         regex=r'^[а-яА-Я- ]*$',
         message='ФИО может содержать только кириллицу, дефис и пробелы'
     )
-    def clean_username(self):
-        username = self.cleaned_data['username']
-        if AdvUser.objects.filter(username=username).exists():
-            raise forms.ValidationError('Данный ник занят')
-        return username
-
-    def clean_email(self):
-        email = self.cleaned_data['email']
-        if AdvUser.objects.filter(email=email).exists():
-            raise forms.ValidationError('Данная почта занята')
-        return email
-
     username = forms.CharField(validators=[latin_validator])
     first_name = forms.CharField(validators=[kiril_validator])
     last_name = forms.CharField(validators=[kiril_validator])
@@ -83,51 +101,47 @@ class UserEditForm(UserChangeForm):
         model = AdvUser
         fields = ['username', 'first_name', 'last_name', 'patronymic', 'email']
 
+class HeaderImageField(forms.FileField):
+    """Поле изображения, проверяющее только заголовок файла вместо полного декодирования."""
+    widget = forms.ClearableFileInput(attrs={'accept': 'image/jpeg,image/png,image/bmp'})
+
+    def to_python(self, data):
+        upload_error = getattr(data, 'upload_error', None)
+        if upload_error:
+            raise forms.ValidationError(upload_error)
+        return super().to_python(data)
+
+
 class ApplicationCreateForm(forms.ModelForm):
     def clean_app_image(self):
         app_image = self.cleaned_data.get('app_image')
-        format_validator = ['JPEG', 'JPG', 'PNG', 'BMP']
-        max_size = 2 * 1024 * 1024
         if app_image:
-            if app_image.size > max_size:
-                raise forms.ValidationError('Файл не должен весить более 2 мб')
-            try:
-                img = Image.open(app_image)
-                img_format = img.format
-                if img_format.upper() not in format_validator:
-                    raise forms.ValidationError('Неверный формат файла. Допустимые форматы: JPEG, JPG, PNG, BMP.')
-            except Exception:
-                raise forms.ValidationError('Не удалось открыть файл как изображение')
+            validate_image_upload(app_image, IMAGE_MAX_SIZES['app_image'])
         return app_image
 
     class Meta:
         model = Application
         fields = ['app_name', 'app_description', 'app_category', 'app_image']
+        field_classes = {'app_image': HeaderImageField}
 
 class ApplicationEditForm(forms.ModelForm):
-    def clean_app_image(self):
+    def clean_design_image(self):
         design_image = self.cleaned_data.get('design_image')
-        format_validator = ['JPEG', 'JPG', 'PNG', 'BMP']
         if design_image:
-            try:
-                img = Image.open(design_image)
-                img_format = img.format
-                if img_format.upper() not in format_validator:
-                    raise forms.ValidationError('Неверный формат файла. Допустимые форматы: JPEG, JPG, PNG, BMP.')
-            except Exception:
-                raise forms.ValidationError('Не удалось открыть файл как изображение')
+            validate_image_upload(design_image, IMAGE_MAX_SIZES['design_image'])
         return design_image
 
     class Meta:
         model = Application
         fields = ['design_image']
+        field_classes = {'design_image': HeaderImageField}
 
 class ApplicationEditStatusForm(forms.ModelForm):
     def clean_comment(self):
         comment = self.cleaned_data.get('comment')
-        status = self.cleaned_data.get('status')
-        if not comment and status == 'a':
-            raise forms.ValidationError('Требуется ввести комментарий')
+        if comment_required(self.cleaned_data.get('status'), comment):
+            raise forms.ValidationError(COMMENT_REQUIRED_ERROR)
+        return comment
 
     class Meta:
         model = Application
@@ -0,0 +1,7 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 с числом итераций из настройки DESIGN_PBKDF2_ITERATIONS."""
+    iterations = getattr(settings, 'DESIGN_PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations)
@@ -0,0 +1,28 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from design.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_CHUNK_SIZE, archive_completed, archive_stats, schedule_archive
+
+
+class Command(BaseCommand):
+    help = 'Переносит в архив заявки, выполненные больше N дней назад, пачками'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=ARCHIVE_AFTER_DAYS)
+        parser.add_argument('--chunk-size', type=int, default=ARCHIVE_CHUNK_SIZE)
+        parser.add_argument('--limit', type=int, help='Перенести не больше указанного числа заявок')
+        parser.add_argument('--background', action='store_true', help='Поставить перенос в очередь фоновых задач')
+        parser.add_argument('--stats', action='store_true', help='Показать размеры основной таблицы и архива и выйти')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.stdout.write(json.dumps(archive_stats(options['days']), indent=2, ensure_ascii=False, default=str))
+            return
+        if options['background']:
+            queued = schedule_archive(options['days'], options['chunk_size'])
+            message = 'Перенос поставлен в очередь' if queued else 'Перенос за сегодня уже в очереди'
+            self.stdout.write(self.style.SUCCESS(message))
+            return
+        archived = archive_completed(options['days'], options['chunk_size'], options['limit'])
+        self.stdout.write(self.style.SUCCESS(f'Перенесено в архив заявок: {archived}'))
@@ -0,0 +1,47 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from design.benchmark import summarize
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время хеширования пароля при регистрации для доступных алгоритмов и параллельности'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=20, help='Хеширований на уровень параллельности')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+        parser.add_argument('--target-ms', type=float, default=100,
+                            help='Желаемое время хеширования для подбора DESIGN_PBKDF2_ITERATIONS')
+
+    def measure(self, hasher, concurrency, rounds):
+        def encode(_):
+            started = time.perf_counter()
+            hasher.encode('bench-password', hasher.salt())
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(encode, range(rounds)))
+        return summarize(latencies, time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        for name, path in settings.PASSWORD_HASHER_CHOICES.items():
+            hasher = import_string(path)()
+            try:
+                hasher.encode('bench-password', hasher.salt())
+            except ValueError as error:
+                self.stdout.write(self.style.WARNING(f'{name}: недоступен ({error})'))
+                continue
+            for concurrency in options['concurrency']:
+                result = self.measure(hasher, concurrency, options['rounds'])
+                self.stdout.write(f'{name} x{concurrency}: {result}')
+                if name == 'pbkdf2' and concurrency == 1 and result['p50_ms']:
+                    iterations = int(hasher.iterations * options['target_ms'] / result['p50_ms'])
+                    self.stdout.write(
+                        f'  DESIGN_PBKDF2_ITERATIONS для {options["target_ms"]:.0f} мс: ~{iterations} '
+                        f'(сейчас {hasher.iterations})'
+                    )
@@ -0,0 +1,67 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from design.benchmark import summarize
+from design.cache import get_cache
+from design.models import AdvUser, Application, Category
+
+LIST_TEMPLATES = ('design/all_applications.html', 'design/custom_applications.html', 'design/index.html')
+
+
+class Command(BaseCommand):
+    help = 'Замеряет рендер списков заявок с кэшированным и некэшированным загрузчиком шаблонов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=300, help='Заявок на странице')
+        parser.add_argument('--rounds', type=int, default=50)
+        parser.add_argument('--templates', nargs='+', default=LIST_TEMPLATES)
+
+    def make_context(self, items):
+        category = Category(pk=1, category_name='Категория')
+        publisher = AdvUser(pk=1, username='bench', is_employer=True)
+        now = timezone.now()
+        applications = []
+        for i in range(items):
+            application = Application(
+                pk=i + 1, app_name=f'Заявка {i}', app_description='Описание заявки ' * 5,
+                app_category=category, app_publisher=publisher, app_date_created=now, status='n',
+            )
+            applications.append(application)
+        return publisher, {
+            'applications_list': applications, 'object_list': applications,
+            'is_first_page': True, 'next_cursor': 'cursor', 'next_query': 'cursor=cursor',
+            'accepted_count': items, 'index_fragment': '',
+        }
+
+    def uncached_engine(self):
+        params = settings.TEMPLATES[0]
+        options = dict(params['OPTIONS'], loaders=settings.TEMPLATE_LOADERS)
+        return DjangoTemplates({
+            'NAME': 'bench_uncached', 'DIRS': params['DIRS'], 'APP_DIRS': False, 'OPTIONS': options,
+        })
+
+    def measure(self, engine, name, context, request, rounds):
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(rounds):
+            render_started = time.perf_counter()
+            engine.get_template(name).render(context, request)
+            latencies.append(time.perf_counter() - render_started)
+        return summarize(latencies, time.perf_counter() - started)
+
+    def handle(self, *args, **options):
+        user, context = self.make_context(options['items'])
+        request = RequestFactory().get('/')
+        request.user = user
+        get_cache().clear()
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for label, engine in (('uncached', self.uncached_engine()), ('cached', engines['django'])):
+                for name in options['templates']:
+                    result = self.measure(engine, name, context, request, options['rounds'])
+                    self.stdout.write(f'{label} {name} ({options["items"]} заявок): {result}')
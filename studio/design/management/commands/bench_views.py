@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+
+from design.benchmark import run_concurrent
+from design.models import AdvUser, Application
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает синхронные и асинхронные страницы чтения по RPS и p99 на разных уровнях параллельности'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', required=True, help='Пользователь, от имени которого идут запросы')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50])
+        parser.add_argument('--requests', type=int, default=200, help='Запросов на каждый уровень параллельности')
+
+    def get_paths(self, user):
+        paths = [reverse('index')]
+        application = Application.objects.order_by('-id').first()
+        if application:
+            paths.append(reverse('detail_application', args=[application.pk]))
+        if user.is_employer or user.is_superuser:
+            paths.append(reverse('all_applications'))
+        else:
+            paths.append(reverse('custom_applications'))
+        return paths
+
+    def handle(self, *args, **options):
+        try:
+            user = AdvUser.objects.get(username=options['username'])
+        except AdvUser.DoesNotExist:
+            raise CommandError('Пользователь не найден')
+        results = {}
+        for mode, urlconf in (('sync', 'design.urls'), ('async', 'design.async_urls')):
+            with override_settings(ROOT_URLCONF=urlconf, ALLOWED_HOSTS=['*']):
+                paths = self.get_paths(user)
+                client = AsyncClient()
+                client.force_login(user)
+                results[mode] = {
+                    concurrency: asyncio.run(run_concurrent(client, paths, concurrency, options['requests']))
+                    for concurrency in options['concurrency']
+                }
+        for concurrency in options['concurrency']:
+            sync, async_ = results['sync'][concurrency], results['async'][concurrency]
+            self.stdout.write(
+                f'c={concurrency}: sync {sync["rps"]} rps, p99 {sync["p99_ms"]} ms | '
+                f'async {async_["rps"]} rps, p99 {async_["p99_ms"]} ms'
+            )
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connection, transaction
+
+from design.benchmark import summarize
+from design.db import sqlite_settings
+from design.deletion import delete_applications_chunk
+from design.models import AdvUser, Application, Category
+
+BENCH_PREFIX = 'bench_write_'
+
+
+class Command(BaseCommand):
+    help = 'Замеряет пропускную способность параллельного создания заявок и число ошибок блокировки БД'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 8])
+        parser.add_argument('--writes', type=int, default=200, help='Заявок на поток')
+        parser.add_argument('--output', help='Файл для результатов в JSON')
+        parser.add_argument('--compare', help='JSON с результатами предыдущего запуска для сравнения')
+
+    def create_application(self, index, publisher_id, category_id, image):
+        """Повторяет запись из create_application: заявка и статистика (сигнал post_save) в одной транзакции."""
+        with transaction.atomic():
+            application = Application(
+                app_name=f'{BENCH_PREFIX}{index}', app_description='Нагрузочный тест',
+                app_category_id=category_id, app_publisher_id=publisher_id, app_image=image,
+            )
+            application.save()
+
+    def run_level(self, threads, writes, publisher_id, category_id, image):
+        latencies, errors = [], []
+        lock = threading.Lock()
+        barrier = threading.Barrier(threads + 1)
+
+        def worker(number):
+            close_old_connections()
+            local_latencies, local_errors = [], 0
+            try:
+                barrier.wait()
+                for i in range(writes):
+                    started = time.perf_counter()
+                    try:
+                        self.create_application(f'{number}_{i}', publisher_id, category_id, image)
+                    except OperationalError:
+                        local_errors += 1
+                        continue
+                    local_latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+            with lock:
+                latencies.extend(local_latencies)
+                errors.append(local_errors)
+
+        workers = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+        for thread in workers:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in workers:
+            thread.join()
+        return summarize(latencies, time.perf_counter() - started, sum(errors))
+
+    def cleanup(self):
+        queryset = Application.objects.filter(app_name__startswith=BENCH_PREFIX).order_by('id')
+        while delete_applications_chunk(queryset):
+            pass
+
+    def handle(self, *args, **options):
+        publisher = AdvUser.objects.filter(is_employer=False, is_superuser=False).values_list('id', flat=True).first()
+        category = Category.objects.values_list('id', flat=True).first()
+        image = Application.objects.exclude(app_image='').values_list('app_image', flat=True).first()
+        if not publisher or not category or not image:
+            raise CommandError('Нет данных для замеров, сначала выполните seed_benchmark')
+
+        results = {'meta': {'database': connection.vendor, 'settings': sqlite_settings(connection)}, 'writes': {}}
+        self.stdout.write(f'{connection.vendor}: {results["meta"]["settings"]}')
+        try:
+            for threads in options['threads']:
+                result = self.run_level(threads, options['writes'], publisher, category, image)
+                results['writes'][threads] = result
+                self.stdout.write(f'{threads} пот.: {result}')
+        finally:
+            self.cleanup()
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text())
+            for threads, result in results['writes'].items():
+                before = baseline.get('writes', {}).get(str(threads))
+                if before:
+                    self.stdout.write(
+                        f'{threads} пот.: {before["rps"]} -> {result["rps"]} записей/с, '
+                        f'ошибок {before["errors"]} -> {result["errors"]}'
+                    )
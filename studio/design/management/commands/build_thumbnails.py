@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from design.models import Application
+from design.thumbnails import generate_derivatives
+
+
+class Command(BaseCommand):
+    help = 'Создает недостающие миниатюры для уже загруженных изображений заявок'
+
+    def handle(self, *args, **options):
+        images = Application.objects.values_list('app_image', 'design_image')
+        processed = failed = 0
+        for names in images.iterator(chunk_size=500):
+            for name in names:
+                if name:
+                    try:
+                        generate_derivatives(name)
+                    except Exception as error:
+                        failed += 1
+                        self.stderr.write(f'{name}: {error}')
+                    processed += 1
+        self.stdout.write(self.style.SUCCESS(f'Обработано изображений: {processed}'))
+        if failed:
+            self.stderr.write(self.style.WARNING(f'Не удалось обработать изображений: {failed}'))
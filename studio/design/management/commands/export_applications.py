@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+
+from design.bulk import APPLICATION_FIELDS, CATEGORY_FIELDS, Checkpoint, Progress, RecordWriter, detect_format
+from design.models import Application, Category
+
+APPLICATION_VALUES = {
+    'id': 'id',
+    'app_name': 'app_name',
+    'app_description': 'app_description',
+    'category': 'app_category__category_name',
+    'app_date_created': 'app_date_created',
+    'app_image': 'app_image',
+    'publisher': 'app_publisher__username',
+    'design_image': 'design_image',
+    'designer': 'design_publisher__username',
+    'status': 'status',
+    'comment': 'comment',
+}
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает заявки или категории в NDJSON/CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['ndjson', 'csv'])
+        parser.add_argument('--model', choices=['applications', 'categories'], default='applications')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--checkpoint', help='Файл контрольной точки для продолжения прерванной выгрузки')
+        parser.add_argument('--resume', action='store_true')
+
+    def handle(self, *args, **options):
+        fmt = detect_format(options['path'], options['format'])
+        checkpoint = Checkpoint(options['checkpoint'])
+        state = checkpoint.load() if options['resume'] else {}
+        last_id = state.get('last_id', 0)
+        if options['model'] == 'applications':
+            fields = APPLICATION_FIELDS
+            queryset = Application.objects.values(*(APPLICATION_VALUES[field] for field in fields))
+        else:
+            fields = CATEGORY_FIELDS
+            queryset = Category.objects.values(*fields)
+        queryset = queryset.filter(id__gt=last_id).order_by('id')
+
+        chunk_size = options['chunk_size']
+        writer = RecordWriter(options['path'], fmt, fields, append=bool(last_id), offset=state.get('offset'))
+        progress = Progress(self.stdout)
+        written = 0
+        try:
+            for row in queryset.iterator(chunk_size=chunk_size):
+                if options['model'] == 'applications':
+                    row = {field: row[APPLICATION_VALUES[field]] for field in fields}
+                writer.write(row)
+                written += 1
+                if written % chunk_size == 0:
+                    writer.flush()
+                    checkpoint.save(last_id=row['id'], offset=writer.tell())
+                    progress.advance(chunk_size)
+        finally:
+            writer.close()
+        checkpoint.clear()
+        self.stdout.write(self.style.SUCCESS(f'Выгружено записей: {written}'))
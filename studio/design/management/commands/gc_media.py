@@ -0,0 +1,81 @@
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from design.bulk import batched
+from design.models import Application, ArchivedApplication, StoredFile
+from design.storage import CONTENT_ADDRESSED_DIRS
+from design.thumbnails import THUMBNAIL_DIR
+
+SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.PNG', '.JPG', '.JPEG', '.BMP')
+
+
+def walk_files(root):
+    for directory, _, files in os.walk(root):
+        for file_name in files:
+            path = Path(directory) / file_name
+            yield path.relative_to(settings.MEDIA_ROOT).as_posix(), path
+
+
+class Command(BaseCommand):
+    help = 'Удаляет из MEDIA_ROOT файлы, на которые не ссылается ни одна заявка, в том числе архивная'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Только показать, что будет удалено')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--min-age', type=int, default=3600,
+                            help='Не трогать файлы моложе указанного числа секунд (идущие загрузки)')
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.cutoff = time.time() - options['min_age']
+        self.removed = 0
+        self.freed = 0
+        media_root = Path(settings.MEDIA_ROOT)
+
+        for directory in CONTENT_ADDRESSED_DIRS:
+            for batch in batched(walk_files(media_root / directory), options['batch_size']):
+                names = [name for name, _ in batch]
+                referenced = set()
+                for model in (Application, ArchivedApplication):
+                    referenced.update(
+                        model.objects.filter(Q(app_image__in=names) | Q(design_image__in=names))
+                        .values_list('app_image', 'design_image').iterator()
+                    )
+                referenced = {name for pair in referenced for name in pair if name}
+                orphans = [(name, path) for name, path in batch if name not in referenced]
+                removed = self.remove(orphans)
+                if not self.dry_run:
+                    StoredFile.objects.filter(name__in=removed).delete()
+
+        for batch in batched(walk_files(media_root / THUMBNAIL_DIR), options['batch_size']):
+            orphans = []
+            for name, path in batch:
+                stem = name[len(THUMBNAIL_DIR) + 1:].rsplit('_', 1)[0]
+                if not any((media_root / (stem + extension)).exists() for extension in SOURCE_EXTENSIONS):
+                    orphans.append((name, path))
+            self.remove(orphans)
+
+        action = 'Будет удалено' if self.dry_run else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} файлов: {self.removed}, {self.freed / (1024 * 1024):.1f} МБ'
+        ))
+
+    def remove(self, orphans):
+        removed = []
+        for name, path in orphans:
+            stat = path.stat()
+            if stat.st_mtime > self.cutoff:
+                continue
+            removed.append(name)
+            self.removed += 1
+            self.freed += stat.st_size
+            if self.dry_run:
+                self.stdout.write(f'  {name}')
+            else:
+                path.unlink()
+        return removed
@@ -0,0 +1,112 @@
+from collections import Counter
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from design.bulk import Checkpoint, Progress, batched, detect_format, parse_date, read_records, \
+    restore_creation_dates
+from design.cache import bump_index_version
+from design.media import retain_files
+from design.models import AdvUser, Application, Category
+from design.search import get_search_backend
+from design.stats import adjust
+
+
+class Command(BaseCommand):
+    help = 'Импортирует заявки или категории из NDJSON/CSV пачками через bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['ndjson', 'csv'])
+        parser.add_argument('--model', choices=['applications', 'categories'], default='applications')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--checkpoint', help='Файл контрольной точки для продолжения прерванного импорта')
+        parser.add_argument('--resume', action='store_true')
+
+    def handle(self, *args, **options):
+        fmt = detect_format(options['path'], options['format'])
+        checkpoint = Checkpoint(options['checkpoint'])
+        skip = checkpoint.load().get('processed', 0) if options['resume'] else 0
+        if skip:
+            self.stdout.write(f'Продолжение с записи {skip}')
+        self.categories = dict(Category.objects.values_list('category_name', 'id'))
+        self.users = {}
+        self.skipped = 0
+        import_batch = self.import_applications if options['model'] == 'applications' else self.import_categories
+        progress = Progress(self.stdout)
+        records = islice(read_records(options['path'], fmt), skip, None)
+        for batch in batched(records, options['batch_size']):
+            self.position = skip + progress.processed
+            with transaction.atomic():
+                import_batch(batch)
+            progress.advance(len(batch))
+            checkpoint.save(processed=skip + progress.processed)
+        if options['model'] == 'applications':
+            bump_index_version()
+        checkpoint.clear()
+        self.stdout.write(self.style.SUCCESS(f'Импортировано записей: {progress.processed - self.skipped}'))
+        if self.skipped:
+            self.stderr.write(self.style.WARNING(f'Пропущено записей без категории: {self.skipped}'))
+
+    def resolve_categories(self, names):
+        missing = {name for name in names if name and name not in self.categories}
+        if missing:
+            Category.objects.bulk_create([Category(category_name=name) for name in missing], ignore_conflicts=True)
+            self.categories.update(
+                Category.objects.filter(category_name__in=missing).values_list('category_name', 'id')
+            )
+
+    def resolve_users(self, usernames):
+        missing = {name for name in usernames if name and name not in self.users}
+        if missing:
+            found = dict(AdvUser.objects.filter(username__in=missing).values_list('username', 'id'))
+            self.users.update({name: found.get(name) for name in missing})
+
+    def import_categories(self, batch):
+        self.resolve_categories(record['category_name'] for record in batch)
+
+    def skip_without_category(self, batch):
+        """Записи с пустой категорией не импортируются: заявке она обязательна."""
+        valid = []
+        for number, record in enumerate(batch, self.position + 1):
+            if self.categories.get(record.get('category')) is None:
+                self.skipped += 1
+                self.stderr.write(f'Запись {number}: не указана категория, пропущена')
+            else:
+                valid.append(record)
+        return valid
+
+    def import_applications(self, batch):
+        self.resolve_categories(record.get('category') for record in batch)
+        batch = self.skip_without_category(batch)
+        self.resolve_users([record.get('publisher') for record in batch] + [record.get('designer') for record in batch])
+        applications = Application.objects.bulk_create([
+            Application(
+                app_name=record['app_name'],
+                app_description=record['app_description'],
+                app_category_id=self.categories[record['category']],
+                app_image=record['app_image'],
+                app_publisher_id=self.users.get(record.get('publisher')),
+                design_image=record.get('design_image') or None,
+                design_publisher_id=self.users.get(record.get('designer')),
+                status=record.get('status') or 'n',
+                comment=record.get('comment') or None,
+            )
+            for record in batch
+        ])
+        restore_creation_dates(applications, [parse_date(record.get('app_date_created')) for record in batch])
+        counts = Counter()
+        files = Counter()
+        search = get_search_backend()
+        for application in applications:
+            files[application.app_image.name] += 1
+            files[application.design_image.name] += 1
+            counts['status', application.status] += 1
+            counts['category', application.app_category_id] += 1
+            counts['designer', application.design_publisher_id] += 1
+            search.index(application)
+        # bulk_create не вызывает сигналов, поэтому ссылки на файлы учитываются пачкой в той же транзакции
+        retain_files(files)
+        for (dimension, key), count in counts.items():
+            adjust(dimension, key, count)
@@ -0,0 +1,43 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from design.bulk import batched
+from design.models import AdvUser
+
+
+class Command(BaseCommand):
+    help = 'Заполняет AdvUser.email_key (почта в нижнем регистре) и сообщает о совпадающих адресах'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        owners = defaultdict(list)
+        for pk, email in AdvUser.objects.order_by('id').values_list('id', 'email').iterator(chunk_size=options['batch_size']):
+            key = AdvUser.normalize_email_key(email)
+            if key:
+                owners[key].append(pk)
+
+        duplicates = {key: ids for key, ids in owners.items() if len(ids) > 1}
+        for key, ids in duplicates.items():
+            self.stdout.write(self.style.WARNING(f'{key}: пользователи {", ".join(map(str, ids))}, ключ получит только первый'))
+
+        expected = {ids[0]: key for key, ids in owners.items()}
+        changed = [
+            AdvUser(pk=pk, email_key=expected.get(pk))
+            for pk, current in AdvUser.objects.values_list('id', 'email_key').iterator(chunk_size=options['batch_size'])
+            if current != expected.get(pk)
+        ]
+        if not options['dry_run']:
+            # Сначала освобождаем ключи, чтобы перестановки не нарушали уникальность
+            with transaction.atomic():
+                for batch in batched(changed, options['batch_size']):
+                    AdvUser.objects.filter(pk__in=[user.pk for user in batch]).update(email_key=None)
+                for batch in batched(changed, options['batch_size']):
+                    AdvUser.objects.bulk_update(batch, ['email_key'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено пользователей: {len(changed)}, совпадающих адресов: {len(duplicates)}'
+        ))
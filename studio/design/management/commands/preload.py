@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from design.warmup import preload
+
+
+class Command(BaseCommand):
+    help = 'Выполняет предзагрузку процесса, как при DESIGN_PRELOAD=1, и показывает время каждого шага'
+
+    def handle(self, *args, **options):
+        report = preload(freeze=False)
+        for step, (result, seconds) in report.items():
+            self.stdout.write(f'{step:<10} {result:>6} {seconds * 1000:9.1f} мс')
+        total = sum(seconds for _, seconds in report.values())
+        self.stdout.write(self.style.SUCCESS(f'Предзагрузка заняла {total * 1000:.1f} мс'))
@@ -0,0 +1,80 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+# Запуск, повторяющий старт воркера: точка входа сервера и построение маршрутов
+PROFILE_SCRIPT = '''
+import os
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', {settings_module!r})
+import {entry}
+from django.urls import get_resolver
+get_resolver().url_patterns
+'''
+
+
+def parse_importtime(output):
+    """Разбирает вывод python -X importtime в список (модуль, собственное мкс, суммарное мкс, глубина)."""
+    modules = []
+    for line in output.splitlines():
+        match = IMPORT_LINE_RE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules.append((name, int(own), int(cumulative), len(indent) // 2))
+    return modules
+
+
+class Command(BaseCommand):
+    help = 'Замеряет импорт модулей при старте воркера (python -X importtime) и показывает самые дорогие'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entry', default='studio.wsgi', choices=['studio.wsgi', 'studio.asgi'])
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument('--output', help='Сохранить отчет в JSON')
+        parser.add_argument('--forbid', nargs='+', default=[],
+                            help='Пакеты, которые не должны импортироваться при старте (например PIL)')
+
+    def handle(self, *args, **options):
+        script = PROFILE_SCRIPT.format(settings_module=os.environ['DJANGO_SETTINGS_MODULE'], entry=options['entry'])
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'Точка входа не запустилась:\n{result.stderr[-2000:]}')
+        modules = parse_importtime(result.stderr)
+        total = sum(cumulative for _, _, cumulative, depth in modules if depth == 0)
+        packages = Counter()
+        for name, own, _, _ in modules:
+            packages[name.split('.')[0]] += own
+
+        report = {
+            'entry': options['entry'],
+            'modules': len(modules),
+            'total_ms': round(total / 1000, 1),
+            'packages_ms': {name: round(own / 1000, 1) for name, own in packages.most_common(options['top'])},
+            'slowest_ms': {
+                name: round(cumulative / 1000, 1)
+                for name, _, cumulative, _ in sorted(modules, key=lambda module: -module[2])[:options['top']]
+            },
+        }
+        self.stdout.write(f'{options["entry"]}: {report["modules"]} модулей за {report["total_ms"]} мс')
+        self.stdout.write('Пакеты (собственное время):')
+        for name, ms in report['packages_ms'].items():
+            self.stdout.write(f'  {name:<40} {ms:8.1f} мс')
+        self.stdout.write('Модули (вместе с зависимостями):')
+        for name, ms in report['slowest_ms'].items():
+            self.stdout.write(f'  {name:<40} {ms:8.1f} мс')
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
+
+        forbidden = sorted({name for name, *_ in modules if name.split('.')[0] in options['forbid']})
+        if forbidden:
+            raise CommandError(f'При старте импортируются запрещенные модули: {", ".join(forbidden[:10])}')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from design.models import Application
+from design.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс заявок'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        applications = Application.objects.only('id', 'app_name', 'app_description', 'status')
+        indexed = get_search_backend().rebuild(applications.iterator(chunk_size=options['chunk_size']))
+        self.stdout.write(self.style.SUCCESS(f'Проиндексировано заявок: {indexed}'))
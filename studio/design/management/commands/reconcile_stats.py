@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from design.models import ApplicationStats
+from design.stats import compute_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает статистику заявок с нуля и сообщает о расхождениях'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Только сообщить о расхождениях, не исправляя их')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            expected = compute_stats()
+            stored = {
+                (row.dimension, row.key): row
+                for row in ApplicationStats.objects.select_for_update()
+            }
+            drift = 0
+            for dimension_key in sorted(set(expected) | set(stored)):
+                row = stored.get(dimension_key)
+                actual = row.count if row else 0
+                count = expected.get(dimension_key, 0)
+                if actual == count:
+                    continue
+                drift += 1
+                self.stdout.write(f'{dimension_key[0]}:{dimension_key[1]} хранится {actual}, фактически {count}')
+                if options['check']:
+                    continue
+                if not count:
+                    row.delete()
+                elif row:
+                    row.count = count
+                    row.save(update_fields=['count'])
+                else:
+                    ApplicationStats.objects.create(dimension=dimension_key[0], key=dimension_key[1], count=count)
+        if drift:
+            message = f'Найдено расхождений: {drift}'
+            self.stdout.write(self.style.WARNING(message) if options['check'] else self.style.SUCCESS(f'{message}, исправлено'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Расхождений нет'))
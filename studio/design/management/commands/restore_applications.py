@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from design.archive import ARCHIVE_CHUNK_SIZE, restore_archived
+from design.models import ArchivedApplication
+
+
+class Command(BaseCommand):
+    help = 'Возвращает заявки из архива в основную таблицу'
+
+    def add_arguments(self, parser):
+        parser.add_argument('ids', nargs='*', type=int, help='id заявок')
+        parser.add_argument('--publisher', help='Вернуть все архивные заявки пользователя (username)')
+        parser.add_argument('--all', action='store_true', help='Вернуть весь архив')
+        parser.add_argument('--chunk-size', type=int, default=ARCHIVE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = ArchivedApplication.objects.all()
+        if options['ids']:
+            queryset = queryset.filter(id__in=options['ids'])
+        if options['publisher']:
+            queryset = queryset.filter(app_publisher__username=options['publisher'])
+        if not (options['ids'] or options['publisher'] or options['all']):
+            raise CommandError('Укажите id заявок, --publisher или --all')
+        restored = restore_archived(queryset, options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Возвращено из архива заявок: {restored}'))
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from design.benchmark import compare_results, percentile, run_http, summarize
+from design.models import AdvUser, Application
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Замеряет перцентили задержки и число SQL-запросов для основных маршрутов design'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Запросов на маршрут через тестовый клиент')
+        parser.add_argument('--http', action='store_true', help='Дополнительно нагрузить локальный HTTP-сервер')
+        parser.add_argument('--http-requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10])
+        parser.add_argument('--output', help='Файл для результатов в JSON')
+        parser.add_argument('--compare', help='JSON с базовыми результатами для сравнения')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Допустимый рост задержки (доля)')
+
+    def get_routes(self):
+        user = AdvUser.objects.filter(is_employer=False, is_superuser=False, applications_published__isnull=False).first()
+        employer = AdvUser.objects.filter(is_employer=True).first()
+        if not user or not employer:
+            raise CommandError('Нет данных для замеров, сначала выполните seed_benchmark')
+        application = Application.objects.filter(app_publisher=user).order_by('-id').first()
+        return [
+            ('index', user, reverse('index')),
+            ('all_applications', employer, reverse('all_applications')),
+            ('custom_applications', user, reverse('custom_applications')),
+            ('detail_application', user, reverse('detail_application', args=[application.pk])),
+            ('create_application', user, reverse('create_application')),
+        ]
+
+    def measure_client(self, client, path, count):
+        for _ in range(3):
+            client.get(path)
+        latencies, queries = [], []
+        for _ in range(count):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = client.get(path)
+                latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                raise CommandError(f'{path} вернул {response.status_code}')
+            queries.append(len(captured))
+        result = summarize(latencies, sum(latencies))
+        result['queries'] = percentile(queries, 50)
+        return result
+
+    def handle(self, *args, **options):
+        hosts = list(settings.ALLOWED_HOSTS) + ['testserver', '127.0.0.1', 'localhost']
+        results = {
+            'meta': {
+                'database': connection.vendor,
+                'requests': options['requests'],
+                'sessions': settings.SESSION_ENGINE,
+                'auth_backend': settings.AUTHENTICATION_BACKENDS[0],
+            },
+            'routes': {},
+        }
+        with override_settings(ALLOWED_HOSTS=hosts):
+            routes = self.get_routes()
+            clients = {}
+            for name, user, path in routes:
+                if user.pk not in clients:
+                    clients[user.pk] = Client()
+                    clients[user.pk].force_login(user)
+                results['routes'][name] = self.measure_client(clients[user.pk], path, options['requests'])
+                self.stdout.write(f'{name}: {results["routes"][name]}')
+
+            if options['http']:
+                server = make_server('127.0.0.1', 0, get_wsgi_application(),
+                                     server_class=ThreadingWSGIServer, handler_class=QuietHandler)
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                base_url = f'http://127.0.0.1:{server.server_port}'
+                results['http'] = {}
+                try:
+                    for name, user, path in routes:
+                        cookie = f'{settings.SESSION_COOKIE_NAME}={clients[user.pk].cookies[settings.SESSION_COOKIE_NAME].value}'
+                        results['http'][name] = {
+                            concurrency: run_http(base_url, cookie, [path], concurrency, options['http_requests'])
+                            for concurrency in options['concurrency']
+                        }
+                        self.stdout.write(f'{name} (HTTP): {results["http"][name]}')
+                finally:
+                    server.shutdown()
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text())
+            regressions = compare_results(baseline, results, options['threshold'])
+            if regressions:
+                raise CommandError('Обнаружены регрессии:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS('Регрессий нет'))
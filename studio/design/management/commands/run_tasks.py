@@ -0,0 +1,47 @@
+import json
+import signal
+import threading
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from design.models import ApplicationEvent, Task
+from design.tasks import TASK_POLL_INTERVAL, TASK_WORKERS, Worker, queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди design (обработчик для DESIGN_TASKS=external)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=TASK_WORKERS)
+        parser.add_argument('--poll-interval', type=float, default=TASK_POLL_INTERVAL)
+        parser.add_argument('--once', action='store_true', help='Выполнить готовые задачи и выйти')
+        parser.add_argument('--stats', action='store_true', help='Показать глубину очереди и выйти')
+        parser.add_argument('--prune-days', type=int, help='Удалить выполненные задачи и события заявок старше N дней и выйти')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.stdout.write(json.dumps(queue_stats(), indent=2, ensure_ascii=False))
+            return
+        if options['prune_days'] is not None:
+            threshold = timezone.now() - timedelta(days=options['prune_days'])
+            deleted, _ = Task.objects.filter(status=Task.DONE, finished_at__lt=threshold).delete()
+            events, _ = ApplicationEvent.objects.filter(created_at__lt=threshold).delete()
+            self.stdout.write(self.style.SUCCESS(f'Удалено задач: {deleted}, событий: {events}'))
+            return
+
+        worker = Worker(options['workers'], options['poll_interval'])
+        if options['once']:
+            worker.drain()
+            worker.executor.shutdown(wait=True)
+            self.stdout.write(self.style.SUCCESS(f'Очередь обработана: {queue_stats()["process"]}'))
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: (stop.set(), worker.wakeup.set()))
+        self.stdout.write(f'Обработчик задач запущен, потоков: {options["workers"]}')
+        worker.start_executor()
+        worker.run(stop)
+        worker.executor.shutdown(wait=True)
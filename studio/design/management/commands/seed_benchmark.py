@@ -0,0 +1,93 @@
+import random
+from collections import Counter
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+
+from design.bulk import batched, restore_creation_dates
+from design.media import retain_files
+from design.models import AdvUser, Application, Category
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу тестовыми пользователями, категориями и заявками для нагрузочных замеров'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--employers', type=int, default=10)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--applications', type=int, default=10000)
+        parser.add_argument('--images', type=int, default=5, help='Количество различных изображений')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--password', default='bench-password')
+
+    def make_images(self, count):
+        names = []
+        for i in range(count):
+            buffer = BytesIO()
+            Image.new('RGB', (1600, 1200), (40 * i % 255, 90, 160)).save(buffer, 'JPEG', quality=85)
+            names.append(default_storage.save(f'app_images/bench_{i}.jpg', ContentFile(buffer.getvalue())))
+        return names
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        prototype = AdvUser(username='bench')
+        prototype.set_password(options['password'])
+        users = [
+            AdvUser(username=f'bench_user_{i}', email=f'bench_user_{i}@example.com',
+                    email_key=f'bench_user_{i}@example.com', password=prototype.password)
+            for i in range(options['users'])
+        ] + [
+            AdvUser(username=f'bench_employer_{i}', email=f'bench_employer_{i}@example.com',
+                    email_key=f'bench_employer_{i}@example.com',
+                    password=prototype.password, is_employer=True)
+            for i in range(options['employers'])
+        ]
+        AdvUser.objects.bulk_create(users, ignore_conflicts=True)
+        Category.objects.bulk_create(
+            [Category(category_name=f'Категория {i}') for i in range(options['categories'])], ignore_conflicts=True,
+        )
+        user_ids = list(AdvUser.objects.filter(username__startswith='bench_user_').values_list('id', flat=True))
+        employer_ids = list(AdvUser.objects.filter(username__startswith='bench_employer_').values_list('id', flat=True))
+        category_ids = list(Category.objects.values_list('id', flat=True))
+        images = self.make_images(options['images'])
+
+        now = timezone.now()
+        rows = (
+            Application(
+                app_name=f'Заявка {i}',
+                app_description=f'Описание тестовой заявки {i} ' * rng.randint(1, 20),
+                app_category_id=rng.choice(category_ids),
+                app_date_created=now - timezone.timedelta(minutes=i),
+                app_image=rng.choice(images),
+                app_publisher_id=rng.choice(user_ids),
+                status=rng.choice('nad'),
+            )
+            for i in range(options['applications'])
+        )
+        created = 0
+        for batch in batched(rows, options['batch_size']):
+            for application in batch:
+                if application.status != 'n' and employer_ids:
+                    application.design_image = rng.choice(images)
+                    application.design_publisher_id = rng.choice(employer_ids)
+            files = Counter()
+            for application in batch:
+                files[application.app_image] += 1
+                files[application.design_image] += 1
+            dates = [application.app_date_created for application in batch]
+            with transaction.atomic():
+                applications = Application.objects.bulk_create(batch)
+                restore_creation_dates(applications, dates)
+                retain_files(files)
+            created += len(batch)
+            self.stdout.write(f'Создано заявок: {created}')
+        self.stdout.write(self.style.SUCCESS(
+            'Готово. Выполните reconcile_stats и rebuild_search_index, чтобы обновить статистику и поиск.'
+        ))
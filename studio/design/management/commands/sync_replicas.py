@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from design.routers import health, replica_aliases
+
+
+class Command(BaseCommand):
+    help = 'Копирует основную базу SQLite в локальные реплики (для проверки маршрутизации чтения)'
+
+    def handle(self, *args, **options):
+        source = connections[DEFAULT_DB_ALIAS]
+        if source.vendor != 'sqlite':
+            raise CommandError('Копирование поддерживается только для SQLite, реплики PostgreSQL обновляются репликацией')
+        aliases = replica_aliases()
+        if not aliases:
+            raise CommandError('Реплики не настроены, задайте DESIGN_DB_REPLICAS')
+        source.ensure_connection()
+        for alias in aliases:
+            target = connections[alias]
+            target.ensure_connection()
+            source.connection.backup(target.connection)
+            self.stdout.write(f'{alias}: {target.settings_dict["NAME"]}')
+        health.reset()
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from design.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Компилирует все шаблоны проекта: проверка перед выкладкой и замер времени прогрева'
+
+    def handle(self, *args, **options):
+        compiled, errors, seconds = warm_templates()
+        for name, error in errors:
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'Шаблонов с ошибками: {len(errors)}')
+        self.stdout.write(self.style.SUCCESS(f'Скомпилировано шаблонов: {compiled} за {seconds * 1000:.1f} мс'))
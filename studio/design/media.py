@@ -0,0 +1,72 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import StoredFile
+from .thumbnails import delete_derivatives
+
+IMAGE_FIELDS = ('app_image', 'design_image')
+
+
+def retain_file(name):
+    """Увеличивает счетчик ссылок на файл.
+
+    UPDATE блокирует строку: если удаление файла уже идет (delete_stored_file держит строку с нулем ссылок),
+    увеличение ждет его конца, а если строка еще не удалена, отменяет удаление.
+    """
+    if not name:
+        return
+    updated = StoredFile.objects.filter(name=name).update(references=F('references') + 1)
+    if not updated:
+        StoredFile.objects.get_or_create(name=name)
+        StoredFile.objects.filter(name=name).update(references=F('references') + 1)
+
+def retain_files(counts):
+    """Пакетный вариант retain_file для bulk_create: counts сопоставляет имени файла число новых ссылок."""
+    names = [name for name in counts if name]
+    if not names:
+        return
+    StoredFile.objects.bulk_create([StoredFile(name=name) for name in names], ignore_conflicts=True)
+    by_count = {}
+    for name in names:
+        by_count.setdefault(counts[name], []).append(name)
+    for count, group in by_count.items():
+        StoredFile.objects.filter(name__in=group).update(references=F('references') + count)
+
+def release_file(name):
+    """Уменьшает счетчик ссылок и удаляет файл после коммита, когда ссылок не осталось.
+
+    Файлы без записи в StoredFile (загруженные до подсчета ссылок) не удаляются.
+    """
+    if not name:
+        return
+    StoredFile.objects.filter(name=name, references__gt=0).update(references=F('references') - 1)
+    if StoredFile.objects.filter(name=name, references=0).exists():
+        transaction.on_commit(lambda: delete_stored_file(name))
+
+def release_files(counts):
+    """Пакетный вариант release_file: counts сопоставляет имени файла число снятых ссылок."""
+    names = [name for name in counts if name]
+    for name in names:
+        StoredFile.objects.filter(name=name).update(references=Greatest(F('references') - counts[name], 0))
+    released = list(StoredFile.objects.filter(name__in=names, references=0).values_list('name', flat=True))
+    if released:
+        transaction.on_commit(lambda: [delete_stored_file(name) for name in released])
+
+def delete_stored_file(name):
+    """Удаляет файл, если на него так и не появилось ссылок.
+
+    Строка с нулем ссылок остается до удаления файла и блокируется на его время, поэтому retain_file
+    из параллельной транзакции либо успевает вернуть ссылку и файл сохраняется, либо ждет удаления
+    и создает запись заново.
+    """
+    with transaction.atomic():
+        if StoredFile.objects.select_for_update().filter(name=name, references=0).first() is None:
+            return
+        default_storage.delete(name)
+        delete_derivatives(name)
+        StoredFile.objects.filter(name=name).delete()
+
+def file_names(instance):
+    return {field: instance.__dict__.get(field) for field in IMAGE_FIELDS}
@@ -0,0 +1,110 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+
+from .profiling import RequestProfile, current_profile, instrument_template_rendering, registry
+from .routers import health, replica_aliases, replica_reads, replica_used
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PIN_SESSION_KEY = '_design_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RequestProfilingMiddleware:
+    """Считает запросы к БД, время SQL, шаблонов и представления и отдает их в Server-Timing.
+
+    Включается настройкой DESIGN_PROFILING и не требует DEBUG=True. Запросы считаются по всем
+    базам (в том числе репликам).
+    """
+    # Соединения с БД свои у каждого потока, а обертки ставятся на соединения текущего потока.
+    # Только синхронный режим: под ASGI Django выполняет запрос в одном потоке с синхронным кодом,
+    # куда sync_to_async направляет и обращения к ORM из асинхронных представлений
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'DESIGN_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.duplicate_threshold = getattr(settings, 'DESIGN_PROFILING_DUPLICATE_THRESHOLD', 3)
+        self.export_path = getattr(settings, 'DESIGN_PROFILING_EXPORT', None)
+        self.export_every = getattr(settings, 'DESIGN_PROFILING_EXPORT_EVERY', 100)
+        self.handled = 0
+        instrument_template_rendering()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        total = time.perf_counter() - started
+        profile.view_time = total - profile.template_time
+
+        response.headers['Server-Timing'] = ', '.join(filter(None, [
+            response.headers.get('Server-Timing'),
+            f'db;desc="{profile.queries} queries";dur={profile.sql_time * 1000:.2f}',
+            f'dup;desc="{profile.duplicates} duplicate queries"',
+            f'tpl;dur={profile.template_time * 1000:.2f}',
+            f'view;dur={profile.view_time * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ]))
+
+        match = request.resolver_match
+        route = match.view_name if match else 'unresolved'
+        for sql, count in profile.repeated_statements(self.duplicate_threshold):
+            logger.warning('Возможная проблема N+1 на %s: запрос выполнен %s раз: %s', route, count, sql)
+        registry.record(route, total, profile)
+        self.handled += 1
+        if self.export_path and self.handled % self.export_every == 0:
+            registry.export(self.export_path)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Разрешает чтение с реплик в безопасных запросах.
+
+    После успешной записи сессия на DESIGN_REPLICA_PIN_SECONDS закрепляется за основной базой,
+    чтобы пользователь видел свои изменения. Если реплика упала посреди запроса, он повторяется
+    один раз на основной базе.
+    """
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'DESIGN_REPLICA_PIN_SECONDS', 10)
+
+    def __call__(self, request):
+        safe = request.method in SAFE_METHODS
+        pinned = request.session.get(PRIMARY_PIN_SESSION_KEY, 0) > time.time()
+        reads_token = replica_reads.set(safe and not pinned)
+        used_token = replica_used.set(None)
+        try:
+            response = self.get_response(request)
+            if getattr(request, '_replica_failed', False):
+                replica_reads.set(False)
+                response = self.get_response(request)
+        finally:
+            replica_reads.reset(reads_token)
+            replica_used.reset(used_token)
+        if not safe and response.status_code < 400:
+            request.session[PRIMARY_PIN_SESSION_KEY] = time.time() + self.pin_seconds
+        return response
+
+    def process_exception(self, request, exception):
+        alias = replica_used.get()
+        if alias and isinstance(exception, DatabaseError) and not getattr(request, '_replica_failed', False):
+            logger.warning('Ошибка чтения с реплики %s, запрос повторяется на основной базе', alias)
+            health.mark_failed(alias)
+            request._replica_failed = True
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2024-11-10 15:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advuser',
+            name='is_employer',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2024-11-10 17:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0002_advuser_is_employer'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='advuser',
+            name='is_employer',
+            field=models.BooleanField(default=False, verbose_name='Статус сотрудника'),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='comment',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
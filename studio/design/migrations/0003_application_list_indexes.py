@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0002_alter_advuser_is_employer_alter_application_comment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'app_date_created'], name='design_appl_status_29a13f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['app_publisher', 'status', 'app_date_created'], name='design_appl_app_pub_b196f3_idx'),
+        ),
+    ]
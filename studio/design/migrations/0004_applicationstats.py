@@ -0,0 +1,45 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+def fill_stats(apps, schema_editor):
+    # Начальные значения счетчиков для уже существующих заявок (позже сверяются manage.py reconcile_stats)
+    Application = apps.get_model('design', 'Application')
+    ApplicationStats = apps.get_model('design', 'ApplicationStats')
+    rows = []
+    for dimension, field in (('status', 'status'), ('category', 'app_category'), ('designer', 'design_publisher')):
+        counts = Application.objects.values_list(field).annotate(count=models.Count('id')).order_by()
+        rows.extend(
+            ApplicationStats(dimension=dimension, key=str(key), count=count)
+            for key, count in counts if key is not None
+        )
+    ApplicationStats.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0003_application_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('status', 'Статус'), ('category', 'Категория'), ('designer', 'Дизайнер')], max_length=10, verbose_name='Разрез')),
+                ('key', models.CharField(max_length=50, verbose_name='Значение')),
+                ('count', models.IntegerField(default=0, verbose_name='Количество заявок')),
+            ],
+            options={
+                'verbose_name': 'Статистику заявок',
+                'verbose_name_plural': 'Статистика заявок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='applicationstats',
+            constraint=models.UniqueConstraint(fields=('dimension', 'key'), name='unique_stats_dimension_key'),
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
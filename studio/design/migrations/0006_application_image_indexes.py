@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0005_storedfile'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='app_image',
+            field=models.ImageField(db_index=True, upload_to='app_images/', verbose_name='Фото помещения или его план'),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='design_image',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='design_images/'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0007_application_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
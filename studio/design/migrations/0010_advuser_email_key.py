@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+def fill_email_key(apps, schema_editor):
+    # Та же нормализация, что в AdvUser.normalize_email_key; при совпадении адресов ключ получает
+    # пользователь с меньшим id, остальные остаются без ключа (см. manage.py normalize_emails)
+    AdvUser = apps.get_model('design', 'AdvUser')
+    taken = set()
+    changed = []
+    for user in AdvUser.objects.order_by('id').only('id', 'email').iterator(chunk_size=1000):
+        key = (user.email or '').strip().casefold() or None
+        if key is None or key in taken:
+            continue
+        taken.add(key)
+        user.email_key = key
+        changed.append(user)
+    AdvUser.objects.bulk_update(changed, ['email_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0009_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advuser',
+            name='email_key',
+            field=models.CharField(editable=False, max_length=254, null=True, unique=True, verbose_name='Почта в нижнем регистре'),
+        ),
+        migrations.RunPython(fill_email_key, migrations.RunPython.noop),
+    ]
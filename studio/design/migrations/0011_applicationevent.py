@@ -0,0 +1,31 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0010_advuser_email_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('status', 'Изменение статуса'), ('design', 'Прикреплен дизайн')], max_length=10, verbose_name='Событие')),
+                ('status', models.CharField(choices=[('n', 'Новая'), ('a', 'Принято в работу'), ('d', 'Выполнено')], max_length=1, verbose_name='Статус')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Время')),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='design.application', verbose_name='Заявка')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_events', to=settings.AUTH_USER_MODEL, verbose_name='Получатель')),
+            ],
+            options={
+                'verbose_name': 'Событие заявки',
+                'verbose_name_plural': 'События заявок',
+                'indexes': [models.Index(fields=['user', 'id'], name='design_appl_user_id_42ebe3_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0011_applicationevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('app_name', models.CharField(max_length=100, verbose_name='Название заявки')),
+                ('app_description', models.TextField(verbose_name='Описание заявки')),
+                ('app_date_created', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('app_image', models.ImageField(upload_to='app_images/', verbose_name='Фото помещения или его план')),
+                ('design_image', models.ImageField(blank=True, null=True, upload_to='design_images/')),
+                ('status', models.CharField(choices=[('n', 'Новая'), ('a', 'Принято в работу'), ('d', 'Выполнено')], default='d', max_length=1)),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Перенесена в архив')),
+            ],
+            options={
+                'verbose_name': 'Архивную заявку',
+                'verbose_name_plural': 'Архив заявок',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'updated_at'], name='design_appl_status_08a387_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedapplication',
+            name='app_category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to='design.category', verbose_name='Категория заявки'),
+        ),
+        migrations.AddField(
+            model_name='archivedapplication',
+            name='app_publisher',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_applications_published', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedapplication',
+            name='design_publisher',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_applications_designs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedapplication',
+            index=models.Index(fields=['app_publisher', 'app_date_created'], name='design_arch_app_pub_e6c14e_idx'),
+        ),
+    ]
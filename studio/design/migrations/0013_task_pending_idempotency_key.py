@@ -0,0 +1,22 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0012_archivedapplication'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=200, null=True, verbose_name='Ключ идемпотентности'),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['q', 'r'])), fields=('idempotency_key',), name='unique_pending_task_idempotency_key'),
+        ),
+    ]
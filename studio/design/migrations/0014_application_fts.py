@@ -0,0 +1,29 @@
+from django.db import migrations
+
+# Индекс полнотекстового поиска для SQLite (design.search.SqliteFts5Backend); в других СУБД он не нужен.
+# Таблица раньше создавалась при первой индексации, поэтому IF NOT EXISTS: готовый индекс сохраняется
+CREATE_FTS = (
+    'CREATE VIRTUAL TABLE IF NOT EXISTS design_application_fts USING fts5('
+    "app_name, app_description, status UNINDEXED, tokenize='unicode61 remove_diacritics 2')"
+)
+DROP_FTS = 'DROP TABLE IF EXISTS design_application_fts'
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(CREATE_FTS)
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(DROP_FTS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0013_task_pending_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
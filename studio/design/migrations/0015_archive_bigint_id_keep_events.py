@@ -0,0 +1,24 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0014_application_fts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='applicationevent',
+            name='application',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='events', to='design.application', verbose_name='Заявка'),
+        ),
+        migrations.AlterField(
+            model_name='archivedapplication',
+            name='id',
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+    ]
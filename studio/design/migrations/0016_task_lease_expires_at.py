@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('design', '0015_archive_bigint_id_keep_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Аренда до'),
+        ),
+    ]
@@ -1,13 +1,35 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 
 class AdvUser(AbstractUser):
     patronymic = models.CharField(max_length=50, blank=True)
     is_employer = models.BooleanField(default=False, verbose_name='Статус сотрудника')
+    email_key = models.CharField(max_length=254, unique=True, null=True, editable=False,
+                                 verbose_name='Почта в нижнем регистре')
 
     def __str__(self):
         return self.username
 
+    @staticmethod
+    def normalize_email_key(email):
+        return (email or '').strip().casefold() or None
+
+    def refresh_from_db(self, using=None, fields=None):
+        # Пользователь из кэша (design.backends) содержит только поля ролей; при обращении
+        # к любому другому полю догружаем все недостающие одним запросом
+        deferred = self.get_deferred_fields()
+        if fields and deferred and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using, fields)
+
+    def save(self, *args, **kwargs):
+        self.email_key = self.normalize_email_key(self.email)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'email_key'}
+        super().save(*args, **kwargs)
+
 class Category(models.Model):
     category_name = models.CharField(max_length=100, blank=False, unique=True, verbose_name='Название категории')
     def __str__(self):
@@ -22,10 +44,12 @@ class Application(models.Model):
     app_description = models.TextField(blank=False, verbose_name='Описание заявки')
     app_category = models.ForeignKey(Category, on_delete=models.CASCADE, blank=False, verbose_name='Категория заявки')
     app_date_created = models.DateTimeField(auto_now_add=True)
-    app_image = models.ImageField(upload_to='app_images/', blank=False, verbose_name='Фото помещения или его план')
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+    app_image = models.ImageField(upload_to='app_images/', blank=False, db_index=True, verbose_name='Фото помещения или его план')
     app_publisher = models.ForeignKey(AdvUser, on_delete=models.SET_NULL, blank=False, null=True, related_name='applications_published')
 
-    design_image = models.ImageField(upload_to='design_images/', null=True, blank=True)
+    design_image = models.ImageField(upload_to='design_images/', null=True, blank=True, db_index=True)
     design_publisher = models.ForeignKey(AdvUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='applications_designs')
 
     APP_STATUS = (
@@ -39,6 +63,149 @@ class Application(models.Model):
     class Meta:
         verbose_name = 'Заявку'
         verbose_name_plural = 'Заявки'
+        indexes = [
+            models.Index(fields=['status', 'app_date_created']),
+            models.Index(fields=['app_publisher', 'status', 'app_date_created']),
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return self.app_name
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+        super().save(*args, **kwargs)
+
+class ArchivedApplication(models.Model):
+    """Выполненная заявка, перенесенная из основной таблицы (design.archive) с сохранением id."""
+    is_archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    app_name = models.CharField(max_length=100, verbose_name='Название заявки')
+    app_description = models.TextField(verbose_name='Описание заявки')
+    app_category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='archived_applications',
+                                     verbose_name='Категория заявки')
+    app_date_created = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    version = models.PositiveIntegerField(default=1)
+    app_image = models.ImageField(upload_to='app_images/', verbose_name='Фото помещения или его план')
+    app_publisher = models.ForeignKey(AdvUser, on_delete=models.SET_NULL, null=True,
+                                      related_name='archived_applications_published')
+    design_image = models.ImageField(upload_to='design_images/', null=True, blank=True)
+    design_publisher = models.ForeignKey(AdvUser, on_delete=models.SET_NULL, null=True, blank=True,
+                                         related_name='archived_applications_designs')
+    status = models.CharField(max_length=1, choices=Application.APP_STATUS, default='d')
+    comment = models.TextField(blank=True, null=True)
+    archived_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Перенесена в архив')
+
+    class Meta:
+        verbose_name = 'Архивную заявку'
+        verbose_name_plural = 'Архив заявок'
+        indexes = [
+            models.Index(fields=['app_publisher', 'app_date_created']),
+        ]
+
+    def __str__(self):
+        return self.app_name
+
+class ApplicationStats(models.Model):
+    DIMENSIONS = (
+        ('status', 'Статус'),
+        ('category', 'Категория'),
+        ('designer', 'Дизайнер'),
+    )
+    dimension = models.CharField(max_length=10, choices=DIMENSIONS, verbose_name='Разрез')
+    key = models.CharField(max_length=50, verbose_name='Значение')
+    count = models.IntegerField(default=0, verbose_name='Количество заявок')
+
+    class Meta:
+        verbose_name = 'Статистику заявок'
+        verbose_name_plural = 'Статистика заявок'
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key'], name='unique_stats_dimension_key'),
+        ]
+
+    def __str__(self):
+        return f'{self.dimension}:{self.key} = {self.count}'
+
+class StoredFile(models.Model):
+    name = models.CharField(max_length=255, unique=True, verbose_name='Имя файла')
+    references = models.PositiveIntegerField(default=0, verbose_name='Количество ссылок')
+
+    class Meta:
+        verbose_name = 'Файл'
+        verbose_name_plural = 'Файлы'
+
+    def __str__(self):
+        return self.name
+
+class Task(models.Model):
+    QUEUED = 'q'
+    RUNNING = 'r'
+    DONE = 'd'
+    FAILED = 'f'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+    name = models.CharField(max_length=200, verbose_name='Задача')
+    args = models.JSONField(default=list, blank=True, verbose_name='Аргументы')
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name='Именованные аргументы')
+    idempotency_key = models.CharField(max_length=200, null=True, blank=True, verbose_name='Ключ идемпотентности')
+    status = models.CharField(max_length=1, choices=STATUSES, default=QUEUED, verbose_name='Статус')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Попыток')
+    max_retries = models.PositiveIntegerField(default=3, verbose_name='Повторов')
+    run_after = models.DateTimeField(default=timezone.now, verbose_name='Не раньше')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Поставлена')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Начата')
+    # Обработчик, взявший задачу, продлевает аренду, пока выполняет ее; задачу с истекшей арендой (процесс упал)
+    # возвращает в очередь любой обработчик
+    lease_expires_at = models.DateTimeField(null=True, blank=True, verbose_name='Аренда до')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Завершена')
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+        # Ключ занят, пока задача ждет или выполняется; после завершения или ошибки ту же работу можно поставить снова
+        constraints = [
+            models.UniqueConstraint(
+                fields=['idempotency_key'], condition=models.Q(status__in=['q', 'r']),
+                name='unique_pending_task_idempotency_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
+
+class ApplicationEvent(models.Model):
+    STATUS = 'status'
+    DESIGN = 'design'
+    KINDS = (
+        (STATUS, 'Изменение статуса'),
+        (DESIGN, 'Прикреплен дизайн'),
+    )
+    user = models.ForeignKey(AdvUser, on_delete=models.CASCADE, related_name='application_events', verbose_name='Получатель')
+    # Без ограничения внешнего ключа: события остаются при переносе заявки в архив (id сохраняется), и поток SSE
+    # досылает их после переподключения; при удалении заявки события удаляются явно (signals, deletion, archive)
+    application = models.ForeignKey(Application, on_delete=models.DO_NOTHING, db_constraint=False,
+                                    related_name='events', verbose_name='Заявка')
+    kind = models.CharField(max_length=10, choices=KINDS, verbose_name='Событие')
+    status = models.CharField(max_length=1, choices=Application.APP_STATUS, verbose_name='Статус')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Время')
+
+    class Meta:
+        verbose_name = 'Событие заявки'
+        verbose_name_plural = 'События заявок'
+        indexes = [
+            models.Index(fields=['user', 'id']),
+        ]
 
     def __str__(self):
-        return self.app_name
\ No newline at end of file
+        return f'{self.application_id}: {self.kind}'
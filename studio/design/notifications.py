@@ -0,0 +1,37 @@
+import logging
+
+from django.core.mail import send_mail
+
+from .models import Application
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+
+@task
+def notify_status_change(application_id):
+    """Сообщает автору заявки об изменении ее статуса."""
+    application = Application.objects.select_related('app_publisher').filter(pk=application_id).first()
+    if application is None or application.app_publisher is None or not application.app_publisher.email:
+        return
+    message = f'Статус заявки «{application.app_name}» изменен на «{application.get_status_display()}».'
+    if application.comment:
+        message += f'\n\nКомментарий: {application.comment}'
+    send_mail('Изменение статуса заявки', message, None, [application.app_publisher.email])
+
+@task
+def notify_status_changes(application_ids):
+    """Рассылает уведомления по пачке заявок; неудачные отправки повторяются отдельными задачами."""
+    for application_id in application_ids:
+        try:
+            notify_status_change(application_id)
+        except Exception:
+            logger.exception('Не удалось отправить уведомление по заявке %s', application_id)
+            notify_status_change.delay(application_id)
+
+def schedule_status_notification(application):
+    notify_status_change.delay(application.pk, idempotency_key=f'notify_status:{application.pk}:{application.version}')
+
+def schedule_status_notifications(application_ids, chunk_size=500):
+    for start in range(0, len(application_ids), chunk_size):
+        notify_status_changes.delay(application_ids[start:start + chunk_size])
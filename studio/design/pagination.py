@@ -0,0 +1,67 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(application):
+    raw = f'{application.app_date_created.isoformat()}|{application.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_created, pk = raw.split('|')
+        return datetime.fromisoformat(date_created), int(pk)
+    except (ValueError, UnicodeError):
+        return None
+
+
+class KeysetPaginationMixin:
+    """Постраничный вывод по курсору (app_date_created, id) вместо OFFSET."""
+    paginate_by = 20
+    cursor_param = 'cursor'
+
+    def keyset_queryset(self, queryset):
+        cursor = self.request.GET.get(self.cursor_param)
+        position = decode_cursor(cursor) if cursor else None
+        if position:
+            date_created, pk = position
+            queryset = queryset.filter(
+                Q(app_date_created__lt=date_created) | Q(app_date_created=date_created, id__lt=pk)
+            )
+        return queryset[:self.paginate_by + 1]
+
+    def split_page(self, rows):
+        has_next = len(rows) > self.paginate_by
+        page = rows[:self.paginate_by]
+        next_cursor = encode_cursor(page[-1]) if has_next else None
+        return page, next_cursor
+
+    def paginate_keyset(self, queryset):
+        return self.split_page(list(self.keyset_queryset(queryset)))
+
+    def page_context(self, page, next_cursor):
+        query = self.request.GET.copy()
+        query.pop(self.cursor_param, None)
+        if next_cursor:
+            query[self.cursor_param] = next_cursor
+        return {
+            'object_list': page,
+            'next_cursor': next_cursor,
+            'next_query': query.urlencode(),
+            'is_first_page': self.cursor_param not in self.request.GET,
+        }
+
+    def get_context_data(self, **kwargs):
+        page, next_cursor = self.paginate_keyset(self.object_list)
+        kwargs.update(self.page_context(page, next_cursor))
+        return super().get_context_data(**kwargs)
+
+    def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset().order_by('-app_date_created', '-id')
+        context = self.get_context_data()
+        return self.render_to_response(context)
+
+    def get_paginate_by(self, queryset):
+        return None
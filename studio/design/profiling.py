@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+current_profile = ContextVar('current_profile', default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.statements = Counter()
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.templates = []
+        self.view_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def repeated_statements(self, threshold):
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+    def record_template(self, name, seconds):
+        # Вложенные рендеры (например, фрагменты из тегов) уже входят во время внешнего шаблона
+        if not self.template_depth:
+            self.template_time += seconds
+        self.templates.append((name, seconds))
+
+
+class ProfileRegistry:
+    """Агрегированные по имени маршрута гистограммы времени ответа и число запросов к БД."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.templates = {}
+
+    def record(self, route, total, profile):
+        bucket = bisect_left(HISTOGRAM_BUCKETS_MS, total * 1000)
+        with self.lock:
+            entry = self.routes.setdefault(route, {
+                'requests': 0,
+                'total_ms': 0.0,
+                'sql_ms': 0.0,
+                'template_ms': 0.0,
+                'queries': 0,
+                'duplicates': 0,
+                'max_queries': 0,
+                'histogram': [0] * (len(HISTOGRAM_BUCKETS_MS) + 1),
+            })
+            entry['requests'] += 1
+            entry['total_ms'] += total * 1000
+            entry['sql_ms'] += profile.sql_time * 1000
+            entry['template_ms'] += profile.template_time * 1000
+            entry['queries'] += profile.queries
+            entry['duplicates'] += profile.duplicates
+            entry['max_queries'] = max(entry['max_queries'], profile.queries)
+            entry['histogram'][bucket] += 1
+            for name, seconds in profile.templates:
+                template = self.templates.setdefault(name, {'renders': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+                template['renders'] += 1
+                template['total_ms'] += seconds * 1000
+                template['max_ms'] = max(template['max_ms'], seconds * 1000)
+
+    def snapshot(self):
+        with self.lock:
+            routes = {route: dict(entry, histogram=list(entry['histogram'])) for route, entry in self.routes.items()}
+            templates = {
+                name: dict(entry, avg_ms=round(entry['total_ms'] / entry['renders'], 3))
+                for name, entry in self.templates.items()
+            }
+        return {'buckets_ms': list(HISTOGRAM_BUCKETS_MS) + ['inf'], 'routes': routes, 'templates': templates}
+
+    def export(self, path):
+        target = Path(path)
+        tmp = target.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.snapshot(), ensure_ascii=False, indent=2))
+        tmp.replace(target)
+
+
+registry = ProfileRegistry()
+
+_template_render_patched = False
+
+
+def instrument_template_rendering():
+    """Оборачивает рендер шаблонов Django, чтобы учитывать его время в профиле текущего запроса по каждому шаблону."""
+    global _template_render_patched
+    if _template_render_patched:
+        return
+    from django.template.backends.django import Template
+
+    original_render = Template.render
+
+    def render(self, *args, **kwargs):
+        profile = current_profile.get()
+        if profile is None:
+            return original_render(self, *args, **kwargs)
+        started = time.perf_counter()
+        profile.template_depth += 1
+        try:
+            return original_render(self, *args, **kwargs)
+        finally:
+            profile.template_depth -= 1
+            profile.record_template(self.origin.template_name, time.perf_counter() - started)
+
+    Template.render = render
+    _template_render_patched = True
@@ -0,0 +1,106 @@
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_MAX_LAG = getattr(settings, 'DESIGN_REPLICA_MAX_LAG', 5)
+REPLICA_CHECK_INTERVAL = getattr(settings, 'DESIGN_REPLICA_CHECK_INTERVAL', 5)
+REPLICA_APPS = {'design'}
+
+# Читать с реплик разрешено только внутри безопасного запроса, не закрепленного за основной базой;
+# команды управления и фоновые потоки по умолчанию работают с основной базой.
+replica_reads = ContextVar('replica_reads', default=False)
+replica_used = ContextVar('replica_used', default=None)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+def replica_lag(alias):
+    """Отставание реплики в секундах: для PostgreSQL по времени применения WAL, иначе по последней заявке."""
+    from .models import Application
+
+    connection = connections[alias]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())')
+            lag = cursor.fetchone()[0]
+        return float(lag or 0)
+    latest = Application.objects.using(DEFAULT_DB_ALIAS).order_by('-id').values_list('id', 'app_date_created').first()
+    if latest is None:
+        return 0.0
+    replica_latest = Application.objects.using(alias).order_by('-id').values_list('id', 'app_date_created').first()
+    if replica_latest and replica_latest[0] >= latest[0]:
+        return 0.0
+    replica_created = replica_latest[1] if replica_latest else None
+    if replica_created is None:
+        return float('inf')
+    return max(0.0, (latest[1] - replica_created).total_seconds())
+
+
+class ReplicaHealth:
+    """Периодически проверяет доступность и отставание реплик и помнит результат до следующей проверки."""
+
+    def __init__(self, max_lag=REPLICA_MAX_LAG, interval=REPLICA_CHECK_INTERVAL):
+        self.max_lag = max_lag
+        self.interval = interval
+        self.checked = {}
+
+    def check(self, alias):
+        try:
+            lag = replica_lag(alias)
+        except DatabaseError:
+            logger.warning('Реплика %s недоступна, чтение идет с основной базы', alias, exc_info=True)
+            connections[alias].close()
+            return False
+        if lag > self.max_lag:
+            logger.warning('Реплика %s отстает на %.1f с, чтение идет с основной базы', alias, lag)
+            return False
+        return True
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        healthy, checked_at = self.checked.get(alias, (None, None))
+        if checked_at is None or now - checked_at > self.interval:
+            healthy = self.check(alias)
+            self.checked[alias] = (healthy, now)
+        return healthy
+
+    def mark_failed(self, alias):
+        self.checked[alias] = (False, time.monotonic())
+
+    def reset(self):
+        self.checked.clear()
+
+health = ReplicaHealth()
+
+
+class ReplicaRouter:
+    """Отправляет чтение моделей design на исправные реплики, а запись и все остальное - на основную базу."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in REPLICA_APPS or not replica_reads.get():
+            return DEFAULT_DB_ALIAS
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        replicas = [alias for alias in replica_aliases() if health.is_healthy(alias)]
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        alias = random.choice(replicas)
+        replica_used.set(alias)
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
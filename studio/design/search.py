@@ -0,0 +1,155 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import Application
+from .stemming import stem_query, stem_text
+
+
+class SearchBackend:
+    """Интерфейс поискового индекса по заявкам."""
+
+    def index(self, application):
+        raise NotImplementedError
+
+    def remove(self, pk):
+        raise NotImplementedError
+
+    def remove_many(self, pks):
+        for pk in pks:
+            self.remove(pk)
+
+    def update_status(self, pks, status):
+        for application in Application.objects.filter(pk__in=pks):
+            self.index(application)
+
+    def search(self, query, status=None, limit=20, offset=0):
+        """Возвращает (список id по убыванию релевантности, общее количество)."""
+        raise NotImplementedError
+
+    def rebuild(self, applications):
+        raise NotImplementedError
+
+
+class SqliteFts5Backend(SearchBackend):
+    # Виртуальная таблица создается миграцией 0014_application_fts
+    table = 'design_application_fts'
+
+    def index(self, application):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [application.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, app_name, app_description, status) VALUES (%s, %s, %s, %s)',
+                [application.pk, stem_text(application.app_name), stem_text(application.app_description),
+                 application.status],
+            )
+
+    def remove(self, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [pk])
+
+    def remove_many(self, pks):
+        pks = list(pks)
+        if not pks:
+            return
+        with connection.cursor() as cursor:
+            placeholders = ', '.join(['%s'] * len(pks))
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid IN ({placeholders})', pks)
+
+    def update_status(self, pks, status, chunk_size=500):
+        pks = list(pks)
+        with connection.cursor() as cursor:
+            for start in range(0, len(pks), chunk_size):
+                chunk = pks[start:start + chunk_size]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f'UPDATE {self.table} SET status = %s WHERE rowid IN ({placeholders})', [status, *chunk])
+
+    def match_expression(self, query):
+        terms = stem_query(query)
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, query, status=None, limit=20, offset=0):
+        expression = self.match_expression(query)
+        if not expression:
+            return [], 0
+        where = f'{self.table} MATCH %s'
+        params = [expression]
+        if status:
+            where += ' AND status = %s'
+            params.append(status)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {self.table} WHERE {where}', params)
+            total = cursor.fetchone()[0]
+            cursor.execute(
+                f'SELECT rowid FROM {self.table} WHERE {where} '
+                f'ORDER BY bm25({self.table}, 10.0, 1.0) LIMIT %s OFFSET %s',
+                params + [limit, offset],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        return ids, total
+
+    def rebuild(self, applications):
+        indexed = 0
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {self.table}')
+            for application in applications:
+                self.index(application)
+                indexed += 1
+        return indexed
+
+
+class BasicSearchBackend(SearchBackend):
+    """Запасной вариант без индекса для баз, для которых нет адаптера."""
+
+    def index(self, application):
+        pass
+
+    def remove(self, pk):
+        pass
+
+    def update_status(self, pks, status):
+        pass
+
+    def search(self, query, status=None, limit=20, offset=0):
+        queryset = Application.objects.all()
+        for term in query.split():
+            queryset = queryset.filter(Q(app_name__icontains=term) | Q(app_description__icontains=term))
+        if status:
+            queryset = queryset.filter(status=status)
+        ids = list(queryset.order_by('-app_date_created', '-id').values_list('id', flat=True)[offset:offset + limit])
+        return ids, queryset.count()
+
+    def rebuild(self, applications):
+        return 0
+
+
+SEARCH_BACKENDS = {
+    'sqlite': 'design.search.SqliteFts5Backend',
+}
+_backends = {}
+
+
+def get_search_backend():
+    path = getattr(settings, 'DESIGN_SEARCH_BACKEND', None) or SEARCH_BACKENDS.get(
+        connection.vendor, 'design.search.BasicSearchBackend'
+    )
+    if path not in _backends:
+        _backends[path] = import_string(path)()
+    return _backends[path]
+
+def search_applications(query, status=None, limit=20, offset=0):
+    ids, total = get_search_backend().search(query, status, limit, offset)
+    found = Application.objects.select_related('app_category', 'app_publisher').in_bulk(ids)
+    return [found[pk] for pk in ids if pk in found], total
+
+def search_page(query, status=None, cursor=None, per_page=20):
+    """Страница результатов поиска; курсором служит номер следующей страницы."""
+    try:
+        page = max(int(cursor or 1), 1)
+    except ValueError:
+        page = 1
+    applications, total = search_applications(query, status, per_page, (page - 1) * per_page)
+    next_cursor = page + 1 if page * per_page < total else None
+    return applications, next_cursor
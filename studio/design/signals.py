@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import bump_index_version, invalidate_user
+from .events import record_events
+from .media import file_names, release_file, retain_file
+from .models import AdvUser, Application, ApplicationEvent
+from .search import get_search_backend
+from .stats import STATS_FIELDS, record_changes, record_created, record_deleted, stats_values
+
+
+@receiver(post_init, sender=Application)
+def remember_status(sender, instance, **kwargs):
+    instance._original_status = instance.__dict__.get('status')
+    instance._original_stats = stats_values(instance)
+    instance._original_files = {field: str(name or '') for field, name in file_names(instance).items()}
+
+@receiver(post_save, sender=Application)
+def application_saved(sender, instance, created, **kwargs):
+    events = []
+    # Статистика ведется здесь, а не в представлениях: так ее не обходят админка, shell и другой код на ORM
+    if created:
+        record_created(stats_values(instance))
+    else:
+        record_changes(instance._original_stats, stats_values(instance))
+    instance._original_stats = stats_values(instance)
+    if not created and instance._original_status and instance._original_status != instance.status:
+        events.append(ApplicationEvent.STATUS)
+    instance._original_status = instance.status
+    for field, name in file_names(instance).items():
+        name = str(name or '')
+        original = '' if created else instance._original_files.get(field, '')
+        if name != original:
+            retain_file(name)
+            release_file(original)
+            if field == 'design_image' and name and not created:
+                events.append(ApplicationEvent.DESIGN)
+        instance._original_files[field] = name
+    record_events([(instance.pk, instance.app_publisher_id, kind, instance.status) for kind in events])
+    bump_index_version()
+    get_search_backend().index(instance)
+
+@receiver(pre_delete, sender=Application)
+def load_stats_fields(sender, instance, **kwargs):
+    # После удаления строки отложенные поля уже не догрузить, а без них не снять заявку со статистики
+    deferred = [attname for _, attname in STATS_FIELDS if attname not in instance.__dict__]
+    if deferred:
+        instance.refresh_from_db(fields=deferred)
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, **kwargs):
+    record_deleted(stats_values(instance))
+    ApplicationEvent.objects.filter(application_id=instance.pk).delete()
+    bump_index_version()
+    get_search_backend().remove(instance.pk)
+    for name in file_names(instance).values():
+        release_file(str(name or ''))
+
+@receiver(post_save, sender=AdvUser)
+@receiver(post_delete, sender=AdvUser)
+def user_changed(sender, instance, **kwargs):
+    # Снимок сбрасывается и после коммита, чтобы параллельный запрос не закэшировал старую строку
+    invalidate_user(instance.pk)
+    transaction.on_commit(lambda: invalidate_user(instance.pk))
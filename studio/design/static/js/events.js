@@ -0,0 +1,27 @@
+// Обновляет статусы заявок на странице по событиям сервера вместо перезагрузки страницы
+(function () {
+    var script = document.currentScript;
+    if (!window.EventSource || !script) {
+        return;
+    }
+    var source = new EventSource(script.dataset.eventsUrl);
+
+    function parse(event) {
+        return JSON.parse(event.data);
+    }
+
+    source.addEventListener('status', function (event) {
+        var data = parse(event);
+        document.querySelectorAll('[data-application-status="' + data.application + '"]').forEach(function (node) {
+            node.textContent = data.status_display;
+        });
+    });
+    source.addEventListener('design', function (event) {
+        if (document.querySelector('[data-application-design="' + parse(event).application + '"]')) {
+            window.location.reload();
+        }
+    });
+    source.addEventListener('reset', function () {
+        window.location.reload();
+    });
+})();
@@ -0,0 +1,57 @@
+from collections import Counter
+
+from django.db.models import Count, F
+
+from .models import Application, ApplicationStats
+
+# Измерение статистики и поле заявки, по которому оно считается
+STATS_FIELDS = (('status', 'status'), ('category', 'app_category_id'), ('designer', 'design_publisher_id'))
+
+
+def adjust(dimension, key, delta):
+    if key is None or not delta:
+        return
+    key = str(key)
+    updated = ApplicationStats.objects.filter(dimension=dimension, key=key).update(count=F('count') + delta)
+    if not updated:
+        ApplicationStats.objects.get_or_create(dimension=dimension, key=key)
+        ApplicationStats.objects.filter(dimension=dimension, key=key).update(count=F('count') + delta)
+
+def stats_values(application):
+    """Значения измерений, загруженные в экземпляр заявки; отложенные поля пропускаются."""
+    return {dimension: application.__dict__[attname] for dimension, attname in STATS_FIELDS
+            if attname in application.__dict__}
+
+def record_created(values):
+    for dimension, key in values.items():
+        adjust(dimension, key, 1)
+
+def record_deleted(values):
+    for dimension, key in values.items():
+        adjust(dimension, key, -1)
+
+def record_changes(original, values):
+    """Переносит заявку между ключами измерений, значения которых изменились с загрузки."""
+    for dimension, key in values.items():
+        if dimension in original and original[dimension] != key:
+            adjust(dimension, original[dimension], -1)
+            adjust(dimension, key, 1)
+
+def record_user_deleted(user):
+    ApplicationStats.objects.filter(dimension='designer', key=str(user.pk)).delete()
+
+def compute_stats():
+    """Пересчитывает статистику напрямую по таблице заявок."""
+    expected = Counter()
+    for dimension, field in STATS_FIELDS:
+        rows = Application.objects.values_list(field).annotate(count=Count('id')).order_by()
+        for key, count in rows:
+            if key is not None:
+                expected[(dimension, str(key))] = count
+    return expected
+
+def stats_snapshot():
+    snapshot = {dimension: {} for dimension, _ in ApplicationStats.DIMENSIONS}
+    for dimension, key, count in ApplicationStats.objects.values_list('dimension', 'key', 'count'):
+        snapshot[dimension][key] = count
+    return snapshot
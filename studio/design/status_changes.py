@@ -0,0 +1,68 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import bump_index_version
+from .events import record_events
+from .models import Application, ApplicationEvent
+from .notifications import schedule_status_notifications
+from .search import get_search_backend
+from .stats import adjust
+
+# Правила смены статуса для представлений, API, админки и массовой смены: статус меняется только
+# у новых заявок с прикрепленным дизайном, а принятие в работу требует комментария
+CHANGEABLE_STATUS = 'n'
+COMMENT_REQUIRED_STATUSES = ('a',)
+NO_DESIGN_ERROR = 'Нельзя изменить статус без прикрепленного дизайна.'
+STATUS_LOCKED_ERROR = 'Нельзя изменить статус с текущего.'
+COMMENT_REQUIRED_ERROR = 'Требуется ввести комментарий'
+
+
+def status_change_error(application):
+    """Текст ошибки, если статус заявки менять нельзя, иначе None."""
+    if not application.design_image:
+        return NO_DESIGN_ERROR
+    if application.status != CHANGEABLE_STATUS:
+        return STATUS_LOCKED_ERROR
+    return None
+
+def comment_required(status, comment):
+    return status in COMMENT_REQUIRED_STATUSES and not comment
+
+def changeable_applications(queryset):
+    """То же правило, что в status_change_error, в виде фильтра."""
+    return queryset.filter(status=CHANGEABLE_STATUS, design_image__isnull=False).exclude(design_image='')
+
+def bulk_change_status(queryset, status, comment=''):
+    """Меняет статус подходящих заявок одним UPDATE и агрегированно обновляет статистику, кэш и поиск.
+
+    Возвращает (изменено, пропущено).
+    """
+    if comment_required(status, comment):
+        raise ValueError(COMMENT_REQUIRED_ERROR)
+    eligible = changeable_applications(queryset)
+    with transaction.atomic():
+        total = queryset.count()
+        # Блокировка не дает параллельному запросу изменить выбранные строки до UPDATE (где она поддерживается)
+        rows = list(eligible.select_for_update().values_list('id', 'app_publisher_id'))
+        ids = [pk for pk, _ in rows]
+        now = timezone.now()
+        changed = eligible.filter(id__in=ids).update(
+            status=status, comment=comment or None, updated_at=now, version=F('version') + 1,
+        ) if ids else 0
+        if changed < len(ids):
+            # Часть строк изменили между выборкой и UPDATE: события, поиск и уведомления только для измененных,
+            # их отличает время этого UPDATE
+            updated = set(
+                Application.objects.filter(id__in=ids, status=status, updated_at=now).values_list('id', flat=True)
+            )
+            rows = [row for row in rows if row[0] in updated]
+            ids = [pk for pk, _ in rows]
+        adjust('status', CHANGEABLE_STATUS, -changed)
+        adjust('status', status, changed)
+        get_search_backend().update_status(ids, status)
+        record_events([(pk, publisher_id, ApplicationEvent.STATUS, status) for pk, publisher_id in rows])
+        schedule_status_notifications(ids)
+    if changed:
+        bump_index_version()
+    return changed, total - changed
@@ -0,0 +1,75 @@
+import re
+
+_VOWELS = 'аеиоуыэюя'
+
+_PERFECTIVE_GERUND = re.compile(r'((ив|ивши|ившись|ыв|ывши|ывшись)|((?<=[ая])(в|вши|вшись)))$')
+_REFLEXIVE = re.compile(r'(с[яь])$')
+_ADJECTIVE = re.compile(r'(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|их|ых|ую|юю|ая|яя|ою|ею)$')
+_PARTICIPLE = re.compile(r'((ивш|ывш|ующ)|((?<=[ая])(ем|нн|вш|ющ|щ)))$')
+_VERB = re.compile(
+    r'((ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло|ено|ят|ует|уют|ит|ыт|ены|ить|ыть|ишь|ую|ю)'
+    r'|((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно)))$'
+)
+_NOUN = re.compile(
+    r'(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием|ем|ам|ом|о|у|ах|иях|ях|ы|ь|ию|ью|ю|ия|ья|я)$'
+)
+_DERIVATIONAL = re.compile(r'(ост|ость)$')
+_SUPERLATIVE = re.compile(r'(ейше|ейш)$')
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def _regions(word):
+    rv = r2 = len(word)
+    for i, char in enumerate(word):
+        if char in _VOWELS:
+            rv = i + 1
+            break
+    r1 = len(word)
+    for i in range(rv, len(word)):
+        if word[i] not in _VOWELS and word[i - 1] in _VOWELS:
+            r1 = i + 1
+            break
+    for i in range(r1 + 1, len(word)):
+        if word[i] not in _VOWELS and word[i - 1] in _VOWELS:
+            r2 = i + 1
+            break
+    return rv, r2
+
+def stem(word):
+    """Упрощенный стеммер Портера (Snowball) для русского языка."""
+    word = word.lower().replace('ё', 'е')
+    if not re.search('[а-я]', word):
+        return word
+    rv_start, r2_start = _regions(word)
+    prefix, rv = word[:rv_start], word[rv_start:]
+
+    rv, count = _PERFECTIVE_GERUND.subn('', rv)
+    if not count:
+        rv = _REFLEXIVE.sub('', rv)
+        rv, count = _ADJECTIVE.subn('', rv)
+        if count:
+            rv = _PARTICIPLE.sub('', rv)
+        else:
+            rv, count = _VERB.subn('', rv)
+            if not count:
+                rv = _NOUN.sub('', rv)
+    if rv.endswith('и'):
+        rv = rv[:-1]
+    derivational = _DERIVATIONAL.search(rv)
+    if derivational and len(prefix) + derivational.start() >= r2_start:
+        rv = rv[:derivational.start()]
+    if rv.endswith('нн'):
+        rv = rv[:-1]
+    else:
+        rv = _SUPERLATIVE.sub('', rv)
+        if rv.endswith('нн'):
+            rv = rv[:-1]
+        elif rv.endswith('ь'):
+            rv = rv[:-1]
+    return prefix + rv
+
+def stem_text(text):
+    return ' '.join(stem(word) for word in _WORD.findall(text or ''))
+
+def stem_query(text):
+    return [stem(word) for word in _WORD.findall(text or '')]
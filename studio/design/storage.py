@@ -0,0 +1,97 @@
+import gzip
+import hashlib
+import posixpath
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CONTENT_ADDRESSED_DIRS = ('app_images', 'design_images')
+HASHED_NAME_RE = re.compile(r'(^|/)[0-9a-f]{2}/([0-9a-f]{64})(_\d+)?\.\w+$')
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.html', '.txt', '.json', '.xml', '.map', '.ico')
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+def hash_from_name(name):
+    """Хэш содержимого, если имя файла было построено по нему, иначе None."""
+    match = HASHED_NAME_RE.search(name)
+    return match.group(2) if match else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит загруженные изображения под именем, равным хэшу содержимого.
+
+    Повторная загрузка того же файла не пишет его заново, а возвращает уже
+    существующее имя. Прочие файлы (например, миниатюры) сохраняются как обычно.
+    """
+
+    def is_content_addressed(self, name):
+        return name.split('/', 1)[0] in CONTENT_ADDRESSED_DIRS
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not self.is_content_addressed(name):
+            return super().save(name, content, max_length=max_length)
+        digest = content_hash(content)
+        directory = name.split('/', 1)[0]
+        extension = posixpath.splitext(name)[1].lower()
+        hashed_name = f'{directory}/{digest[:2]}/{digest}{extension}'
+        if self.exists(hashed_name):
+            return hashed_name
+        return super().save(hashed_name, content, max_length=max_length)
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хешем содержимого в имени и заранее сжатыми копиями .gz и .br (если установлен brotli).
+
+    Сжатые копии сохраняются, только если они меньше исходного файла.
+    """
+
+    def url(self, name, force=True):
+        # Профиль выбран явно, поэтому имена с хешем отдаются и при DEBUG=True
+        return super().url(name, force)
+
+    def encodings(self):
+        return [(encoding, suffix) for encoding, suffix in STATIC_ENCODINGS if encoding != 'br' or brotli]
+
+    def compress_file(self, name):
+        with self.open(name) as file:
+            data = file.read()
+        for encoding, suffix in self.encodings():
+            compressed = compress(data, encoding)
+            target = name + suffix
+            self.delete(target)
+            if len(compressed) < len(data):
+                self._save(target, ContentFile(compressed))
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                self.compress_file(name)
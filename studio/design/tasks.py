@@ -0,0 +1,301 @@
+import logging
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .benchmark import percentile
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+TASK_WORKERS = getattr(settings, 'DESIGN_TASK_WORKERS', 2)
+TASK_POLL_INTERVAL = getattr(settings, 'DESIGN_TASK_POLL_INTERVAL', 1.0)
+# Срок аренды взятой задачи; обработчик продлевает ее каждую треть срока, пока задача выполняется
+TASK_LEASE = getattr(settings, 'DESIGN_TASK_LEASE', 60)
+# external - задачи выполняет команда run_tasks, in-process - пул потоков процесса, поставившего задачу
+# (для разработки с одним процессом), eager - сразу после коммита в вызывающем потоке
+TASK_MODE = getattr(settings, 'DESIGN_TASKS', 'external')
+TASK_MODULES = ('design.archive', 'design.deletion', 'design.notifications', 'design.thumbnails')
+
+registry = {}
+
+
+class TaskFunction:
+    """Обертка над функцией, объявленной через @task: вызов выполняет ее сразу, delay() ставит в очередь."""
+
+    def __init__(self, func, max_retries, retry_delay):
+        self.func = func
+        self.name = f'{func.__module__}.{func.__qualname__}'
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, idempotency_key=None, **kwargs):
+        """Ставит задачу в очередь; пока задача с тем же ключом ждет или выполняется, повторный вызов ничего не делает."""
+        if TASK_MODE == 'eager':
+            transaction.on_commit(lambda: self.func(*args, **kwargs))
+            return None
+        try:
+            with transaction.atomic():
+                queued = Task.objects.create(
+                    name=self.name, args=list(args), kwargs=kwargs,
+                    idempotency_key=idempotency_key, max_retries=self.max_retries,
+                )
+        except IntegrityError:
+            return None
+        if TASK_MODE == 'in-process':
+            transaction.on_commit(worker.wake)
+        return queued
+
+def load_tasks():
+    for module in TASK_MODULES:
+        import_module(module)
+
+def task(func=None, *, max_retries=3, retry_delay=5):
+    def decorator(func):
+        wrapper = TaskFunction(func, max_retries, retry_delay)
+        registry[wrapper.name] = wrapper
+        return wrapper
+    return decorator(func) if func else decorator
+
+
+class TaskMetrics:
+    """Счетчики и последние значения ожидания в очереди и длительности задач текущего процесса."""
+
+    def __init__(self, size=1000):
+        self.lock = threading.Lock()
+        self.counters = {'done': 0, 'failed': 0, 'retried': 0}
+        self.waits = deque(maxlen=size)
+        self.durations = deque(maxlen=size)
+
+    def record(self, outcome, wait, duration):
+        with self.lock:
+            self.counters[outcome] += 1
+            self.waits.append(wait)
+            self.durations.append(duration)
+
+    def snapshot(self):
+        with self.lock:
+            waits, durations, counters = list(self.waits), list(self.durations), dict(self.counters)
+        return {
+            **counters,
+            'wait_p50_ms': round(percentile(waits, 50) * 1000, 2),
+            'wait_p95_ms': round(percentile(waits, 95) * 1000, 2),
+            'run_p50_ms': round(percentile(durations, 50) * 1000, 2),
+            'run_p95_ms': round(percentile(durations, 95) * 1000, 2),
+        }
+
+metrics = TaskMetrics()
+
+
+def lease_until(lease=TASK_LEASE):
+    return timezone.now() + timedelta(seconds=lease)
+
+def claim_next(lease=TASK_LEASE):
+    """Атомарно переводит самую раннюю готовую задачу в статус «выполняется»; безопасно для нескольких процессов."""
+    while True:
+        candidate = (
+            Task.objects.filter(status=Task.QUEUED, run_after__lte=timezone.now())
+            .order_by('run_after', 'id').values_list('id', flat=True).first()
+        )
+        if candidate is None:
+            return None
+        claimed = Task.objects.filter(id=candidate, status=Task.QUEUED).update(
+            status=Task.RUNNING, started_at=timezone.now(), lease_expires_at=lease_until(lease),
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Task.objects.get(id=candidate)
+
+def execute(queued):
+    func = registry.get(queued.name)
+    wait = (queued.started_at - queued.run_after).total_seconds()
+    started = time.perf_counter()
+    try:
+        if func is None:
+            raise LookupError(f'Задача {queued.name} не зарегистрирована')
+        func(*queued.args, **queued.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        duration = time.perf_counter() - started
+        if func is not None and queued.attempts <= queued.max_retries:
+            delay = func.retry_delay * 2 ** (queued.attempts - 1)
+            Task.objects.filter(id=queued.id).update(
+                status=Task.QUEUED, run_after=timezone.now() + timedelta(seconds=delay), lease_expires_at=None,
+                last_error=error,
+            )
+            metrics.record('retried', wait, duration)
+            logger.warning('Задача %s (%s) упала, повтор через %s с', queued.name, queued.id, delay)
+        else:
+            Task.objects.filter(id=queued.id).update(
+                status=Task.FAILED, finished_at=timezone.now(), lease_expires_at=None, last_error=error,
+            )
+            metrics.record('failed', wait, duration)
+            logger.error('Задача %s (%s) завершилась ошибкой:\n%s', queued.name, queued.id, error)
+        return False
+    Task.objects.filter(id=queued.id).update(
+        status=Task.DONE, finished_at=timezone.now(), lease_expires_at=None, last_error='',
+    )
+    metrics.record('done', wait, time.perf_counter() - started)
+    return True
+
+def extend_leases(ids, lease=TASK_LEASE):
+    if ids:
+        Task.objects.filter(id__in=ids, status=Task.RUNNING).update(lease_expires_at=lease_until(lease))
+
+def requeue_expired():
+    """Возвращает в очередь задачи, аренду которых никто не продлевает: взявший их процесс упал.
+
+    Задачи без аренды взяты обработчиком прежней версии, продлить их тоже некому.
+    """
+    now = timezone.now()
+    return Task.objects.filter(
+        Q(lease_expires_at__lt=now) | Q(lease_expires_at__isnull=True), status=Task.RUNNING,
+    ).update(status=Task.QUEUED, run_after=now, lease_expires_at=None)
+
+def queue_stats():
+    counts = dict(Task.objects.values_list('status').annotate(count=Count('id')).order_by())
+    oldest = Task.objects.filter(status=Task.QUEUED, run_after__lte=timezone.now()).aggregate(
+        oldest=Min('run_after'),
+    )['oldest']
+    return {
+        'depth': counts.get(Task.QUEUED, 0),
+        'running': counts.get(Task.RUNNING, 0),
+        'done': counts.get(Task.DONE, 0),
+        'failed': counts.get(Task.FAILED, 0),
+        'oldest_wait_s': round((timezone.now() - oldest).total_seconds(), 1) if oldest else 0.0,
+        'process': metrics.snapshot(),
+    }
+
+
+class Worker:
+    """Забирает задачи из таблицы и выполняет их в пуле потоков.
+
+    Обычно работает в отдельном процессе manage.py run_tasks; в режиме in-process поток-диспетчер запускается
+    при первой постановке задачи в этом процессе. Диспетчер продлевает аренду выполняемых задач и возвращает
+    в очередь задачи с истекшей арендой.
+    """
+
+    def __init__(self, workers=TASK_WORKERS, poll_interval=TASK_POLL_INTERVAL, lease=TASK_LEASE):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.slots = threading.Semaphore(workers)
+        self.active = 0
+        self.running = set()
+        self.renewed_at = float('-inf')
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.executor = None
+        self.dispatcher = None
+
+    def start_executor(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tasks')
+
+    def start(self):
+        with self.lock:
+            if self.dispatcher is None:
+                self.start_executor()
+                self.dispatcher = threading.Thread(target=self.run, name='tasks-dispatcher', daemon=True)
+                self.dispatcher.start()
+
+    def wake(self):
+        self.start()
+        self.wakeup.set()
+
+    def run_one(self, queued):
+        close_old_connections()
+        try:
+            execute(queued)
+        finally:
+            close_old_connections()
+            with self.lock:
+                self.active -= 1
+                self.running.discard(queued.id)
+            self.slots.release()
+            self.wakeup.set()
+
+    def renew(self):
+        """Раз в треть срока аренды продлевает ее у своих задач и возвращает в очередь чужие просроченные."""
+        if time.monotonic() - self.renewed_at < self.lease / 3:
+            return
+        self.renewed_at = time.monotonic()
+        with self.lock:
+            running = list(self.running)
+        extend_leases(running, self.lease)
+        requeued = requeue_expired()
+        if requeued:
+            logger.warning('Возвращено в очередь задач с истекшей арендой: %s', requeued)
+
+    def dispatch(self):
+        """Раздает готовые задачи свободным потокам; возвращает число запущенных."""
+        started = 0
+        while self.slots.acquire(blocking=False):
+            try:
+                queued = claim_next(self.lease)
+            except Exception:
+                self.slots.release()
+                raise
+            if queued is None:
+                self.slots.release()
+                break
+            with self.lock:
+                self.active += 1
+                self.running.add(queued.id)
+            try:
+                self.executor.submit(self.run_one, queued)
+            except RuntimeError:
+                # Пул уже остановлен (завершение процесса): задача вернется в очередь
+                Task.objects.filter(id=queued.id).update(
+                    status=Task.QUEUED, lease_expires_at=None, attempts=F('attempts') - 1,
+                )
+                with self.lock:
+                    self.active -= 1
+                    self.running.discard(queued.id)
+                self.slots.release()
+                raise
+            started += 1
+        return started
+
+    def drain(self):
+        """Выполняет все готовые задачи и дожидается их завершения."""
+        load_tasks()
+        self.start_executor()
+        while True:
+            self.wakeup.clear()
+            self.renew()
+            started = self.dispatch()
+            with self.lock:
+                idle = not self.active
+            if not started and idle:
+                return
+            self.wakeup.wait(self.poll_interval)
+
+    def run(self, stop=None):
+        load_tasks()
+        close_old_connections()
+        while not (stop and stop.is_set()):
+            self.wakeup.clear()
+            try:
+                self.renew()
+                self.dispatch()
+            except Exception:
+                logger.exception('Ошибка при выборке задач из очереди')
+            finally:
+                close_old_connections()
+            self.wakeup.wait(self.poll_interval)
+
+worker = Worker()
@@ -0,0 +1,18 @@
+from django import template
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.html import format_html
+
+from ..events import streaming_available
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def events_script(context):
+    """Подключает events.js, только если сервер держит поток событий (ASGI); под WSGI страница обходится без EventSource."""
+    if not streaming_available(context.get('request')):
+        return ''
+    return format_html(
+        '<script src="{}" data-events-url="{}" defer></script>', static('js/events.js'), reverse('application_events'),
+    )
@@ -0,0 +1,32 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+
+from ..thumbnails import THUMBNAIL_FORMATS, THUMBNAIL_WIDTHS, derivative_name
+
+register = template.Library()
+
+
+def variant_url(name, width, ext):
+    target = derivative_name(name, width, ext)
+    if default_storage.exists(target):
+        return default_storage.url(target)
+    return reverse('image_variant', args=[width, ext, name])
+
+@register.simple_tag
+def responsive_image(field_file, sizes='(max-width: 640px) 100vw, 640px', alt='image'):
+    if not field_file:
+        return ''
+    name = field_file.name
+    sources = format_html_join(
+        '', '<source type="image/{}" srcset="{}" sizes="{}">',
+        (
+            ('jpeg' if ext == 'jpg' else ext,
+             ', '.join(f'{variant_url(name, width, ext)} {width}w' for width in THUMBNAIL_WIDTHS),
+             sizes)
+            for ext in THUMBNAIL_FORMATS
+        ),
+    )
+    fallback = variant_url(name, THUMBNAIL_WIDTHS[0], 'jpg')
+    return format_html('<picture>{}<img src="{}" alt="{}" loading="lazy"></picture>', sources, fallback, alt)
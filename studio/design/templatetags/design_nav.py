@@ -0,0 +1,38 @@
+import hashlib
+from weakref import WeakKeyDictionary
+
+from django import template
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+from ..cache import cached_fragment, viewer_role
+
+register = template.Library()
+
+NAVIGATION_TEMPLATE = 'design/navigation.html'
+
+
+# Хеш привязан к объекту скомпилированного шаблона: с кэширующим загрузчиком он считается один раз,
+# а с DESIGN_TEMPLATES=reload или после сброса кэша загрузчика - заново для перечитанного шаблона
+_navigation_versions = WeakKeyDictionary()
+
+
+def navigation_version():
+    """Хеш исходника шаблона навигации: после изменения шаблона старые фрагменты в кэше не используются."""
+    template = get_template(NAVIGATION_TEMPLATE).template
+    version = _navigation_versions.get(template)
+    if version is None:
+        version = hashlib.md5(template.source.encode(), usedforsecurity=False).hexdigest()[:12]
+        _navigation_versions[template] = version
+    return version
+
+@register.simple_tag(takes_context=True)
+def role_navigation(context):
+    """Навигация шапки, закэшированная для каждой роли: ссылки зависят только от нее."""
+    user = context.get('user')
+    role = viewer_role(user) if user is not None and user.is_authenticated else 'anonymous'
+    fragment, _ = cached_fragment(
+        'nav', f'design:nav:{role}:{navigation_version()}',
+        lambda: render_to_string(NAVIGATION_TEMPLATE, {'user': user}),
+    )
+    return mark_safe(fragment)
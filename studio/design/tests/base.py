@@ -0,0 +1,63 @@
+import io
+import shutil
+import tempfile
+from collections import Counter
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from ..cache import get_cache
+from ..models import AdvUser, Application, ApplicationStats, Category
+from ..stats import compute_stats
+
+
+def image_bytes(fmt='PNG', size=(40, 30), color='red'):
+    content = io.BytesIO()
+    Image.new('RGB', size, color).save(content, fmt)
+    return content.getvalue()
+
+def image_file(name='room.png', fmt='PNG', size=(40, 30), color='red'):
+    return SimpleUploadedFile(name, image_bytes(fmt, size, color), content_type=f'image/{fmt.lower()}')
+
+
+class DesignTestCase(TestCase):
+    """Пользователи трех ролей, категория и отдельный MEDIA_ROOT на класс тестов."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp(prefix='design-tests-')
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+        # Задачи в тестах только ставятся в очередь, какой бы режим ни задавал DESIGN_TASKS
+        cls.enterClassContext(mock.patch('design.tasks.TASK_MODE', 'external'))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AdvUser.objects.create_user('user', 'user@example.com', 'password')
+        cls.employer = AdvUser.objects.create_user('employer', 'employer@example.com', 'password', is_employer=True)
+        cls.admin = AdvUser.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.category = Category.objects.create(category_name='Кухня')
+
+    def setUp(self):
+        get_cache().clear()
+
+    def create_application(self, **kwargs):
+        fields = {
+            'app_name': 'Заявка',
+            'app_description': 'Описание',
+            'app_category': self.category,
+            'app_image': 'app_images/room.png',
+            'app_publisher': self.user,
+        }
+        fields.update(kwargs)
+        return Application.objects.create(**fields)
+
+    def assertStatsConsistent(self):
+        stored = Counter({
+            (dimension, key): count
+            for dimension, key, count in ApplicationStats.objects.values_list('dimension', 'key', 'count') if count
+        })
+        self.assertEqual(stored, compute_stats())
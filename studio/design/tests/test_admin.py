@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.urls import reverse
+
+from ..admin import ApplicationAdmin, EstimatedCountPaginator
+from ..models import Application
+from .base import DesignTestCase
+
+
+class ApplicationAdminTests(DesignTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.admin)
+
+    def test_bulk_status_action(self):
+        first = self.create_application(design_image='design_images/design.png', design_publisher=self.employer)
+        second = self.create_application(design_image='design_images/design.png', design_publisher=self.employer)
+        without_design = self.create_application()
+        response = self.client.post(reverse('admin:design_application_changelist'), {
+            'action': 'mark_accepted', '_selected_action': [first.pk, second.pk, without_design.pk],
+            'apply': '1', 'comment': 'Взята в работу',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(set(Application.objects.filter(status='a').values_list('pk', flat=True)), {first.pk, second.pk})
+        self.assertStatsConsistent()
+
+    def test_bulk_status_action_requires_comment(self):
+        application = self.create_application(design_image='design_images/design.png', design_publisher=self.employer)
+        response = self.client.post(reverse('admin:design_application_changelist'), {
+            'action': 'mark_accepted', '_selected_action': [application.pk], 'apply': '1', 'comment': '',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors['comment'])
+        self.assertEqual(Application.objects.get(pk=application.pk).status, 'n')
+
+    def test_page_depth_is_capped(self):
+        for number in range(5):
+            self.create_application(app_name=f'Заявка {number}')
+        with mock.patch.object(ApplicationAdmin, 'list_per_page', 2), \
+                mock.patch.object(EstimatedCountPaginator, 'max_pages', 2):
+            response = self.client.get(reverse('admin:design_application_changelist'), {'p': 2})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context['cl'].paginator.num_pages, 2)
+            self.assertEqual(len(response.context['cl'].result_list), 2)
+
+            response = self.client.get(reverse('admin:design_application_changelist'), {'p': 3})
+            self.assertRedirects(response, reverse('admin:design_application_changelist') + '?e=1')
+
+    def test_archive_changelist(self):
+        response = self.client.get(reverse('admin:design_archivedapplication_changelist'))
+        self.assertEqual(response.status_code, 200)
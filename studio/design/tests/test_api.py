@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Application
+from .base import DesignTestCase
+
+
+class ApiTests(DesignTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_field_selection(self):
+        application = self.create_application()
+        url = reverse('api_application_detail', args=[application.pk])
+        self.assertEqual(self.client.get(url, {'fields': 'id,app_name,unknown'}).json(), {
+            'id': application.pk, 'app_name': 'Заявка',
+        })
+
+    def test_page_boundary(self):
+        ids = sorted((self.create_application(app_name=f'Заявка {number}').pk for number in range(5)), reverse=True)
+        Application.objects.update(app_date_created=timezone.now())
+        url = reverse('api_applications')
+        first = self.client.get(url, {'limit': 3, 'fields': 'id'}).json()
+        self.assertEqual([row['id'] for row in first['results']], ids[:3])
+        second = self.client.get(url, {'limit': 3, 'fields': 'id', 'cursor': first['next_cursor']}).json()
+        self.assertEqual([row['id'] for row in second['results']], ids[3:])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_detail_not_modified(self):
+        application = self.create_application()
+        url = reverse('api_application_detail', args=[application.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(url, {'fields': 'id'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        Application.objects.filter(pk=application.pk).update(updated_at=timezone.now() + timedelta(seconds=1))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_not_modified(self):
+        self.create_application()
+        url = reverse('api_applications')
+        etag = self.client.get(url).headers['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.create_application()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
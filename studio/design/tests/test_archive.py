@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archive import archive_completed, delete_archived, restore_archived
+from ..events import replay_events
+from ..models import Application, ApplicationEvent, ArchivedApplication, StoredFile
+from ..search import get_search_backend
+from .base import DesignTestCase
+
+
+class ArchiveTests(DesignTestCase):
+    def completed_application(self, days=365, **kwargs):
+        application = self.create_application(status='d', **kwargs)
+        Application.objects.filter(pk=application.pk).update(updated_at=timezone.now() - timedelta(days=days))
+        return application
+
+    def test_round_trip(self):
+        created = timezone.now() - timedelta(days=400)
+        application = self.completed_application(
+            app_name='Кухня', design_image='design_images/design.png', design_publisher=self.employer,
+        )
+        self.create_application(status='d')
+        Application.objects.filter(pk=application.pk).update(app_date_created=created)
+
+        self.assertEqual(archive_completed(), 1)
+        self.assertFalse(Application.objects.filter(pk=application.pk).exists())
+        archived = ArchivedApplication.objects.get(pk=application.pk)
+        self.assertEqual(archived.version, application.version + 1)
+        self.assertStatsConsistent()
+        self.assertEqual(get_search_backend().search('кухня')[1], 0)
+
+        # Архивная заявка по-прежнему открывается по своему адресу
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('detail_application', args=[application.pk]))
+        self.assertContains(response, 'Кухня')
+
+        self.assertEqual(restore_archived(ArchivedApplication.objects.all()), 1)
+        self.assertFalse(ArchivedApplication.objects.exists())
+        restored = Application.objects.get(pk=application.pk)
+        self.assertEqual(restored.app_date_created, created)
+        self.assertEqual(restored.version, application.version + 2)
+        self.assertEqual(
+            (restored.app_image.name, restored.design_image.name, restored.design_publisher_id),
+            (application.app_image.name, application.design_image.name, self.employer.pk),
+        )
+        self.assertStatsConsistent()
+        self.assertEqual(get_search_backend().search('кухня')[0], [application.pk])
+        # Восстановленная заявка не уходит в архив при следующем запуске
+        self.assertEqual(archive_completed(), 0)
+
+    def test_big_ids(self):
+        pk = 2 ** 40
+        self.completed_application(id=pk)
+        self.assertEqual(archive_completed(), 1)
+        self.assertTrue(ArchivedApplication.objects.filter(pk=pk).exists())
+        self.assertEqual(restore_archived(ArchivedApplication.objects.all()), 1)
+        self.assertTrue(Application.objects.filter(pk=pk).exists())
+
+    def test_events_survive_archiving(self):
+        application = self.create_application(design_image='design_images/design.png', design_publisher=self.employer)
+        application.status = 'd'
+        application.save()
+        Application.objects.filter(pk=application.pk).update(updated_at=timezone.now() - timedelta(days=365))
+        self.assertEqual(archive_completed(), 1)
+        # Клиент, переподключившийся после архивации, получает пропущенное событие
+        events, reset_id = replay_events(self.user.pk, 0)
+        self.assertIsNone(reset_id)
+        self.assertEqual([(event.application_id, event.status) for event in events], [(application.pk, 'd')])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(delete_archived(ArchivedApplication.objects.all()), 1)
+        self.assertFalse(ApplicationEvent.objects.exists())
+        self.assertFalse(StoredFile.objects.exists())
+
+    def test_delete_removes_events(self):
+        application = self.create_application(design_image='design_images/design.png', design_publisher=self.employer)
+        application.status = 'a'
+        application.save()
+        self.assertTrue(ApplicationEvent.objects.exists())
+        application.delete()
+        self.assertFalse(ApplicationEvent.objects.exists())
@@ -0,0 +1,88 @@
+import io
+import json
+import os
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management import call_command
+
+from ..bulk import Checkpoint
+from ..models import Application
+from .base import DesignTestCase
+
+
+class BulkCommandTests(DesignTestCase):
+    def path(self, name):
+        return os.path.join(self.media_root, name)
+
+    def write_records(self, name, records):
+        path = self.path(name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        return path
+
+    def record(self, number, **fields):
+        return {'app_name': f'Импорт {number}', 'app_description': 'Описание', 'category': 'Кухня',
+                'app_image': 'app_images/room.png', 'publisher': 'user', **fields}
+
+    def call(self, *args, **options):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command(*args, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_keeps_creation_dates(self):
+        created = datetime(2024, 5, 1, 12, 30, tzinfo=dt_timezone.utc)
+        path = self.write_records('dates.ndjson', [
+            self.record(1, app_date_created=created.isoformat()), self.record(2),
+        ])
+        self.call('import_applications', path)
+        self.assertEqual(Application.objects.get(app_name='Импорт 1').app_date_created, created)
+        self.assertGreater(Application.objects.get(app_name='Импорт 2').app_date_created, created)
+        # Поле модели не меняется на время импорта
+        self.assertTrue(Application._meta.get_field('app_date_created').auto_now_add)
+        self.assertStatsConsistent()
+
+    def test_import_resume(self):
+        path = self.write_records('resume.ndjson', [self.record(number) for number in range(1, 6)])
+        checkpoint = self.path('import.checkpoint')
+        Checkpoint(checkpoint).save(processed=2)
+        stdout, _ = self.call('import_applications', path, checkpoint=checkpoint, resume=True, batch_size=2)
+        self.assertIn('Продолжение с записи 2', stdout)
+        self.assertEqual(
+            sorted(Application.objects.values_list('app_name', flat=True)), ['Импорт 3', 'Импорт 4', 'Импорт 5'],
+        )
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_import_skips_records_without_category(self):
+        path = self.write_records('skip.ndjson', [self.record(1), self.record(2, category=''), self.record(3)])
+        stdout, stderr = self.call('import_applications', path)
+        self.assertIn('Импортировано записей: 2', stdout)
+        self.assertIn('Запись 2: не указана категория, пропущена', stderr)
+        self.assertIn('Пропущено записей без категории: 1', stderr)
+        self.assertEqual(Application.objects.count(), 2)
+
+    def assertExportResumes(self, name):
+        for number in range(5):
+            self.create_application(app_name=f'Заявка {number}')
+        reference = self.path(f'reference.{name}')
+        self.call('export_applications', reference)
+        with open(reference, 'rb') as file:
+            lines = file.readlines()
+        # Прерванная выгрузка: контрольная точка после двух заявок и недописанная строка за ней
+        header = 1 if name == 'csv' else 0
+        done = b''.join(lines[:header + 2])
+        path = self.path(f'resumed.{name}')
+        with open(path, 'wb') as file:
+            file.write(done + lines[header + 2][:10])
+        checkpoint = self.path(f'export-{name}.checkpoint')
+        last_id = Application.objects.order_by('id').values_list('id', flat=True)[1]
+        Checkpoint(checkpoint).save(last_id=last_id, offset=len(done))
+
+        self.call('export_applications', path, checkpoint=checkpoint, resume=True, chunk_size=2)
+        with open(reference, 'rb') as expected, open(path, 'rb') as resumed:
+            self.assertEqual(resumed.read(), expected.read())
+
+    def test_export_resume_ndjson(self):
+        self.assertExportResumes('ndjson')
+
+    def test_export_resume_csv(self):
+        self.assertExportResumes('csv')
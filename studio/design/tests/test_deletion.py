@@ -0,0 +1,69 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..archive import archive_completed
+from ..deletion import delete_applications_chunk, delete_category, delete_category_now
+from ..models import (Application, ApplicationEvent, ApplicationStats, ArchivedApplication, Category, StoredFile,
+                      Task)
+from ..search import get_search_backend
+from .base import DesignTestCase
+
+
+class ChunkedDeletionTests(DesignTestCase):
+    def delete_chunk(self, category):
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                deleted = delete_applications_chunk(Application.objects.filter(app_category=category).order_by('id'))
+        return deleted, [query['sql'] for query in queries.captured_queries]
+
+    def test_queries_per_chunk(self):
+        small, large = Category.objects.create(category_name='Спальня'), Category.objects.create(category_name='Холл')
+        # Заявка вне удаляемых категорий держит файл, чтобы ни одна пачка не удаляла его
+        self.create_application()
+        for category, count in ((small, 2), (large, 6)):
+            for _ in range(count):
+                self.create_application(app_category=category)
+        small_deleted, small_queries = self.delete_chunk(small)
+        large_deleted, large_queries = self.delete_chunk(large)
+        self.assertEqual((small_deleted, large_deleted), (2, 6))
+        # Число запросов не зависит от размера пачки: строки не выбираются и не удаляются по одной
+        self.assertEqual(len(small_queries), len(large_queries))
+        deletes = [sql for sql in large_queries if sql.startswith('DELETE FROM "design_application" ')]
+        self.assertEqual(len(deletes), 1)
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertStatsConsistent()
+
+    def test_delete_category(self):
+        other = Category.objects.create(category_name='Спальня')
+        kept = self.create_application(app_category=other)
+        accepted = self.create_application(design_image='design_images/design.png', design_publisher=self.employer)
+        accepted.status = 'a'
+        accepted.save()
+        done = self.create_application(status='d')
+        Application.objects.filter(pk=done.pk).update(updated_at=timezone.now() - timedelta(days=365))
+        self.assertEqual(archive_completed(), 1)
+        self.assertTrue(ApplicationEvent.objects.filter(application=accepted).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(delete_category_now(self.category.pk), 2)
+        self.assertEqual(list(Application.objects.all()), [kept])
+        self.assertFalse(ArchivedApplication.objects.exists())
+        self.assertFalse(Category.objects.filter(pk=self.category.pk).exists())
+        self.assertFalse(ApplicationStats.objects.filter(dimension='category', key=str(self.category.pk)).exists())
+        self.assertFalse(ApplicationEvent.objects.exists())
+        self.assertStatsConsistent()
+        self.assertEqual(StoredFile.objects.get(name='app_images/room.png').references, 1)
+        self.assertFalse(StoredFile.objects.filter(name='design_images/design.png').exists())
+        self.assertEqual(get_search_backend().search('заявка'), ([kept.pk], 1))
+
+    def test_large_category_in_background(self):
+        self.create_application()
+        self.create_application()
+        with mock.patch('design.deletion.BACKGROUND_DELETE_THRESHOLD', 1):
+            self.assertTrue(delete_category(self.category))
+        self.assertEqual(Application.objects.count(), 2)
+        self.assertTrue(Task.objects.filter(name='design.deletion.delete_category_job', args=[self.category.pk]).exists())
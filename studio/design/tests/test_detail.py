@@ -0,0 +1,45 @@
+from django.urls import reverse
+
+from ..cache import detail_fragment_key, get_cache
+from .base import DesignTestCase
+
+
+class ApplicationDetailTests(DesignTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_not_modified(self):
+        application = self.create_application(status='d')
+        url = reverse('detail_application', args=[application.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        application.comment = 'Готово'
+        application.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_without_etag_for_open_application(self):
+        application = self.create_application()
+        response = self.client.get(reverse('detail_application', args=[application.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response.headers)
+
+    def test_fragment_follows_version(self):
+        application = self.create_application()
+        url = reverse('detail_application', args=[application.pk])
+        self.client.get(url)
+        old_key = detail_fragment_key(application, 'user')
+        self.assertIsNotNone(get_cache().get(old_key))
+
+        version = application.version
+        application.app_description = 'Новое описание'
+        application.save()
+        application.refresh_from_db()
+        self.assertEqual(application.version, version + 1)
+        self.assertContains(self.client.get(url), 'Новое описание')
+        self.assertIsNotNone(get_cache().get(detail_fragment_key(application, 'user')))
@@ -0,0 +1,125 @@
+import io
+import json
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.urls import reverse
+
+from ..models import Application, StoredFile
+from ..views import MEDIA_RANGE_CHUNK_SIZE
+from .base import DesignTestCase, image_file
+
+
+class FileReferencesTests(DesignTestCase):
+    def references(self, name):
+        return StoredFile.objects.filter(name=name).values_list('references', flat=True).first()
+
+    def post_application(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('create_application'), {
+                'app_name': name, 'app_description': 'Описание', 'app_category': self.category.pk,
+                'app_image': image_file(),
+            })
+        self.assertEqual(response.status_code, 302)
+        return Application.objects.get(app_name=name)
+
+    def delete_application(self, application):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('delete_application', args=[application.pk]))
+        self.assertFalse(Application.objects.filter(pk=application.pk).exists())
+
+    def test_identical_uploads_share_file(self):
+        self.client.force_login(self.user)
+        first = self.post_application('Первая')
+        second = self.post_application('Вторая')
+        name = first.app_image.name
+        self.assertEqual(second.app_image.name, name)
+        self.assertEqual(self.references(name), 2)
+
+        self.delete_application(first)
+        self.assertEqual(self.references(name), 1)
+        self.assertTrue(default_storage.exists(name))
+
+        self.delete_application(second)
+        self.assertIsNone(self.references(name))
+        self.assertFalse(default_storage.exists(name))
+
+    def test_import_retains_files(self):
+        self.client.force_login(self.user)
+        application = self.post_application('Загруженная')
+        name = application.app_image.name
+        records = [
+            {'app_name': f'Импорт {number}', 'app_description': 'Описание', 'category': 'Кухня',
+             'app_image': name, 'publisher': 'user'}
+            for number in range(3)
+        ]
+        path = os.path.join(self.media_root, 'import.ndjson')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        call_command('import_applications', path, stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertEqual(self.references(name), 4)
+
+        # Загруженная пользователем заявка удаляется, файл остается за импортированными
+        self.delete_application(application)
+        self.assertEqual(self.references(name), 3)
+        self.assertTrue(default_storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for imported in Application.objects.all():
+                imported.delete()
+        self.assertIsNone(self.references(name))
+        self.assertFalse(default_storage.exists(name))
+
+    def test_retain_before_delete_keeps_file(self):
+        # Ссылка, появившаяся в той же транзакции до удаления файла, отменяет его удаление
+        name = default_storage.save('app_images/room.png', ContentFile(b'content'))
+        application = self.create_application(app_image=name)
+        with self.captureOnCommitCallbacks(execute=True):
+            application.delete()
+            self.create_application(app_image=name)
+        self.assertEqual(self.references(name), 1)
+        self.assertTrue(default_storage.exists(name))
+
+
+class ServeMediaTests(DesignTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = bytes(range(256)) * 1024
+        self.name = default_storage.save('app_images/plan.pdf', ContentFile(self.content))
+        self.url = reverse('media', kwargs={'path': self.name})
+
+    def get(self, **headers):
+        return self.client.get(self.url, headers=headers)
+
+    def test_full_range_is_streamed(self):
+        response = self.get(Range='bytes=0-')
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.headers['Content-Length'], str(len(self.content)))
+        self.assertEqual(response.headers['Content-Range'], f'bytes 0-{len(self.content) - 1}/{len(self.content)}')
+        chunks = list(response.streaming_content)
+        self.assertLessEqual(max(len(chunk) for chunk in chunks), MEDIA_RANGE_CHUNK_SIZE)
+        self.assertEqual(b''.join(chunks), self.content)
+
+    def test_ranges(self):
+        response = self.get(Range='bytes=10-19')
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+        response = self.get(Range='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-5:])
+        response = self.get(Range=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers['Content-Range'], f'bytes */{len(self.content)}')
+
+    def test_conditional(self):
+        response = self.get()
+        etag = response.headers['ETag']
+        response.close()
+        self.assertIn(etag.strip('"'), self.name)
+        self.assertIn('immutable', response.headers['Cache-Control'])
+        self.assertEqual(self.get(If_None_Match=etag).status_code, 304)
+        # Устаревший If-Range: вместо диапазона отдается весь файл
+        response = self.get(Range='bytes=0-9', If_Range='"other"')
+        self.assertEqual(response.status_code, 200)
+        response.close()
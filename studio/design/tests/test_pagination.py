@@ -0,0 +1,53 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Application
+from ..pagination import encode_cursor
+from .base import DesignTestCase
+
+
+class KeysetPaginationTests(DesignTestCase):
+    per_page = 20
+
+    def page(self, cursor=None, url_name='custom_applications'):
+        params = {'cursor': cursor} if cursor else {}
+        response = self.client.get(reverse(url_name), params)
+        self.assertEqual(response.status_code, 200)
+        return [application.pk for application in response.context['object_list']], response.context['next_cursor']
+
+    def create_applications(self, count):
+        ids = [self.create_application(app_name=f'Заявка {number}').pk for number in range(count)]
+        # Одинаковая дата создания: порядок и курсор держатся только на id
+        Application.objects.update(app_date_created=timezone.now())
+        return sorted(ids, reverse=True)
+
+    def test_exactly_one_page(self):
+        ids = self.create_applications(self.per_page)
+        self.client.force_login(self.user)
+        self.assertEqual(self.page(), (ids, None))
+
+    def test_page_boundary(self):
+        ids = self.create_applications(self.per_page + 1)
+        self.client.force_login(self.user)
+        first, cursor = self.page()
+        self.assertEqual(first, ids[:self.per_page])
+        self.assertEqual(cursor, encode_cursor(Application.objects.get(pk=first[-1])))
+        self.assertEqual(self.page(cursor), (ids[self.per_page:], None))
+
+    def test_invalid_cursor_opens_first_page(self):
+        ids = self.create_applications(3)
+        self.client.force_login(self.user)
+        self.assertEqual(self.page('не-курсор'), (ids, None))
+
+    def test_queries_do_not_grow_with_page(self):
+        self.client.force_login(self.employer)
+        self.create_applications(2)
+        self.page(url_name='all_applications')
+        with CaptureQueriesContext(connection) as small:
+            self.page(url_name='all_applications')
+        self.create_applications(10)
+        with CaptureQueriesContext(connection) as large:
+            self.page(url_name='all_applications')
+        self.assertEqual(len(large), len(small))
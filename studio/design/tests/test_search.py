@@ -0,0 +1,60 @@
+from django.db import transaction
+from django.urls import reverse
+
+from ..models import Application
+from ..search import get_search_backend
+from .base import DesignTestCase
+
+
+class SearchTests(DesignTestCase):
+    def search(self, query, **params):
+        response = self.client.get(reverse('all_applications'), {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [application.pk for application in response.context['object_list']], response.context['next_cursor']
+
+    def test_word_forms(self):
+        kitchen = self.create_application(app_name='Кухня в стиле лофт')
+        bedroom = self.create_application(app_name='Спальня', app_description='Светлые стены')
+        self.client.force_login(self.employer)
+        self.assertEqual(self.search('кухни'), ([kitchen.pk], None))
+        self.assertEqual(self.search('светлая стена')[0], [bedroom.pk])
+        self.assertEqual(self.search('гостиная'), ([], None))
+
+    def test_index_follows_changes(self):
+        application = self.create_application(app_name='Кухня')
+        self.client.force_login(self.employer)
+        application.status = 'a'
+        application.save()
+        self.assertEqual(self.search('кухня', status='a')[0], [application.pk])
+        self.assertEqual(self.search('кухня', status='n')[0], [])
+        application.delete()
+        self.assertEqual(self.search('кухня')[0], [])
+
+    def test_pages(self):
+        for number in range(25):
+            self.create_application(app_name=f'Кухня {number}')
+        self.client.force_login(self.employer)
+        first, cursor = self.search('кухня')
+        self.assertEqual((len(first), cursor), (20, 2))
+        second, cursor = self.search('кухня', cursor=2)
+        self.assertEqual((len(second), cursor), (5, None))
+        self.assertFalse(set(first) & set(second))
+
+    def test_index_after_rollback(self):
+        # Откат транзакции с первой индексацией не должен ломать последующие
+        try:
+            with transaction.atomic():
+                self.create_application(app_name='Кухня')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        application = self.create_application(app_name='Кухня')
+        self.assertEqual(get_search_backend().search('кухня'), ([application.pk], 1))
+
+    def test_rebuild(self):
+        application = self.create_application(app_name='Кухня')
+        Application.objects.filter(pk=application.pk).update(app_name='Гостиная')
+        backend = get_search_backend()
+        self.assertEqual(backend.rebuild(Application.objects.all()), 1)
+        self.assertEqual(backend.search('кухня'), ([], 0))
+        self.assertEqual(backend.search('гостиная'), ([application.pk], 1))
@@ -0,0 +1,69 @@
+from django.urls import reverse
+
+from ..cache import get_cache
+from ..models import ApplicationStats, Category
+from .base import DesignTestCase
+
+
+class StatsTests(DesignTestCase):
+    def admin_change(self, application, **changes):
+        data = {
+            'app_name': application.app_name,
+            'app_description': application.app_description,
+            'app_category': application.app_category_id,
+            'app_publisher': application.app_publisher_id,
+            'design_publisher': application.design_publisher_id or '',
+            'status': application.status,
+            'comment': application.comment or '',
+            '_save': 'Сохранить',
+        }
+        data.update(changes)
+        response = self.client.post(reverse('admin:design_application_change', args=[application.pk]), data)
+        self.assertEqual(response.status_code, 302)
+
+    def test_create_and_delete(self):
+        first = self.create_application()
+        self.create_application(app_category=Category.objects.create(category_name='Спальня'))
+        self.assertStatsConsistent()
+        self.assertEqual(ApplicationStats.objects.get(dimension='status', key='n').count, 2)
+        first.delete()
+        self.assertStatsConsistent()
+        self.assertEqual(ApplicationStats.objects.get(dimension='status', key='n').count, 1)
+
+    def test_admin_change_form(self):
+        application = self.create_application(design_image='design_images/design.png', design_publisher=self.employer)
+        other = Category.objects.create(category_name='Спальня')
+        self.client.force_login(self.admin)
+        self.admin_change(application, status='d', app_category=other.pk, design_publisher=self.admin.pk)
+        self.assertStatsConsistent()
+        self.assertEqual(ApplicationStats.objects.get(dimension='status', key='d').count, 1)
+        self.assertEqual(ApplicationStats.objects.get(dimension='status', key='n').count, 0)
+
+    def test_admin_delete(self):
+        application = self.create_application()
+        self.create_application()
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('admin:design_application_delete', args=[application.pk]), {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertStatsConsistent()
+
+    def test_status_count_after_admin_edit(self):
+        application = self.create_application()
+        self.client.force_login(self.employer)
+        self.assertContains(self.client.get(reverse('index')), 'Кол-во принятых в работу заявок: 0')
+        self.client.force_login(self.admin)
+        self.admin_change(application, status='a')
+        get_cache().clear()
+        self.client.force_login(self.employer)
+        self.assertContains(self.client.get(reverse('index')), 'Кол-во принятых в работу заявок: 1')
+
+    def test_stats_api(self):
+        self.create_application()
+        self.create_application(status='a', design_publisher=self.employer)
+        url = reverse('application_stats')
+        self.client.force_login(self.employer)
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.admin)
+        snapshot = self.client.get(url).json()
+        self.assertEqual(snapshot['status'], {'n': 1, 'a': 1})
+        self.assertEqual(sum(snapshot['category'].values()), 2)
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Task
+from ..tasks import Worker, claim_next, execute, requeue_expired, task, worker
+from .base import DesignTestCase
+
+calls = []
+
+
+@task(max_retries=1, retry_delay=5)
+def remember(value):
+    calls.append(value)
+
+@task(max_retries=1, retry_delay=5)
+def failing():
+    raise ValueError('Сбой')
+
+
+class TaskQueueTests(DesignTestCase):
+    def setUp(self):
+        super().setUp()
+        calls.clear()
+
+    def test_idempotency_key(self):
+        first = remember.delay(1, idempotency_key='remember')
+        self.assertIsNotNone(first)
+        self.assertIsNone(remember.delay(2, idempotency_key='remember'))
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertTrue(execute(claim_next()))
+        self.assertEqual(calls, [1])
+        # После выполнения ключ снова свободен
+        self.assertIsNotNone(remember.delay(3, idempotency_key='remember'))
+        self.assertEqual(Task.objects.filter(idempotency_key='remember').count(), 2)
+
+    def test_retry_with_backoff(self):
+        failing.delay()
+        with self.assertLogs('design.tasks', 'WARNING'):
+            self.assertFalse(execute(claim_next()))
+        queued = Task.objects.get()
+        self.assertEqual((queued.status, queued.attempts), (Task.QUEUED, 1))
+        self.assertIsNone(queued.lease_expires_at)
+        self.assertAlmostEqual((queued.run_after - timezone.now()).total_seconds(), 5, delta=1)
+        self.assertIn('Сбой', queued.last_error)
+        # Пока не наступило время повтора, задачу не берут
+        self.assertIsNone(claim_next())
+
+        Task.objects.update(run_after=timezone.now())
+        with self.assertLogs('design.tasks', 'ERROR'):
+            self.assertFalse(execute(claim_next()))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Task.FAILED, 2))
+
+    def test_lease(self):
+        remember.delay(1)
+        claimed = claim_next(lease=60)
+        self.assertEqual(claimed.status, Task.RUNNING)
+        self.assertGreater(claimed.lease_expires_at, timezone.now())
+        # Долгая задача с действующей арендой не возвращается в очередь, сколько бы она ни выполнялась
+        Task.objects.update(started_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_expired(), 0)
+
+        Task.objects.update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(requeue_expired(), 1)
+        self.assertEqual(Task.objects.get().status, Task.QUEUED)
+
+    def test_worker_renews_own_leases(self):
+        remember.delay(1)
+        remember.delay(2)
+        expired = timezone.now() - timedelta(seconds=1)
+        local = Worker(lease=60)
+        own, other = claim_next(), claim_next()
+        local.running.add(own.id)
+        Task.objects.update(lease_expires_at=expired)
+        with self.assertLogs('design.tasks', 'WARNING'):
+            local.renew()
+        own.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(own.status, Task.RUNNING)
+        self.assertGreater(own.lease_expires_at, timezone.now())
+        self.assertEqual(other.status, Task.QUEUED)
+
+    def test_requests_do_not_start_dispatcher(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('index'))
+        self.assertIsNone(worker.dispatcher)
@@ -0,0 +1,69 @@
+import os
+import shutil
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from ..models import Task
+from ..tasks import claim_next, execute
+from ..thumbnails import THUMBNAIL_DIR, THUMBNAIL_FORMATS, THUMBNAIL_WIDTHS, derivative_name, generate_derivative, \
+    generate_derivatives
+from .base import DesignTestCase, image_bytes
+
+
+class ThumbnailTests(DesignTestCase):
+    def setUp(self):
+        super().setUp()
+        self.name = default_storage.save('app_images/room.png', ContentFile(image_bytes(size=(800, 600))))
+        self.addCleanup(shutil.rmtree, os.path.join(self.media_root, THUMBNAIL_DIR), ignore_errors=True)
+
+    def variants(self):
+        return [(width, ext) for width in THUMBNAIL_WIDTHS for ext in THUMBNAIL_FORMATS]
+
+    def test_all_variants(self):
+        generate_derivatives(self.name)
+        for width, ext in self.variants():
+            self.assertTrue(default_storage.exists(derivative_name(self.name, width, ext)))
+
+    def test_failure_does_not_skip_other_variants(self):
+        failing = self.variants()[0]
+
+        def generate(name, width, ext, storage):
+            if (width, ext) == failing:
+                raise OSError('Диск заполнен')
+            return generate_derivative(name, width, ext, storage)
+
+        with mock.patch('design.thumbnails.generate_derivative', side_effect=generate), \
+                self.assertLogs('design.thumbnails', 'WARNING') as logs:
+            with self.assertRaisesMessage(OSError, 'Диск заполнен'):
+                generate_derivatives(self.name)
+        self.assertEqual(len(logs.records), 1)
+        for width, ext in self.variants():
+            self.assertEqual(default_storage.exists(derivative_name(self.name, width, ext)), (width, ext) != failing)
+
+    def test_failed_task_is_retried(self):
+        broken = default_storage.save('app_images/broken.png', ContentFile(b'not an image'))
+        generate_derivatives.delay(broken)
+        with self.assertLogs('design.thumbnails', 'WARNING'), self.assertLogs('design.tasks', 'WARNING'):
+            self.assertFalse(execute(claim_next()))
+        queued = Task.objects.get(name='design.thumbnails.generate_derivatives')
+        self.assertEqual((queued.status, queued.attempts), (Task.QUEUED, 1))
+        self.assertGreater(queued.run_after, queued.started_at)
+        self.assertIn('UnidentifiedImageError', queued.last_error)
+
+    def test_image_variant(self):
+        width, ext = self.variants()[0]
+        url = reverse('image_variant', args=[width, ext, self.name])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        self.assertTrue(Task.objects.filter(idempotency_key=f'thumbnails:{self.name}').exists())
+
+        generate_derivatives(self.name)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response.headers['Cache-Control'])
+        response.close()
+        self.assertEqual(self.client.get(reverse('image_variant', args=[width + 1, ext, self.name])).status_code, 404)
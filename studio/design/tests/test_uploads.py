@@ -0,0 +1,63 @@
+import struct
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from ..models import Application
+from ..validators import FORMAT_ERROR, OPEN_ERROR, PIXELS_ERROR
+from .base import DesignTestCase, image_bytes, image_file
+
+
+def png_header(width, height):
+    """Только сигнатура и IHDR: данных пикселей нет, но размеры читаются."""
+    return b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', width, height) + b'\x08\x02\x00\x00\x00'
+
+
+class UploadValidationTests(DesignTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def post_application(self, app_image):
+        # Файл идет первым: поля после него должны дойти до формы и при отказе
+        return self.client.post(reverse('create_application'), {
+            'app_image': app_image,
+            'app_name': 'Гостиная', 'app_description': 'Описание', 'app_category': self.category.pk,
+        })
+
+    def assertRejected(self, response, message):
+        self.assertEqual(response.status_code, 200)
+        form = response.context['form']
+        self.assertEqual(form.errors['app_image'], [message])
+        self.assertEqual(list(form.errors), ['app_image'])
+        self.assertEqual(form.data['app_name'], 'Гостиная')
+        self.assertFalse(Application.objects.exists())
+
+    def test_valid_image(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post_application(image_file())
+        self.assertRedirects(response, reverse('custom_applications'))
+        self.assertTrue(Application.objects.filter(app_name='Гостиная').exists())
+
+    def test_not_an_image(self):
+        response = self.post_application(SimpleUploadedFile('room.png', b'not an image at all', 'image/png'))
+        self.assertRejected(response, FORMAT_ERROR)
+
+    def test_disallowed_format(self):
+        response = self.post_application(SimpleUploadedFile('room.gif', image_bytes('GIF'), 'image/gif'))
+        self.assertRejected(response, FORMAT_ERROR)
+
+    def test_too_many_pixels(self):
+        response = self.post_application(SimpleUploadedFile('room.png', png_header(10000, 10000), 'image/png'))
+        self.assertRejected(response, PIXELS_ERROR)
+
+    def test_truncated_header(self):
+        response = self.post_application(SimpleUploadedFile('room.png', png_header(40, 30)[:16], 'image/png'))
+        self.assertRejected(response, OPEN_ERROR)
+
+    def test_too_large_file(self):
+        with mock.patch.dict('design.upload_handlers.IMAGE_MAX_SIZES', {'app_image': 1024 * 1024}):
+            content = png_header(40, 30) + b'\x00' * (1024 * 1024)
+            response = self.post_application(SimpleUploadedFile('room.png', content, 'image/png'))
+        self.assertRejected(response, 'Файл не должен весить более 1 мб')
@@ -0,0 +1,90 @@
+import logging
+import os
+import posixpath
+import tempfile
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_WIDTHS = getattr(settings, 'THUMBNAIL_WIDTHS', (320, 640, 1280))
+THUMBNAIL_FORMATS = {'webp': 'WEBP', 'jpg': 'JPEG'}
+THUMBNAIL_QUALITY = getattr(settings, 'THUMBNAIL_QUALITY', 80)
+THUMBNAIL_DIR = 'thumbnails'
+
+
+def derivative_name(name, width, ext):
+    stem = posixpath.splitext(name)[0]
+    return f'{THUMBNAIL_DIR}/{stem}_{width}.{ext}'
+
+def write_atomic(storage, name, data):
+    """Пишет файл под временным именем и переименовывает его в name.
+
+    Параллельная генерация той же миниатюры не оставляет копий с суффиксом, а читатели
+    не видят недописанный файл. Брошенные временные файлы убирает manage.py gc_media.
+    """
+    path = storage.path(name)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as output:
+            output.write(data)
+        os.chmod(temp_path, storage.file_permissions_mode or 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def generate_derivative(name, width, ext, storage=default_storage):
+    target = derivative_name(name, width, ext)
+    if storage.exists(target):
+        return target
+    # Pillow загружается только при первой генерации: воркерам, отдающим страницы, он не нужен
+    from PIL import Image
+
+    with storage.open(name, 'rb') as source:
+        img = Image.open(source)
+        img.load()
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    if img.width > width:
+        img.thumbnail((width, img.height * width // img.width), Image.LANCZOS)
+    buffer = BytesIO()
+    img.save(buffer, THUMBNAIL_FORMATS[ext], quality=THUMBNAIL_QUALITY)
+    write_atomic(storage, target, buffer.getvalue())
+    return target
+
+@task
+def generate_derivatives(name, storage=default_storage):
+    """Создает все варианты миниатюр.
+
+    Первая ошибка пробрасывается после попытки создать остальные варианты, чтобы очередь повторила
+    задачу; уже готовые варианты при повторе пропускаются.
+    """
+    error = None
+    for width in THUMBNAIL_WIDTHS:
+        for ext in THUMBNAIL_FORMATS:
+            try:
+                generate_derivative(name, width, ext, storage)
+            except Exception as exc:
+                logger.warning('Не удалось создать миниатюру %s (%s, %s): %s', name, width, ext, exc)
+                error = error or exc
+    if error is not None:
+        raise error
+
+def delete_derivatives(name, storage=default_storage):
+    for width in THUMBNAIL_WIDTHS:
+        for ext in THUMBNAIL_FORMATS:
+            storage.delete(derivative_name(name, width, ext))
+
+def queue_derivatives(name):
+    return generate_derivatives.delay(name, idempotency_key=f'thumbnails:{name}')
+
+def schedule_derivatives(field_file):
+    if field_file:
+        queue_derivatives(field_file.name)
@@ -0,0 +1,82 @@
+from io import BytesIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+from .validators import IMAGE_HEADER_LIMIT, IMAGE_MAX_SIZES, OPEN_ERROR, IncompleteHeader, check_image_header, \
+    parse_image_header
+
+
+def rejected_upload(field_name, file_name, content_type, charset, message):
+    """Пустой файл с текстом ошибки: HeaderImageField и validate_image_upload показывают ее в форме."""
+    rejected = InMemoryUploadedFile(BytesIO(), field_name, file_name, content_type, 0, charset)
+    rejected.upload_error = message
+    return rejected
+
+def uploaded_files(request):
+    """request.FILES вместе с файлами, загрузку которых прервал ImageHeaderUploadHandler."""
+    files = request.FILES
+    rejected = getattr(request, 'rejected_uploads', None)
+    if rejected:
+        files = files.copy()
+        files.update(rejected)
+    return files
+
+
+class ImageHeaderUploadHandler(FileUploadHandler):
+    """Проверяет заголовок изображения по мере поступления данных.
+
+    Должен стоять первым в FILE_UPLOAD_HANDLERS: отклоненный файл не передается
+    следующим обработчикам и не сохраняется ни в память, ни во временный файл.
+    При отказе файл пропускается (SkipFile): остаток файла вычитывается без сохранения,
+    остальные поля формы разбираются как обычно, а ошибка файла попадает в форму
+    через uploaded_files(request).
+    """
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.active = field_name in IMAGE_MAX_SIZES
+        self.max_size = IMAGE_MAX_SIZES.get(field_name)
+        self.head = b''
+        self.header = None
+        self.received = 0
+
+    def reject(self, message):
+        self.head = b''
+        if self.request is not None:
+            rejected = getattr(self.request, 'rejected_uploads', {})
+            rejected[self.field_name] = rejected_upload(
+                self.field_name, self.file_name, self.content_type, self.charset, message,
+            )
+            self.request.rejected_uploads = rejected
+        raise SkipFile()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        self.received += len(raw_data)
+        if self.max_size and self.received > self.max_size:
+            self.reject(f'Файл не должен весить более {self.max_size // (1024 * 1024)} мб')
+        if self.header is None:
+            self.head += raw_data
+            try:
+                self.header = check_image_header(parse_image_header(self.head))
+                self.head = b''
+            except IncompleteHeader:
+                if len(self.head) >= IMAGE_HEADER_LIMIT:
+                    self.reject(OPEN_ERROR)
+            except ValidationError as error:
+                self.reject(error.messages[0])
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        if self.header is None:
+            # Файл закончился раньше заголовка: тело уже прочитано целиком, прерывать нечего
+            return rejected_upload(self.field_name, self.file_name, self.content_type, self.charset, OPEN_ERROR)
+        return None
+
+    def upload_complete(self):
+        self.active = False
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import api, views
 
 urlpatterns = [
     path('', views.IndexView.as_view(), name='index'),
@@ -16,9 +16,22 @@ urlpatterns = [
     path('application/<int:pk>/delete/', views.delete_application, name='delete_application'),
     path('applications/custom', views.CustomApplicationsView.as_view(), name='custom_applications'),
     path('applications/all', views.AllApplicationsView.as_view(), name='all_applications'),
+    path('applications/history', views.ApplicationHistoryView.as_view(), name='application_history'),
     path('application/<int:pk>/edit/design/', views.design_application, name='design_application'),
     path('application/<int:pk>/edit/status/', views.status_application, name='status_application'),
+    path('events/', views.application_events, name='application_events'),
     path('categories/', views.categories, name='categories'),
     path('category/create/', views.create_category, name='create_category'),
     path('category/<int:pk>/delete/', views.delete_category, name='delete_category'),
+    path('api/applications/', api.applications, name='api_applications'),
+    path('api/applications/<int:pk>/', api.application_detail, name='api_application_detail'),
+    path('api/applications/<int:pk>/status/', api.application_status, name='api_application_status'),
+    path('api/categories/', api.categories, name='api_categories'),
+    path('api/users/', api.users, name='api_users'),
+    path('api/users/me/', api.current_user, name='api_current_user'),
+    path('api/stats/', views.application_stats, name='application_stats'),
+    path('api/tasks/', views.task_queue_report, name='task_queue_report'),
+    path('api/archive/', views.archive_report, name='archive_report'),
+    path('api/profiling/', views.profiling_report, name='profiling_report'),
+    path('image/<int:width>/<str:ext>/<path:name>', views.image_variant, name='image_variant'),
 ]
\ No newline at end of file
@@ -0,0 +1,115 @@
+import struct
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+ImageHeader = namedtuple('ImageHeader', ['format', 'width', 'height'])
+
+ALLOWED_IMAGE_FORMATS = ('JPEG', 'PNG', 'BMP')
+IMAGE_HEADER_LIMIT = 128 * 1024
+MAX_IMAGE_PIXELS = getattr(settings, 'MAX_IMAGE_PIXELS', 40_000_000)
+IMAGE_MAX_SIZES = getattr(settings, 'IMAGE_MAX_SIZES', {
+    'app_image': 2 * 1024 * 1024,
+    'design_image': None,
+})
+
+FORMAT_ERROR = 'Неверный формат файла. Допустимые форматы: JPEG, JPG, PNG, BMP.'
+OPEN_ERROR = 'Не удалось открыть файл как изображение'
+PIXELS_ERROR = 'Слишком большое разрешение изображения'
+
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class IncompleteHeader(Exception):
+    pass
+
+
+def _parse_png(data):
+    if len(data) < 24:
+        raise IncompleteHeader
+    if data[12:16] != b'IHDR':
+        raise ValidationError(OPEN_ERROR)
+    width, height = struct.unpack('>II', data[16:24])
+    return ImageHeader('PNG', width, height)
+
+def _parse_bmp(data):
+    if len(data) < 26:
+        raise IncompleteHeader
+    dib_size = struct.unpack('<I', data[14:18])[0]
+    if dib_size == 12:
+        width, height = struct.unpack('<HH', data[18:22])
+    else:
+        width, height = struct.unpack('<ii', data[18:26])
+    return ImageHeader('BMP', width, abs(height))
+
+def _parse_jpeg(data):
+    pos = 2
+    while True:
+        while pos < len(data) and data[pos] == 0xFF:
+            pos += 1
+        if pos + 3 > len(data):
+            raise IncompleteHeader
+        marker = data[pos]
+        pos += 1
+        if marker == 0xD8 or 0xD0 <= marker <= 0xD7:
+            continue
+        if marker in (0xD9, 0xDA):
+            raise ValidationError(OPEN_ERROR)
+        length = struct.unpack('>H', data[pos:pos + 2])[0]
+        if marker in _JPEG_SOF_MARKERS:
+            if pos + 7 > len(data):
+                raise IncompleteHeader
+            height, width = struct.unpack('>HH', data[pos + 3:pos + 7])
+            return ImageHeader('JPEG', width, height)
+        pos += length
+
+def parse_image_header(data):
+    """Определяет формат и размеры изображения по первым байтам файла.
+
+    Бросает IncompleteHeader, если байтов пока недостаточно.
+    """
+    if len(data) < 8:
+        raise IncompleteHeader
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return _parse_png(data)
+    if data.startswith(b'\xff\xd8\xff'):
+        return _parse_jpeg(data)
+    if data.startswith(b'BM'):
+        return _parse_bmp(data)
+    raise ValidationError(FORMAT_ERROR)
+
+def check_image_header(header):
+    if header.format not in ALLOWED_IMAGE_FORMATS:
+        raise ValidationError(FORMAT_ERROR)
+    if not header.width or not header.height:
+        raise ValidationError(OPEN_ERROR)
+    if header.width * header.height > MAX_IMAGE_PIXELS:
+        raise ValidationError(PIXELS_ERROR)
+    return header
+
+def read_image_header(file):
+    """Читает заголовок из начала файла, не загружая изображение целиком."""
+    file.seek(0)
+    data = b''
+    try:
+        while len(data) < IMAGE_HEADER_LIMIT:
+            chunk = file.read(8 * 1024)
+            if not chunk:
+                break
+            data += chunk
+            try:
+                return check_image_header(parse_image_header(data))
+            except IncompleteHeader:
+                continue
+    finally:
+        file.seek(0)
+    raise ValidationError(OPEN_ERROR)
+
+def validate_image_upload(file, max_size=None):
+    upload_error = getattr(file, 'upload_error', None)
+    if upload_error:
+        raise ValidationError(upload_error)
+    if max_size and file.size > max_size:
+        raise ValidationError(f'Файл не должен весить более {max_size // (1024 * 1024)} мб')
+    return read_image_header(file)
@@ -1,18 +1,47 @@
+import mimetypes
+import os
+from functools import lru_cache
+
+from django.conf import settings
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import PasswordChangeView
 from django.contrib import messages
-from django.http import Http404
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import Http404, FileResponse, HttpResponse, HttpResponseNotModified, JsonResponse, \
+    StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_safe
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.contrib import auth
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
-from django.views.generic import DetailView, ListView
+from django.views.generic import DetailView, ListView, TemplateView
 
+from .archive import archive_stats, find_application
+from .cache import cached_fragment, detail_etag, detail_fragment_key, index_version, status_count, viewer_role
+from .deletion import delete_category as delete_category_applications, delete_user
+from .events import format_replay, parse_last_event_id
 from .forms import UserLoginForm, UserRegisterForm, UserEditForm, ApplicationCreateForm, ApplicationEditForm, \
     ApplicationEditStatusForm, CategoryCreateForm
-from .models import Application, Category
+from .models import Application, ArchivedApplication, Category
+from .notifications import schedule_status_notification
+from .pagination import KeysetPaginationMixin
+from .profiling import registry
+from .search import search_page
+from .stats import stats_snapshot
+from .status_changes import status_change_error
+from .storage import STATIC_ENCODINGS, hash_from_name
+from .tasks import queue_stats
+from .thumbnails import THUMBNAIL_FORMATS, THUMBNAIL_WIDTHS, derivative_name, queue_derivatives, schedule_derivatives
+from .upload_handlers import uploaded_files
 
 
 def is_employer(user):
@@ -29,16 +58,31 @@ def is_employer_or_superuser(user):
 
 class IndexView(ListView):
     template_name = 'design/index.html'
+    fragment_template_name = 'design/index_content.html'
     context_object_name = 'applications_list'
 
     def get_queryset(self):
-        return Application.objects.filter(status='d').order_by('-app_date_created')[:4]
+        return Application.objects.filter(status='d').select_related('app_category').order_by('-app_date_created')[:4]
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['accepted_count'] = Application.objects.filter(status='a').count()
+        if self.request.user.is_authenticated:
+            context['accepted_count'] = status_count('a')
+            context['index_fragment'], self.cache_timing = cached_fragment(
+                'index',
+                f'design:index:fragment:{index_version()}',
+                lambda: render_to_string(self.fragment_template_name, context, self.request),
+            )
         return context
 
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        timing = getattr(self, 'cache_timing', None)
+        if timing:
+            event, duration = timing
+            response.headers['Server-Timing'] = f'index-cache;desc="{event}";dur={duration * 1000:.2f}'
+        return response
+
 def login(request):
     if request.method == 'POST':
         form = UserLoginForm(data=request.POST)
@@ -80,7 +124,7 @@ def profile(request):
 def delete_profile(request):
     user = request.user
     if request.method == 'POST':
-        user.delete()
+        delete_user(user)
         logout(request)
         return redirect('index')
     else:
@@ -114,11 +158,13 @@ class PasswordChange(LoginRequiredMixin, PasswordChangeView):
 @user_passes_test(is_user)
 def create_application(request):
     if request.method == 'POST':
-        form = ApplicationCreateForm(data=request.POST, files=request.FILES)
+        form = ApplicationCreateForm(data=request.POST, files=uploaded_files(request))
         if form.is_valid():
             application = form.save(commit=False)
             application.app_publisher = request.user
-            application.save()
+            with transaction.atomic():
+                application.save()
+            schedule_derivatives(application.app_image)
             return redirect('custom_applications')
     else:
         form = ApplicationCreateForm()
@@ -127,15 +173,44 @@ def create_application(request):
 
 class ApplicationDetail(LoginRequiredMixin, DetailView):
     model = Application
+    queryset = Application.objects.select_related('app_category', 'app_publisher', 'design_publisher')
     template_name = 'design/detail_application.html'
+    fragment_template_name = 'design/detail_application_content.html'
     context_object_name = 'application'
 
     def get_object(self, queryset=None):
-        application = super().get_object(queryset)
+        application = find_application(
+            self.kwargs['pk'], self.get_queryset(),
+            ArchivedApplication.objects.select_related('app_category', 'app_publisher', 'design_publisher'),
+        )
         if not application:
             raise Http404('Заявка недоступна')
         return application
 
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        self.role = viewer_role(request.user)
+        etag = None
+        if self.object.status == 'd' and not len(messages.get_messages(request)):
+            etag = detail_etag(self.object, self.role)
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified:
+                return not_modified
+        response = self.render_to_response(self.get_context_data(object=self.object))
+        if etag:
+            response.headers['ETag'] = etag
+            response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['detail_fragment'], _ = cached_fragment(
+            'detail',
+            detail_fragment_key(self.object, self.role),
+            lambda: render_to_string(self.fragment_template_name, context, self.request),
+        )
+        return context
+
 @login_required
 @user_passes_test(is_user)
 def delete_application(request, pk):
@@ -148,50 +223,77 @@ def delete_application(request, pk):
         messages.error(request, 'Нельзя удалить заявку с текущим статусом.')
         return redirect('detail_application', pk)
     if request.method == 'POST':
-        app.delete()
+        with transaction.atomic():
+            app.delete()
         return redirect('index')
     else:
         return render(request, 'design/delete_application.html', {'app': app})
 
 @method_decorator(user_passes_test(is_user), name='dispatch')
-class CustomApplicationsView(LoginRequiredMixin, ListView):
+class CustomApplicationsView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Application
     template_name = 'design/custom_applications.html'
     context_object_name = 'applications_list'
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('app_category')
         status_filter = self.request.GET.get('status')
         if status_filter:
-            return queryset.filter(app_publisher=self.request.user, status=status_filter).order_by('-app_date_created')
+            return queryset.filter(app_publisher=self.request.user, status=status_filter)
         else:
-            return queryset.filter(app_publisher=self.request.user).order_by('-app_date_created')
+            return queryset.filter(app_publisher=self.request.user)
+
+
+@method_decorator(user_passes_test(is_user), name='dispatch')
+class ApplicationHistoryView(LoginRequiredMixin, KeysetPaginationMixin, TemplateView):
+    """История заявок пользователя: страницы собираются из основной таблицы и архива по одному курсору."""
+    template_name = 'design/application_history.html'
+
+    def get(self, request, *args, **kwargs):
+        rows = []
+        for model in (Application, ArchivedApplication):
+            queryset = model.objects.select_related('app_category').filter(app_publisher=request.user)
+            rows.extend(self.keyset_queryset(queryset.order_by('-app_date_created', '-id')))
+        rows.sort(key=lambda application: (application.app_date_created, application.pk), reverse=True)
+        context = self.page_context(*self.split_page(rows))
+        context['applications_list'] = context['object_list']
+        return self.render_to_response(context)
 
 
 @method_decorator(user_passes_test(is_employer_or_superuser), name='dispatch')
-class AllApplicationsView(LoginRequiredMixin, ListView):
+class AllApplicationsView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Application
     template_name = 'design/all_applications.html'
     context_object_name = 'applications_list'
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('app_category', 'app_publisher')
         status_filter = self.request.GET.get('status')
         if status_filter:
-            return queryset.filter(status=status_filter).order_by('-app_date_created')
+            return queryset.filter(status=status_filter)
         else:
-            return queryset.all().order_by('-app_date_created')
+            return queryset.all()
+
+    def paginate_keyset(self, queryset):
+        search_query = self.request.GET.get('q', '').strip()
+        if not search_query:
+            return super().paginate_keyset(queryset)
+        return search_page(
+            search_query, self.request.GET.get('status'), self.request.GET.get(self.cursor_param), self.paginate_by,
+        )
 
 @login_required
 @user_passes_test(is_employer)
 def design_application(request, pk):
     application = get_object_or_404(Application, pk=pk)
     if request.method == 'POST':
-        form = ApplicationEditForm(data=request.POST, files=request.FILES, instance=application)
+        form = ApplicationEditForm(data=request.POST, files=uploaded_files(request), instance=application)
         if form.is_valid():
             application = form.save(commit=False)
             application.design_publisher = request.user
-            application.save()
+            with transaction.atomic():
+                application.save()
+            schedule_derivatives(application.design_image)
             return redirect('detail_application', pk)
     else:
         form = ApplicationEditForm()
@@ -202,16 +304,16 @@ def design_application(request, pk):
 @user_passes_test(is_superuser)
 def status_application(request, pk):
     application = get_object_or_404(Application, pk=pk)
-    if not application.design_image:
-        messages.error(request, 'Нельзя изменить статус без прикрепленного дизайна.')
-        return redirect('detail_application', pk)
-    if application.status in ['a', 'd']:
-        messages.error(request, 'Нельзя изменить статус с текущего.')
+    error = status_change_error(application)
+    if error:
+        messages.error(request, error)
         return redirect('detail_application', pk)
     if request.method == 'POST':
-        form = ApplicationEditStatusForm(data=request.POST, files=request.FILES, instance=application)
+        form = ApplicationEditStatusForm(data=request.POST, files=uploaded_files(request), instance=application)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
+                schedule_status_notification(application)
             return redirect('detail_application', pk)
     else:
         form = ApplicationEditStatusForm()
@@ -242,5 +344,177 @@ def create_category(request):
 @user_passes_test(is_superuser)
 def delete_category(request, pk):
     category = get_object_or_404(Category, pk=pk)
-    category.delete()
-    return redirect('categories')
\ No newline at end of file
+    if delete_category_applications(category):
+        messages.info(request, 'Категория содержит много заявок и будет удалена в фоновом режиме.')
+    return redirect('categories')
+
+@login_required
+@user_passes_test(is_superuser)
+def application_stats(request):
+    return JsonResponse(stats_snapshot())
+
+@login_required
+@user_passes_test(is_superuser)
+def profiling_report(request):
+    return JsonResponse(registry.snapshot())
+
+@login_required
+@user_passes_test(is_superuser)
+def task_queue_report(request):
+    return JsonResponse(queue_stats())
+
+@login_required
+@user_passes_test(is_superuser)
+def archive_report(request):
+    return JsonResponse(archive_stats())
+
+@login_required
+def application_events(request):
+    """События без ASGI: отдает пропущенное после Last-Event-ID и закрывается; клиент переподключается не скоро."""
+    last_id = parse_last_event_id(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id'))
+    response = HttpResponse(format_replay(request.user.pk, last_id), content_type='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+MEDIA_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+MEDIA_MUTABLE_MAX_AGE = 60 * 60
+MEDIA_RANGE_CHUNK_SIZE = FileResponse.block_size
+
+@require_safe
+def image_variant(request, width, ext, name):
+    """Отдает готовую миниатюру; отсутствующую ставит в очередь и пока перенаправляет на исходник.
+
+    Генерация в запросе нагружала бы воркер по запросу любого анонимного клиента.
+    """
+    if width not in THUMBNAIL_WIDTHS or ext not in THUMBNAIL_FORMATS:
+        raise Http404('Размер изображения недоступен')
+    if not name.startswith(('app_images/', 'design_images/')) or not default_storage.exists(name):
+        raise Http404('Изображение не найдено')
+    target = derivative_name(name, width, ext)
+    if not default_storage.exists(target):
+        queue_derivatives(name)
+        response = redirect(default_storage.url(name))
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    response = FileResponse(default_storage.open(target, 'rb'))
+    # Исходник назван по хэшу содержимого, значит и миниатюра под этим именем не меняется
+    response.headers['Cache-Control'] = (
+        f'public, max-age={MEDIA_IMMUTABLE_MAX_AGE}, immutable' if hash_from_name(name)
+        else f'public, max-age={MEDIA_MUTABLE_MAX_AGE}'
+    )
+    return response
+
+def parse_range(header, size):
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    start, _, end = header[6:].partition('-')
+    try:
+        if start:
+            start, end = int(start), int(end) if end else size - 1
+        else:
+            start, end = size - int(end), size - 1
+    except ValueError:
+        return None
+    if start < 0 or start > end or start >= size:
+        return False
+    return start, min(end, size - 1)
+
+def iter_range(path, start, length, chunk_size=MEDIA_RANGE_CHUNK_SIZE):
+    """Читает диапазон файла кусками: даже Range: bytes=0- на большом файле не загружается в память целиком."""
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(chunk_size, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+@require_safe
+def serve_media(request, path):
+    if not default_storage.exists(path):
+        raise Http404('Файл не найден')
+    full_path = default_storage.path(path)
+    stat = os.stat(full_path)
+    digest = hash_from_name(path)
+    etag = f'"{digest}"' if digest else f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': f'public, max-age={MEDIA_IMMUTABLE_MAX_AGE}, immutable' if digest
+        else f'public, max-age={MEDIA_MUTABLE_MAX_AGE}',
+    }
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+        return HttpResponseNotModified(headers=headers)
+
+    byte_range = parse_range(request.headers.get('Range'), stat.st_size)
+    if request.headers.get('If-Range') not in (None, etag):
+        byte_range = None
+    if byte_range is False:
+        headers['Content-Range'] = f'bytes */{stat.st_size}'
+        return HttpResponse(status=416, headers=headers)
+    if byte_range:
+        start, end = byte_range
+        headers['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        headers['Content-Length'] = str(end - start + 1)
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        return StreamingHttpResponse(
+            iter_range(full_path, start, end - start + 1), status=206, content_type=content_type, headers=headers,
+        )
+
+    response = FileResponse(open(full_path, 'rb'))
+    for header, value in headers.items():
+        response.headers[header] = value
+    return response
+
+def accepted_encodings(request):
+    accepted = set()
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if params.strip().replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+@lru_cache(maxsize=None)
+def hashed_static_names():
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+@require_safe
+def serve_static(request, path):
+    """Раздает собранную статику: сжатая копия по Accept-Encoding, immutable для имен с хешем.
+
+    FileResponse отдает открытый файл через wsgi.file_wrapper, поэтому WSGI-сервер может использовать sendfile.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Файл не найден')
+    if not os.path.isfile(full_path):
+        raise Http404('Файл не найден')
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    encoding = None
+    accepted = accepted_encodings(request)
+    for name, suffix in STATIC_ENCODINGS:
+        if name in accepted and os.path.isfile(full_path + suffix):
+            encoding, full_path = name, full_path + suffix
+            break
+    stat = os.stat(full_path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{"-" + encoding if encoding else ""}"'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Vary': 'Accept-Encoding',
+        'Cache-Control': f'public, max-age={MEDIA_IMMUTABLE_MAX_AGE}, immutable' if path in hashed_static_names()
+        else f'public, max-age={MEDIA_MUTABLE_MAX_AGE}',
+    }
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+        return HttpResponseNotModified(headers=headers)
+    response = FileResponse(open(full_path, 'rb'), content_type=content_type, filename=os.path.basename(path))
+    for header, value in headers.items():
+        response.headers[header] = value
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,103 @@
+import gc
+import importlib
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+# Тяжелые модули, которые в рабочих процессах импортируются лениво; при предзагрузке перед fork
+# их выгоднее загрузить в мастере, чтобы страницы памяти делились между воркерами
+PRELOAD_MODULES = getattr(settings, 'DESIGN_PRELOAD_MODULES', ('PIL.Image',))
+
+
+def template_names(engine):
+    """Имена всех шаблонов из DIRS движка и каталогов templates приложений."""
+    directories = [Path(directory) for directory in engine.engine.dirs]
+    directories += [Path(directory) for directory in get_app_template_dirs('templates')]
+    names = set()
+    for directory in directories:
+        for path in directory.rglob('*.html'):
+            names.add(path.relative_to(directory).as_posix())
+    return sorted(names)
+
+def warm_templates():
+    """Компилирует все шаблоны, чтобы первые запросы не платили за разбор; возвращает (число, ошибки, секунды)."""
+    started = time.perf_counter()
+    compiled, errors = 0, []
+    for engine in engines.all():
+        if not hasattr(engine, 'engine'):
+            continue
+        for name in template_names(engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as error:
+                errors.append((name, error))
+                logger.error('Шаблон %s не компилируется: %s', name, error)
+            else:
+                compiled += 1
+    return compiled, errors, time.perf_counter() - started
+
+def import_modules(names=PRELOAD_MODULES):
+    imported = 0
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except ImportError as error:
+            logger.warning('Модуль %s для предзагрузки не найден: %s', name, error)
+        else:
+            imported += 1
+    return imported
+
+def warm_urls():
+    """Строит таблицы reverse() и компилирует регулярные выражения всех маршрутов корневого URLconf."""
+    resolver = get_resolver()
+    return sum(1 for key in resolver.reverse_dict if isinstance(key, str))
+
+def warm_connections():
+    """Открывает соединения со всеми БД и закрывает их.
+
+    Так загружаются драйверы и проверяется доступность баз, а воркеры после fork
+    открывают собственные соединения вместо общих с мастером сокетов.
+    """
+    opened = 0
+    for connection in connections.all():
+        connection.ensure_connection()
+        opened += 1
+    connections.close_all()
+    return opened
+
+def load_task_registry():
+    from .tasks import load_tasks, registry
+
+    load_tasks()
+    return len(registry)
+
+PRELOAD_STEPS = (
+    ('modules', import_modules),
+    ('tasks', load_task_registry),
+    ('urls', warm_urls),
+    ('templates', lambda: warm_templates()[0]),
+    ('databases', warm_connections),
+)
+
+def preload(freeze=True):
+    """Прогрев процесса перед fork (gunicorn --preload): возвращает {шаг: (результат, секунды)}.
+
+    После прогрева объекты переносятся в постоянное поколение gc.freeze(), чтобы сборщик мусора
+    в воркерах не трогал их и не копировал общие страницы памяти.
+    """
+    report = {}
+    for step, func in PRELOAD_STEPS:
+        started = time.perf_counter()
+        report[step] = (func(), time.perf_counter() - started)
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return report
@@ -14,3 +14,20 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'studio.settings')
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+from django.core.exceptions import ImproperlyConfigured  # noqa: E402
+
+from design.checks import static_manifest_missing  # noqa: E402
+
+if static_manifest_missing():
+    raise ImproperlyConfigured('Не найден манифест статики, выполните manage.py collectstatic')
+
+if settings.DESIGN_PRELOAD:
+    from design.warmup import preload
+
+    preload()
+elif settings.DESIGN_WARM_TEMPLATES:
+    from design.warmup import warm_templates
+
+    warm_templates()
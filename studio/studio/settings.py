@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,8 +42,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'design.middleware.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'design.middleware.ReplicaRoutingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -50,13 +53,33 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Профилирование запросов (число и время SQL, N+1, время шаблонов) в заголовке Server-Timing
+DESIGN_PROFILING = os.environ.get('DESIGN_PROFILING') == '1'
+DESIGN_PROFILING_EXPORT = os.environ.get('DESIGN_PROFILING_EXPORT')
+
 ROOT_URLCONF = 'studio.urls'
 
+# Загрузка шаблонов: DESIGN_TEMPLATES=cached (по умолчанию) компилирует каждый шаблон один раз на процесс,
+# reload читает их с диска при каждом рендере. Прогрев кэша при старте - DESIGN_WARM_TEMPLATES=1 или warm_templates
+
+DESIGN_TEMPLATES = os.environ.get('DESIGN_TEMPLATES', 'cached')
+DESIGN_WARM_TEMPLATES = os.environ.get('DESIGN_WARM_TEMPLATES') == '1'
+
+# Предзагрузка для серверов с fork (gunicorn --preload, uwsgi без lazy-apps): DESIGN_PRELOAD=1 при загрузке
+# studio.wsgi/asgi в мастере импортирует DESIGN_PRELOAD_MODULES, строит маршруты, компилирует шаблоны и проверяет
+# соединения с БД, чтобы воркеры делили эти страницы памяти. Замер: manage.py preload и manage.py profile_imports
+DESIGN_PRELOAD = os.environ.get('DESIGN_PRELOAD') == '1'
+DESIGN_PRELOAD_MODULES = tuple(filter(None, os.environ.get('DESIGN_PRELOAD_MODULES', 'PIL.Image').split(',')))
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -64,23 +87,151 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+            ] if DESIGN_TEMPLATES == 'cached' else TEMPLATE_LOADERS,
         },
     },
 ]
 
 WSGI_APPLICATION = 'studio.wsgi.application'
+ASGI_APPLICATION = 'studio.asgi.application'
+
+# Асинхронные версии страниц только для чтения (главная, списки, детальная) и SSE-поток событий.
+# Поток событий работает только под ASGI-сервером (studio.asgi) с DESIGN_ASYNC_VIEWS=1: под WSGI страницы
+# не подключают EventSource, а /design/events/ отдает пропущенные события и закрывается
+DESIGN_ASYNC_VIEWS = os.environ.get('DESIGN_ASYNC_VIEWS') == '1'
+
+# Поток событий заявок (design.events, /design/events/): local раздает события слушателям своего процесса,
+# database - всем процессам через опрос журнала событий (замена внешней шины при нескольких воркерах)
+DESIGN_EVENTS_BROKER = os.environ.get('DESIGN_EVENTS_BROKER', 'local')
 
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Профиль выбирается переменной DESIGN_DB: sqlite (по умолчанию) или postgres
+
+DESIGN_DB = os.environ.get('DESIGN_DB', 'sqlite')
+
+if DESIGN_DB == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DESIGN_DB_NAME', 'studio'),
+            'USER': os.environ.get('DESIGN_DB_USER', 'studio'),
+            'PASSWORD': os.environ.get('DESIGN_DB_PASSWORD', ''),
+            'HOST': os.environ.get('DESIGN_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DESIGN_DB_PORT', '5432'),
+            # Постоянные подключения с проверкой перед повторным использованием
+            'CONN_MAX_AGE': int(os.environ.get('DESIGN_DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            # Пул подключений - PgBouncer в режиме transaction, в нем серверные курсоры недоступны
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DESIGN_DB_POOLER') == 'pgbouncer',
+            'OPTIONS': {
+                'connect_timeout': 5,
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DESIGN_DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                'timeout': 20,
+            },
+        }
+    }
+
+# Реплики только для чтения: DESIGN_DB_REPLICAS - пути к копиям SQLite или хосты PostgreSQL через запятую.
+# Чтение моделей design в безопасных запросах идет на исправные реплики (design.routers).
+
+DESIGN_DB_REPLICAS = [replica for replica in os.environ.get('DESIGN_DB_REPLICAS', '').split(',') if replica]
+
+for number, replica in enumerate(DESIGN_DB_REPLICAS, 1):
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'HOST' if DESIGN_DB == 'postgres' else 'NAME': replica,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['design.routers.ReplicaRouter'] if DESIGN_DB_REPLICAS else []
+
+# PRAGMA для каждого нового подключения SQLite (design.db); DESIGN_SQLITE_TUNING=0 отключает их.
+# Режим WAL записывается в сам файл базы и создает рядом файлы -wal/-shm, поэтому включается только явно
+# (DESIGN_SQLITE_WAL=1, например для сервера с несколькими процессами); иначе база возвращается к обычному журналу
+
+DESIGN_SQLITE_WAL = os.environ.get('DESIGN_SQLITE_WAL') == '1'
+
+if DESIGN_SQLITE_WAL:
+    DESIGN_SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+    }
+else:
+    DESIGN_SQLITE_PRAGMAS = {
+        'journal_mode': 'DELETE',
+    }
+if os.environ.get('DESIGN_SQLITE_TUNING', '1') == '1':
+    DESIGN_SQLITE_PRAGMAS.update({
+        'busy_timeout': 20000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    })
+
+
+# Cache
+# Кэш фрагментов и счетчиков: DESIGN_CACHE=locmem (по умолчанию, свой в каждом процессе) или file (общий для процессов)
+
+DESIGN_CACHE = os.environ.get('DESIGN_CACHE', 'locmem')
+
+if DESIGN_CACHE == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache',
+        }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'design',
+        }
+    }
+
+
+# Фоновые задачи (design.tasks): очередь в таблице БД. Ее выполняет отдельный процесс manage.py run_tasks
+# (external); in-process - пул потоков процесса, поставившего задачу (для разработки), eager - сразу после коммита
+
+DESIGN_TASKS = os.environ.get('DESIGN_TASKS', 'external')
+DESIGN_TASK_WORKERS = int(os.environ.get('DESIGN_TASK_WORKERS', 2))
+
+EMAIL_BACKEND = os.environ.get('DESIGN_EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = 'studio@localhost'
+
+
+# Хеширование паролей: DESIGN_PASSWORD_HASHER=pbkdf2 (по умолчанию), scrypt или argon2 (нужен argon2-cffi).
+# DESIGN_PBKDF2_ITERATIONS задает стоимость PBKDF2; остальные алгоритмы остаются для проверки старых паролей,
+# которые перехешируются выбранным при следующем входе. Замер: manage.py bench_password_hashers
+
+DESIGN_PASSWORD_HASHER = os.environ.get('DESIGN_PASSWORD_HASHER', 'pbkdf2')
+DESIGN_PBKDF2_ITERATIONS = int(os.environ.get('DESIGN_PBKDF2_ITERATIONS', 600000))
+
+PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': 'design.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
 }
 
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[DESIGN_PASSWORD_HASHER]] + [
+    hasher for name, hasher in PASSWORD_HASHER_CHOICES.items() if name != DESIGN_PASSWORD_HASHER
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -117,13 +268,49 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = '/static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Профиль статики: dev (по умолчанию) - файлы приложений как есть, manifest - имена с хешем содержимого,
+# заранее сжатые копии (collectstatic) и раздача приложением с Cache-Control: immutable
+DESIGN_STATIC = os.environ.get('DESIGN_STATIC', 'dev')
 
 AUTH_USER_MODEL = 'design.AdvUser'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {
+        'BACKEND': 'design.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'design.storage.CompressedManifestStaticFilesStorage' if DESIGN_STATIC == 'manifest'
+        else 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+FILE_UPLOAD_HANDLERS = [
+    'design.upload_handlers.ImageHeaderUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Сессии: DESIGN_SESSIONS=db (по умолчанию), cached_db или signed_cookies.
+# DESIGN_USER_CACHE=1 восстанавливает пользователя сессии из кэшированного снимка ролей (design.backends).
+# cached_db и снимки пользователей требуют общего для процессов кэша (DESIGN_CACHE=file): в кэше процесса
+# выход, смена пароля или снятие прав не видны другим воркерам. С DESIGN_CACHE=locmem запуск прерывается
+DESIGN_SESSIONS = os.environ.get('DESIGN_SESSIONS', 'db')
+DESIGN_USER_CACHE = os.environ.get('DESIGN_USER_CACHE') == '1'
+
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[DESIGN_SESSIONS]
+
+# ModelBackend остается для сессий, созданных до включения снимков
 AUTHENTICATION_BACKENDS = [
+    *(['design.backends.CachedModelBackend'] if DESIGN_USER_CACHE else []),
     'django.contrib.auth.backends.ModelBackend',
 ]
 
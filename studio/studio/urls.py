@@ -20,11 +20,16 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 
+from design.views import serve_media, serve_static
+
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('design/', include('design.urls',)),
+    path('design/', include('design.async_urls' if settings.DESIGN_ASYNC_VIEWS else 'design.urls')),
     path('', RedirectView.as_view(url='design/', permanent=True)),
+    path(settings.MEDIA_URL.lstrip('/') + '<path:path>', serve_media, name='media'),
 ]
 
-urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+if settings.DESIGN_STATIC == 'manifest':
+    urlpatterns.append(path(settings.STATIC_URL.lstrip('/') + '<path:path>', serve_static, name='static'))
+else:
+    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)